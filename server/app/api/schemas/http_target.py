@@ -78,6 +78,23 @@ class HttpTargetIn(BaseModel):
             raise ValueError("URL scheme should be 'http' or 'https'")
         return v
 
+    @field_validator("accepted_status_codes")
+    @classmethod
+    def valid_status_ranges(cls, v: list[list[int]] | None) -> list[list[int]] | None:
+        """
+        Chaque plage est une paire [début, fin] avec 100 <= début <= fin <= 599.
+        (Évite les plages démesurées, matérialisées en ensemble côté modèle.)
+        """
+        if v is None:
+            return v
+        for pair in v:
+            if len(pair) != 2:
+                raise ValueError("Each status range must be a [start, end] pair")
+            start, end = pair
+            if not (100 <= start <= end <= 599):
+                raise ValueError("Status ranges must satisfy 100 <= start <= end <= 599")
+        return v
+
     @field_validator("method", mode="before")
     @classmethod
     def upper_if_str(cls, v):
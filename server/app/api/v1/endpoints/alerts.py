@@ -22,7 +22,7 @@ router = APIRouter(prefix="/alerts")
 
 
 @router.get("")
-async def list_alerts(
+def list_alerts(
     api_key=Depends(api_key_auth),
     db: Session = Depends(get_db),
 ) -> list[dict]:
@@ -7,7 +7,7 @@ from sqlalchemy import select
 
 from app.presentation.api.schemas.auth import LoginIn, MeOut
 from app.core.security import (
-    verify_password,
+    verify_password, needs_rehash, hash_password,
     ACCESS_COOKIE, REFRESH_COOKIE, cookie_kwargs,
     create_access_token, decode_token,
 )
@@ -42,6 +42,11 @@ def login(body: LoginIn, response: Response, s: Session = Depends(get_db)):
     if not user or not verify_password(body.password, user.password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid_credentials")
 
+    # Ré-hachage transparent si le coût stocké est inférieur à BCRYPT_ROUNDS
+    # (commit assuré par get_db).
+    if needs_rehash(user.password_hash):
+        user.password_hash = hash_password(body.password)
+
     access = make_access_token(str(user.id), str(user.client_id))
     refresh = make_refresh_token(str(user.id), str(user.client_id))
 
@@ -16,7 +16,7 @@ from app.infrastructure.persistence.database.models.incident import Incident
 router = APIRouter(prefix="/dashboard")
 
 @router.get("/summary")
-async def summary(
+def summary(
     api_key=Depends(api_key_auth),
     db: Session = Depends(get_db),
 ) -> dict:
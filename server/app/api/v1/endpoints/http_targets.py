@@ -53,17 +53,18 @@ def _is_postgres(db: Session) -> bool:
         return False
 
 @router.get("", response_model=list[dict])
-async def list_targets(api_key=Depends(api_key_auth), db: Session = Depends(get_db)) -> list[dict]:
+def list_targets(api_key=Depends(api_key_auth), db: Session = Depends(get_db)) -> list[dict]:
     rows: Iterable[HttpTarget] = db.scalars(
         select(HttpTarget)
         .where(HttpTarget.client_id == api_key.client_id)
         .order_by(HttpTarget.name)
     ).all()
-    return [serialize_http_target(t) for t in rows]
+    now = datetime.now(timezone.utc)  # horloge unique pour toute la liste
+    return [serialize_http_target(t, now=now) for t in rows]
 
 
 @router.post("", status_code=status.HTTP_201_CREATED)
-async def create_target(
+def create_target(
     payload: HttpTargetIn,
     # ✅ idem : dépend toujours du même callable importé depuis deps
     api_key=Depends(api_key_auth),
@@ -137,7 +138,7 @@ async def create_target(
     )
 
 @router.put("/{target_id}")
-async def update_target(
+def update_target(
     target_id: UUID,
     payload: dict,
     api_key=Depends(api_key_auth),
@@ -190,7 +191,7 @@ async def update_target(
     return {"id": str(target_id)}
 
 @router.delete("/{target_id}")
-async def delete_target(
+def delete_target(
     target_id: UUID,
     api_key=Depends(api_key_auth),
     db: Session = Depends(get_db),
@@ -13,7 +13,7 @@ from app.infrastructure.persistence.database.models.incident import Incident
 router = APIRouter(prefix="/incidents")
 
 @router.get("")
-async def list_incidents(api_key=Depends(api_key_auth), db: Session = Depends(get_db)) -> list[dict]:
+def list_incidents(api_key=Depends(api_key_auth), db: Session = Depends(get_db)) -> list[dict]:
 
     def _display_title(i: Incident) -> str:
         base = (i.title or "").lstrip()
@@ -21,7 +21,7 @@ logger = logging.getLogger(__name__)
 
 
 @router.post("/metrics", status_code=202)
-async def post_metrics(
+def post_metrics(
     payload: IngestRequest,
     api_key=Depends(api_key_auth_optional),
     x_ingest_id: Optional[str] = Header(default=None, alias="X-Ingest-Id"),
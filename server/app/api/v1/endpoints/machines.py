@@ -100,7 +100,7 @@ def _humanize_age(age_sec: int) -> str:
 # GET /machines — liste simple
 # =====================================================================
 @router.get("")
-async def list_machines(
+def list_machines(
     api_key=Depends(api_key_auth),
     db: Session = Depends(get_db),
 ) -> list[dict]:
@@ -157,7 +157,7 @@ async def list_machines(
 # GET /machines/{machine_id}/detail
 # =====================================================================
 @router.get("/{machine_id}/detail", response_model=MachineDetailResponse)
-async def get_machine_detail(
+def get_machine_detail(
     machine_id: str,
     api_key=Depends(api_key_auth),
     db: Session = Depends(get_db),
@@ -352,7 +352,7 @@ async def get_machine_detail(
     "/{machine_id}/metrics/config",
     response_model=list[MachineMetricConfig],
 )
-async def get_machine_metric_config(
+def get_machine_metric_config(
     machine_id: uuid.UUID,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
@@ -199,7 +199,7 @@ async def _parse_default_threshold_payload(req: Request) -> CreateDefaultThresho
 # GET /api/v1/metrics  → simple ping / smoke test
 # ============================================================================
 @router.get("")
-async def list_metrics_root(
+def list_metrics_root(
     api_key=Depends(security.api_key_auth),
     db: Session = Depends(get_db),
 ) -> dict:
@@ -216,7 +216,7 @@ async def list_metrics_root(
 # GET /api/v1/metrics/{machine_id} → liste des métriques d'une machine
 # ============================================================================
 @router.get("/{machine_id}")
-async def list_metrics_by_machine(
+def list_metrics_by_machine(
     machine_id: str,
     api_key=Depends(security.api_key_auth),
     db: Session = Depends(get_db),
@@ -286,9 +286,9 @@ async def list_metrics_by_machine(
 # POST /api/v1/metrics/{metric_instance_id}/thresholds/default
 # ============================================================================
 @router.post("/{metric_instance_id}/thresholds/default")
-async def upsert_default_threshold(
+def upsert_default_threshold(
     metric_instance_id: str,
-    req: Request,
+    payload: CreateDefaultThresholdIn = Depends(_parse_default_threshold_payload),
     api_key=Depends(security.api_key_auth),
     db: Session = Depends(get_db),
 ) -> dict:
@@ -303,8 +303,6 @@ async def upsert_default_threshold(
     - Upsert (insert ou update) le ThresholdNew "default".
     - Met à jour metric_instance.is_alerting_enabled si `alert_enabled` est fourni.
     """
-    payload = await _parse_default_threshold_payload(req)
-
     # Chargement instance + machine + définition, avec contrôle de client
     metric_instance, machine, definition = _get_instance_with_machine_and_definition(
         db=db,
@@ -404,7 +402,6 @@ async def upsert_default_threshold(
     if thr is None:
         # Création d'un nouveau seuil "default"
         thr = ThresholdNew(
-            id=uuid.uuid4(),
             metric_instance_id=metric_instance.id,
             name="default",
             condition=cond,
@@ -488,7 +485,7 @@ async def upsert_default_threshold(
 # PATCH /api/v1/metrics/{metric_instance_id}/alerting
 # ============================================================================
 @router.patch("/{metric_instance_id}/alerting")
-async def toggle_alerting(
+def toggle_alerting(
     metric_instance_id: str,
     body: ToggleAlertingIn = Body(...),
     api_key=Depends(security.api_key_auth),
@@ -518,7 +515,7 @@ async def toggle_alerting(
 # PATCH /api/v1/metrics/{metric_instance_id}/pause
 # ============================================================================
 @router.patch("/{metric_instance_id}/pause")
-async def toggle_pause_metric(
+def toggle_pause_metric(
     metric_instance_id: str,
     body: TogglePauseIn = Body(...),
     api_key=Depends(security.api_key_auth),
@@ -5,7 +5,7 @@ GET notifications.
 """
 from fastapi import APIRouter, Depends
 from sqlalchemy import select, func
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer_group
 
 from app.core.security import api_key_auth
 from app.infrastructure.persistence.database.session import get_db
@@ -17,7 +17,7 @@ router = APIRouter(prefix="/notifications", tags=["notifications"])
 
 
 @router.get("")
-async def list_notifications(
+def list_notifications(
     api_key=Depends(api_key_auth),
     db: Session = Depends(get_db),
 ) -> list[dict]:
@@ -44,6 +44,7 @@ async def list_notifications(
         )
         .order_by(func.coalesce(NotificationLog.sent_at, NotificationLog.created_at).desc())
         .limit(1000)
+        .options(undefer_group("blob"))  # message / error_message affichés
     )
 
     rows = db.execute(stmt).all()
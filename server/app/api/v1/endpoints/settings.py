@@ -39,7 +39,7 @@ def _get_or_create_settings(db: Session, client_id) -> ClientSettings:
 
 
 @router.get("", response_model=ClientSettingsOut)
-async def get_settings(
+def get_settings(
     api_key=Depends(api_key_auth),
     db: Session = Depends(get_db),
 ) -> ClientSettingsOut:
@@ -52,7 +52,7 @@ async def get_settings(
 
 
 @router.put("", response_model=ClientSettingsOut)
-async def update_settings(
+def update_settings(
     payload: ClientSettingsUpdate,
     api_key=Depends(api_key_auth),
     db: Session = Depends(get_db),
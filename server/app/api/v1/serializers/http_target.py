@@ -6,7 +6,8 @@ Sérialise un HttpTarget en dictionnaire JSON prêt à exposer.
 """
 
 from __future__ import annotations
-from typing import Any, Dict, TYPE_CHECKING
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, TYPE_CHECKING
 
 from app.core.utils.datetime import age_in_seconds
 
@@ -14,8 +15,13 @@ if TYPE_CHECKING:
     from app.infrastructure.persistence.database.models.http_target import HttpTarget
 
 
-def serialize_http_target(t: HttpTarget) -> Dict[str, Any]:
-    """Convertit un HttpTarget SQLAlchemy en dictionnaire JSON prêt à exposer."""
+def serialize_http_target(t: HttpTarget, *, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Convertit un HttpTarget SQLAlchemy en dictionnaire JSON prêt à exposer.
+    `now` : référence commune pour les âges (à fournir quand on sérialise une liste).
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
 
     status = t.last_status_code
 
@@ -52,8 +58,8 @@ def serialize_http_target(t: HttpTarget) -> Dict[str, Any]:
 
         # Métadonnées temporelles
         "last_check_at": t.last_check_at.isoformat() if t.last_check_at else None,
-        "last_check_age_sec": age_in_seconds(t.last_check_at),
-        "last_state_change_age_sec": age_in_seconds(getattr(t, "last_state_change_at", None)),
+        "last_check_age_sec": age_in_seconds(t.last_check_at, now=now),
+        "last_state_change_age_sec": age_in_seconds(getattr(t, "last_state_change_at", None), now=now),
 
         # Dernier résultat brut + interprétation légère
         "last_status_code": status,
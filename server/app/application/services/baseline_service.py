@@ -21,7 +21,6 @@ Ordre logique appliqué :
 7) Si payload indique alert_enabled → force la valeur
 """
 
-import uuid
 from typing import Iterable, Any, Optional
 
 from uuid import UUID
@@ -337,7 +336,6 @@ def init_if_first_seen(
                         # Création des thresholds depuis les templates
                         for tpl in templates:
                             t = ThresholdNew(
-                                id=uuid.uuid4(),
                                 metric_instance_id=inst.id,
                                 name=tpl.name,
                                 condition=tpl.condition,
@@ -376,7 +374,6 @@ def init_if_first_seen(
                         # Création d'un threshold "default" générique
                         session.add(
                             ThresholdNew(
-                                id=uuid.uuid4(),
                                 metric_instance_id=inst.id,
                                 name="default",
                                 condition="gt",
@@ -20,6 +20,7 @@ Pipeline (version refacto) :
 Notes importantes :
 - Une MetricInstance SANS SAMPLE n’est pas considérée comme en alerte ni OK → statut NO_DATA géré au niveau API.
 - Un threshold inactif (is_active=False) est ignoré (filtré dans ThresholdNewRepository.for_machine()).
+- Idem pour les MetricInstance en pause ou sans alerting (filtrées en SQL, re-vérifiées ici).
 - Les alerts ne sont créées QUE si :
     * seuil violé
     * metric_instance.is_alerting_enabled == True
@@ -17,6 +17,7 @@ Notes importantes :
 import uuid
 import logging
 import time
+from collections import defaultdict
 from datetime import datetime, timezone, timedelta
 from typing import Optional, Any  # 👈 ajout de Any
 
@@ -274,10 +275,10 @@ def check_http_targets() -> int:
 
     # Buffer des OUVERTURES/REMINDERS autorisés à notifier (post-boucle)
     # PRIMITIVES ONLY : str/int/bool
-    open_queue: dict[uuid.UUID, list[dict[str, Any]]] = {}
+    open_queue: defaultdict[uuid.UUID, list[dict[str, Any]]] = defaultdict(list)
 
     # Buffer des RÉSOLUTIONS (post-boucle)
-    resolved_buffer: dict[uuid.UUID, list[dict[str, Any]]] = {}
+    resolved_buffer: defaultdict[uuid.UUID, list[dict[str, Any]]] = defaultdict(list)
 
     with open_session() as s:
         irepo = IncidentRepository(s)
@@ -416,7 +417,7 @@ def check_http_targets() -> int:
                             f"Erreur: {err or '-'}\n"
                             f"Détail: {t.get_status_message()}"
                         )
-                        open_queue.setdefault(t.client_id, []).append({
+                        open_queue[t.client_id].append({
                             "incident_id": str(inc.id),
                             "client_id": str(t.client_id),
                             "severity": "warning",
@@ -457,7 +458,7 @@ def check_http_targets() -> int:
                     s.commit()
 
                     if resolved:
-                        resolved_buffer.setdefault(t.client_id, []).append(
+                        resolved_buffer[t.client_id].append(
                             {
                                 "name": t.name,
                                 "url": t.url,
@@ -87,7 +87,7 @@ def _compute_ingest_id(client_id: str, machine_key: str, sent_at: datetime, metr
 def ingest_metrics(
     *,
     payload: IngestRequest,
-    api_key: Any,                         # instance ApiKey retournée par api_key_auth_optional (ou None)
+    api_key: Any,                         # ApiKeyIdentity retournée par api_key_auth_optional (ou None)
     x_ingest_id: Optional[str] = None,    # header X-Ingest-Id brut
 ) -> dict | JSONResponse:
     """
@@ -126,13 +126,10 @@ def ingest_metrics(
     # -------------------------------------------------------------------
     if api_key is None:
         # Résolution de l'API key via la valeur envoyée par l’agent.
-        # On utilise une session courte et on détache l’objet pour
-        # éviter les conflits de sessions plus loin.
+        # Session courte ; le résultat (ApiKeyIdentity) n'est pas un objet ORM,
+        # donc aucun conflit de sessions plus loin.
         with open_session() as s:
             api_key = resolve_api_key_from_value(payload.agent_key or "", s)  # peut lever 401
-            # ⚠️ Très important : détacher l'objet de cette session
-            # pour éviter "Object ... is already attached to session X"
-            s.expunge(api_key)
 
     # Clé "machine" technique (utilisée pour l’ID d’ingestion auto-* /
     # compat avec l’ancien mécanisme d’idempotence).
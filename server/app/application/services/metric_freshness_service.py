@@ -10,8 +10,9 @@ NOUVELLE LOGIQUE (corrigée) :
 1. On analyse toutes les métriques actives et non pausées d'une machine
    (MetricInstance.is_alerting_enabled=True & is_paused=False).
 2. On NE CRÉE AUCUN INCIDENT dans la boucle principale.
-   -> On collecte seulement les infos dans des buffers.
-3. Après analyse complète d'une machine :
+   -> On collecte seulement les infos dans des buffers (machine courante).
+3. Après analyse complète d'une machine (rows triées par machine, la machine
+   est traitée dès que le flux passe à la suivante) :
    - Si TOUTES les métriques candidates sont stale -> MACHINE DOWN
         => 1 seul incident CRITICAL par machine
         => on résout tous les incidents de type "Metric no data"
@@ -70,6 +71,21 @@ STARTUP_GRACE_SECONDS = settings.MONITORING_STARTUP_GRACE_SECONDS
 
 METRIC_NO_DATA_TITLE_PREFIX = "Métrique donnée manquante : "
 
+# Fuseau d'affichage des dates (résolu une seule fois au chargement du module)
+_SERVER_TZ = ZoneInfo(getattr(settings, "SERVER_TIMEZONE", "UTC"))
+
+
+class _MachineLite:
+    """Vue machine minimale partagée par toutes les rows d'une même machine."""
+
+    __slots__ = ("id", "hostname", "client_id", "status")
+
+    def __init__(self, id: uuid.UUID, hostname: str, client_id: uuid.UUID, status: str | None) -> None:
+        self.id = id
+        self.hostname = hostname
+        self.client_id = client_id
+        self.status = status
+
 
 def _as_utc(dt_val: datetime | None) -> datetime | None:
     """Normalise un datetime en UTC (timezone-aware)."""
@@ -79,14 +95,11 @@ def _as_utc(dt_val: datetime | None) -> datetime | None:
         return dt_val.replace(tzinfo=timezone.utc)
     return dt_val.astimezone(timezone.utc)
 
-def _server_tzinfo():
-    return ZoneInfo(getattr(settings, "SERVER_TIMEZONE", "UTC"))
-
 def _fmt_server_tz(dt_val: datetime | None) -> str:
     if not dt_val:
         return "inconnue"
     dt_utc = _as_utc(dt_val)
-    return dt_utc.astimezone(_server_tzinfo()).isoformat()
+    return dt_utc.astimezone(_SERVER_TZ).isoformat()
 
 def is_metric_instance_fresh(
     metric_instance: MetricInstance,
@@ -121,6 +134,8 @@ def _iter_candidate_metrics(s: Session, *, batch_size: int = 2000) -> Iterable[t
     - ne charge pas les objets ORM complets (MetricInstance/Machine)
     - ne matérialise pas toute la liste (pas de .all())
     - stream via yield_per(batch_size)
+    - trié par machine : toutes les lignes d'une machine sont contiguës,
+      ce qui permet de traiter la machine dès sa dernière ligne (réduction streaming)
 
     Yields tuples:
       (mi_id, mi_name, mi_updated_at, machine_id, hostname, client_id, machine_status)
@@ -140,6 +155,7 @@ def _iter_candidate_metrics(s: Session, *, batch_size: int = 2000) -> Iterable[t
             MetricInstance.is_alerting_enabled.is_(True),
             MetricInstance.is_paused.is_(False),
         )
+        .order_by(Machine.id, MetricInstance.id)
         .yield_per(batch_size)
     )
 
@@ -170,26 +186,28 @@ def _analyze_candidate_row_columns(
     client_id: uuid.UUID,
     machine_status: str | None,
     threshold_sec: int,
-    stale_by_machine: Dict[uuid.UUID, Dict[uuid.UUID, list[Dict[str, Any]]]],
-    resolved_by_machine: Dict[uuid.UUID, Dict[uuid.UUID, list[Dict[str, Any]]]],
-    total_candidates_by_machine: Dict[uuid.UUID, int],
-    machines_cache: Dict[uuid.UUID, Any],
+    stale_items: list[Dict[str, Any]],
+    fresh_items: list[Dict[str, Any]],
+    machines_cache: Dict[uuid.UUID, _MachineLite],
+    open_metric_incident_ids: set[uuid.UUID],
+    all_pairs: set[tuple[uuid.UUID, uuid.UUID]],
 ) -> bool:
     """
-    Analyse 1 row "colonnes" candidate.
-    Remplit les buffers et retourne True si STALE, False sinon.
+    Analyse 1 row "colonnes" candidate de la machine courante.
+    Remplit les buffers de la machine (et all_pairs à la 1ère row de la machine)
+    et retourne True si STALE, False sinon.
+
+    Une row fresh n'est bufferisée que si un incident NO_DATA_METRIC est ouvert
+    pour elle (sinon il n'y a rien à résoudre : cas très majoritaire).
     """
-    # Cache machine "léger"
+    # Cache machine "léger" : le hostname de la 1ère row est réutilisé pour
+    # toutes les suivantes (les chaînes dupliquées du driver sont libérées aussitôt).
     machine = machines_cache.get(machine_id)
     if machine is None:
-        machine = type("MachineLite", (), {})()
-        machine.id = machine_id
-        machine.hostname = hostname
-        machine.client_id = client_id
-        machine.status = machine_status
+        machine = _MachineLite(machine_id, hostname, client_id, machine_status)
         machines_cache[machine_id] = machine
-
-    total_candidates_by_machine[machine_id] = total_candidates_by_machine.get(machine_id, 0) + 1
+        all_pairs.add((client_id, machine_id))
+    hostname = machine.hostname
 
     updated_at_utc = _as_utc(mi_updated_at)
     effective_since = max(updated_at_utc or MONITORING_STARTED_AT, MONITORING_STARTED_AT)
@@ -209,7 +227,7 @@ def _analyze_candidate_row_columns(
     )
 
     if is_stale:
-        stale_by_machine.setdefault(client_id, {}).setdefault(machine_id, []).append(
+        stale_items.append(
             {
                 "metric_name": mi_name,
                 "metric_instance_id": mi_id,
@@ -221,7 +239,10 @@ def _analyze_candidate_row_columns(
         )
         return True
 
-    resolved_by_machine.setdefault(client_id, {}).setdefault(machine_id, []).append(
+    if mi_id not in open_metric_incident_ids:
+        return False
+
+    fresh_items.append(
         {
             "metric_name": mi_name,
             "metric_instance_id": mi_id,
@@ -232,36 +253,26 @@ def _analyze_candidate_row_columns(
     return False
 
 
-def _build_all_pairs(
-    stale_by_machine: Dict[uuid.UUID, Dict[uuid.UUID, list[Dict[str, Any]]]],
-    resolved_by_machine: Dict[uuid.UUID, Dict[uuid.UUID, list[Dict[str, Any]]]],
-) -> set[tuple[uuid.UUID, uuid.UUID]]:
-    pairs: set[tuple[uuid.UUID, uuid.UUID]] = set()
-    for cid, machines in stale_by_machine.items():
-        for mid in machines.keys():
-            pairs.add((cid, mid))
-    for cid, machines in resolved_by_machine.items():
-        for mid in machines.keys():
-            pairs.add((cid, mid))
-    return pairs
-
-
 def _process_machine_decisions(
     *,
     s,
     irepo: "IncidentRepository",
     client_id: uuid.UUID,
     machine_id: uuid.UUID,
-    machine: Any,
+    machine: _MachineLite,
     total_candidates: int,
     stale_items: list[Dict[str, Any]],
     fresh_items: list[Dict[str, Any]],
     machines_avec_notif_restore: set[tuple[uuid.UUID, uuid.UUID]],
+    has_open_machine_incident: bool,
 ) -> None:
     """
     Applique les décisions NO-DATA pour une machine donnée, à partir des buffers
     stale_items / fresh_items construits pendant le scan.
 
+    fresh_items ne contient que les métriques fresh ayant un incident NO_DATA_METRIC
+    ouvert : la présence de métriques fresh se déduit donc de total_candidates.
+
     Règles importantes (anti-flapping / anti-spam) :
     - On s'appuie sur les helpers *atomiques* du repository :
         open_nodata_machine_incident / open_nodata_metric_incident
@@ -275,13 +286,11 @@ def _process_machine_decisions(
     hostname = machine.hostname
 
     stale_metric_names = {it["metric_name"] for it in stale_items}
-    fresh_metric_names = {it["metric_name"] for it in fresh_items}
 
     stale_count = len(stale_items)
-    fresh_count = len(fresh_items)
 
     has_stale = stale_count > 0
-    has_fresh = fresh_count > 0
+    has_fresh = stale_count < total_candidates
     has_candidates = total_candidates > 0
 
     stale_ids = {it["metric_instance_id"] for it in stale_items}
@@ -350,9 +359,10 @@ def _process_machine_decisions(
 
     # ---------------------------------------------------------------------
     # CAS B : machine avec au moins une métrique fresh
-    #         => on peut résoudre l'incident machine NO_DATA_MACHINE s'il existe.
+    #         => on peut résoudre l'incident machine NO_DATA_MACHINE s'il existe
+    #            (connu dès le début du scan, pas de requête sinon).
     # ---------------------------------------------------------------------
-    if has_candidates and has_fresh:
+    if has_candidates and has_fresh and has_open_machine_incident:
         inc_machine = irepo.resolve_open_nodata_machine_incident(
             client_id=client_id,
             machine_id=machine_id,
@@ -473,7 +483,7 @@ def _process_machine_decisions(
     # CAS D : Résolution des incidents métriques redevenues fraîches
     #         => on ne résout QUE le type NO_DATA_METRIC.
     # ---------------------------------------------------------------------
-    if has_fresh:
+    if fresh_items:
         for it in fresh_items:
             inc = irepo.resolve_open_nodata_metric_incident(
                 client_id=client_id,
@@ -526,19 +536,33 @@ def check_metrics_no_data() -> int:
 
     stale_count = 0
     thresholds_cache: Dict[uuid.UUID, int] = {}
-    stale_by_machine: Dict[uuid.UUID, Dict[uuid.UUID, list[Dict[str, Any]]]] = {}
-    resolved_by_machine: Dict[uuid.UUID, Dict[uuid.UUID, list[Dict[str, Any]]]] = {}
-    total_candidates_by_machine: Dict[uuid.UUID, int] = {}
-    machines_cache: Dict[uuid.UUID, Any] = {}
-
-    with open_session() as s:
+    machines_cache: Dict[uuid.UUID, _MachineLite] = {}
+    machines_avec_notif_restore: set[tuple[uuid.UUID, uuid.UUID]] = set()
+    all_pairs: set[tuple[uuid.UUID, uuid.UUID]] = set()
+
+    # Accumulateurs de la machine en cours (les rows arrivent triées par machine)
+    cur_mid: uuid.UUID | None = None
+    cur_cid: uuid.UUID | None = None
+    cur_stale: list[Dict[str, Any]] = []
+    cur_fresh: list[Dict[str, Any]] = []
+    cur_total = 0
+
+    # Lecture streamée sur une session dédiée : un rollback côté écriture
+    # (course sur IncidentRepository.open) ne doit pas invalider le curseur serveur.
+    with open_session() as s, open_session() as rs:
         csrepo = ClientSettingsRepository(s)
         irepo = IncidentRepository(s)
 
         logger.info("metric_freshness: starting candidate scan (optimized columns + yield_per)")
         logger.debug("metric_freshness: MONITORING_STARTED_AT=%s", MONITORING_STARTED_AT.isoformat())
 
-        # Phase 1 (streaming)
+        # Préchargement (1 requête chacun) des incidents NO-DATA ouverts :
+        # seules ces métriques / machines peuvent donner lieu à une résolution.
+        open_metric_incident_ids = irepo.list_open_nodata_metric_instance_ids()
+        open_machine_incidents = irepo.list_open_machine_nodata_incidents()
+        open_machine_pairs = {(inc.client_id, inc.machine_id) for inc in open_machine_incidents}
+
+        # Phase 1+2 (streaming) : une machine est traitée dès sa dernière row
         for (
             mi_id,
             mi_name,
@@ -547,8 +571,26 @@ def check_metrics_no_data() -> int:
             hostname,
             client_id,
             machine_status,
-        ) in _iter_candidate_metrics(s, batch_size=2000):
+        ) in _iter_candidate_metrics(rs, batch_size=2000):
+            if machine_id != cur_mid:
+                if cur_mid is not None:
+                    _process_machine_decisions(
+                        s=s,
+                        irepo=irepo,
+                        client_id=cur_cid,
+                        machine_id=cur_mid,
+                        machine=machines_cache[cur_mid],
+                        total_candidates=cur_total,
+                        stale_items=cur_stale,
+                        fresh_items=cur_fresh,
+                        machines_avec_notif_restore=machines_avec_notif_restore,
+                        has_open_machine_incident=(cur_cid, cur_mid) in open_machine_pairs,
+                    )
+                cur_mid, cur_cid = machine_id, client_id
+                cur_stale, cur_fresh, cur_total = [], [], 0
+
             threshold_sec = _get_threshold(client_id, csrepo, thresholds_cache)
+            cur_total += 1
 
             if _analyze_candidate_row_columns(
                 now=now,
@@ -560,54 +602,45 @@ def check_metrics_no_data() -> int:
                 client_id=client_id,
                 machine_status=machine_status,
                 threshold_sec=threshold_sec,
-                stale_by_machine=stale_by_machine,
-                resolved_by_machine=resolved_by_machine,
-                total_candidates_by_machine=total_candidates_by_machine,
+                stale_items=cur_stale,
+                fresh_items=cur_fresh,
                 machines_cache=machines_cache,
+                open_metric_incident_ids=open_metric_incident_ids,
+                all_pairs=all_pairs,
             ):
                 stale_count += 1
 
-        # Phase 2
-        machines_avec_notif_restore: set[tuple[uuid.UUID, uuid.UUID]] = set()
-        all_pairs = _build_all_pairs(stale_by_machine, resolved_by_machine)
-
-        for client_id, machine_id in sorted(all_pairs, key=lambda x: (str(x[0]), str(x[1]))):
-            machine = machines_cache.get(machine_id)
-            if not machine:
-                logger.warning(
-                    "metric_freshness: missing Machine object for machine_id=%s (client_id=%s)",
-                    machine_id,
-                    client_id,
-                )
-                continue
-
+        # Dernière machine du flux
+        if cur_mid is not None:
             _process_machine_decisions(
                 s=s,
                 irepo=irepo,
-                client_id=client_id,
-                machine_id=machine_id,
-                machine=machine,
-                total_candidates=total_candidates_by_machine.get(machine_id, 0),
-                stale_items=stale_by_machine.get(client_id, {}).get(machine_id, []),
-                fresh_items=resolved_by_machine.get(client_id, {}).get(machine_id, []),
+                client_id=cur_cid,
+                machine_id=cur_mid,
+                machine=machines_cache[cur_mid],
+                total_candidates=cur_total,
+                stale_items=cur_stale,
+                fresh_items=cur_fresh,
                 machines_avec_notif_restore=machines_avec_notif_restore,
+                has_open_machine_incident=(cur_cid, cur_mid) in open_machine_pairs,
             )
 
-        # Phase 3 (bonus)
-        open_machine_incidents = irepo.list_open_machine_nodata_incidents()
-        for inc in open_machine_incidents:
-            mid = inc.machine_id
-            cid = inc.client_id
-            if (cid, mid) in all_pairs:
-                continue
-
+        # Phase 3 (bonus) : incidents machine préchargés, ceux ouverts pendant
+        # le scan concernent forcément une paire de all_pairs.
+        to_resolve = [
+            inc.id
+            for inc in open_machine_incidents
+            if (inc.client_id, inc.machine_id) not in all_pairs
+        ]
+        if to_resolve:
+            # Compte en INFO ; la liste (potentiellement longue) seulement en DEBUG
             logger.info(
-                "metric_freshness: resolving obsolete 'Machine not sending data' "
-                "incident id=%s for machine_id=%s (plus aucune métrique candidate)",
-                inc.id,
-                mid,
+                "metric_freshness: resolving %d obsolete 'Machine not sending data' "
+                "incident(s) (plus aucune métrique candidate)",
+                len(to_resolve),
             )
-            irepo.resolve(inc)
+            logger.debug("metric_freshness: obsolete machine incident ids: %s", to_resolve)
+            irepo.resolve_bulk(to_resolve)
 
         s.commit()
 
@@ -4,19 +4,129 @@ from __future__ import annotations
 Notifications (Slack/email) — helpers synchrones (hors Celery).
 Sert surtout pour des notifications ad-hoc (ex: admin), le pipeline standard passe par la task Celery.
 """
+import asyncio
+import atexit
 import logging
+import threading
+import time
 import httpx
 import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from typing import Iterable
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, event, select
+from sqlalchemy.orm import Session
 
-from app.infrastructure.persistence.database.session import open_session
+from app.core.utils.ttl_cache import TTLCache
+from app.infrastructure.persistence.database.session import open_session, read_session
 from app.infrastructure.persistence.repositories.client_settings_repository import ClientSettingsRepository
+from app.infrastructure.persistence.database.models.client_settings import ClientSettings
 from app.infrastructure.persistence.database.models.notification_log import NotificationLog
 
 log = logging.getLogger(__name__)
 
+# Providers "techniques" journalisés dans NotificationLog (marqueurs grace /
+# regroupement / cooldown) : ce ne sont pas de vraies notifications envoyées.
+TECH_NOTIFICATION_PROVIDERS: frozenset[str] = frozenset(("grace", "group_open", "cooldown"))
+
+# Client HTTP partagé (keep-alive) : évite un handshake TCP+TLS par POST Slack.
+_HTTP: httpx.Client | None = None
+_HTTP_LOCK = threading.Lock()
+
+
+def _get_http() -> httpx.Client:
+    """Client httpx du module, construit paresseusement (thread-safe)."""
+    global _HTTP
+    if _HTTP is None:
+        with _HTTP_LOCK:
+            if _HTTP is None:
+                _HTTP = httpx.Client(
+                    timeout=httpx.Timeout(5.0),
+                    limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+                )
+                atexit.register(_HTTP.close)
+    return _HTTP
+
+
+def _new_async_http() -> httpx.AsyncClient:
+    """
+    Client httpx asynchrone. Lié à la boucle asyncio courante : on en crée un
+    par fan-out (et non un singleton module, qui survivrait à asyncio.run()).
+    """
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(5.0),
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+    )
+
+
+# Cache (par process) du webhook Slack effectif par client : évite une session
+# + un SELECT par notification ad-hoc. Invalidé par les événements ORM
+# ClientSettings ci-dessous (écritures faites dans CE process) ; pour les autres
+# process, la valeur se rafraîchit au plus tard après `ttl`.
+_WEBHOOK_CACHE = TTLCache(maxsize=5_000, ttl=60.0)
+_CACHE_MISS = object()
+
+
+def _get_client_webhook(client_id: uuid.UUID) -> str | None:
+    url = _WEBHOOK_CACHE.get(client_id, _CACHE_MISS)
+    if url is _CACHE_MISS:
+        with open_session() as s:
+            url = ClientSettingsRepository(s).get_effective_slack_webhook(client_id)
+        _WEBHOOK_CACHE.set(client_id, url)
+    return url
+
+
+@event.listens_for(ClientSettings, "after_insert")
+@event.listens_for(ClientSettings, "after_update")
+@event.listens_for(ClientSettings, "after_delete")
+def _invalidate_client_webhook(mapper, connection, target: ClientSettings) -> None:
+    _WEBHOOK_CACHE.pop(target.client_id)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_webhooks_on_statement(orm_execute_state) -> None:
+    """
+    INSERT ... ON CONFLICT / UPDATE ... RETURNING / DELETE sur ClientSettings
+    (ClientSettingsRepository) : hors flush, donc sans événements after_* ci-dessus.
+    Le client_id n'étant pas connu ici, on vide le cache (écritures rares).
+    """
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ is ClientSettings:
+        _WEBHOOK_CACHE.clear()
+
+
+def _resolve_slack_url(client_id: uuid.UUID | None, webhook: str | None) -> str | None:
+    if webhook or client_id is None:
+        return webhook
+    try:
+        return _get_client_webhook(client_id)
+    except Exception:
+        return None
+
+
+def _post_slack(url: str, text: str) -> bool:
+    try:
+        _get_http().post(url, json={"text": text}).raise_for_status()
+        return True
+    except Exception as exc:  # noqa: BLE001
+        log.warning("Slack send failed: %s", exc)
+        return False
+
+
+def _slack_retryable(exc: Exception) -> bool:
+    """
+    Nouvelle tentative seulement si le message n'a pas pu être pris en compte :
+    429 / 5xx, ou requête jamais partie (connexion). Un timeout de lecture peut
+    suivre un POST déjà accepté par Slack → pas de renvoi (doublon).
+    """
+    if isinstance(exc, httpx.HTTPStatusError):
+        code = exc.response.status_code
+        return code == 429 or code >= 500
+    return isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+
 
 def notify_slack(text: str, *, client_id: uuid.UUID | None = None, webhook: str | None = None) -> bool:
     """
@@ -25,24 +135,62 @@ def notify_slack(text: str, *, client_id: uuid.UUID | None = None, webhook: str
     ⚠️ Pour le pipeline normal de prod, préférer la task Celery `notify`.
     Ici c'est volontairement un helper "one-shot" (admin, debug, etc.).
     """
-    url = webhook
-    if not url and client_id is not None:
-        try:
-            with open_session() as s:
-                url = ClientSettingsRepository(s).get_effective_slack_webhook(client_id)
-        except Exception:
-            url = None
+    url = _resolve_slack_url(client_id, webhook)
+    if not url:
+        log.info("Slack webhook non configuré : %s", text)
+        return False
+    return _post_slack(url, text)
+
+
+# Pool borné de threads (non daemon : les envois en cours sont terminés à la
+# sortie du process) pour les envois Slack "fire-and-forget" : le thread appelant
+# (ex: requête HTTP admin) n'attend plus jusqu'à 5 s le webhook. Au-delà de
+# _SLACK_MAX_PENDING envois en attente, le message est abandonné (journalisé)
+# plutôt que de laisser grossir la file pendant une panne Slack.
+_SLACK_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="slack-notify")
+_SLACK_MAX_PENDING = 1000
+_SLACK_PENDING = threading.BoundedSemaphore(_SLACK_MAX_PENDING)
+_SLACK_RETRY_DELAYS: tuple[float, ...] = (0.5, 1.0)  # 3 tentatives au total
+
 
+def _notify_slack_with_retry(text: str, client_id: uuid.UUID | None, webhook: str | None) -> bool:
+    url = _resolve_slack_url(client_id, webhook)
     if not url:
         log.info("Slack webhook non configuré : %s", text)
         return False
+    for delay in (*_SLACK_RETRY_DELAYS, None):
+        try:
+            _get_http().post(url, json={"text": text}).raise_for_status()
+            return True
+        except Exception as exc:  # noqa: BLE001
+            if delay is None or not _slack_retryable(exc):
+                log.warning("Slack send failed: %s", exc)
+                return False
+            time.sleep(delay)
+    return False
+
 
+def notify_slack_in_background(
+    text: str,
+    *,
+    client_id: uuid.UUID | None = None,
+    webhook: str | None = None,
+) -> Future[bool] | None:
+    """
+    Variante non bloquante de notify_slack : l'envoi (jusqu'à 3 tentatives avec
+    backoff, sur 429/5xx/erreur de connexion) part dans _SLACK_POOL.
+    Retourne le Future (ignorable), ou None si la file est pleine (message abandonné).
+    """
+    if not _SLACK_PENDING.acquire(blocking=False):
+        log.warning("Slack queue full (%d pending), dropping message", _SLACK_MAX_PENDING)
+        return None
     try:
-        httpx.post(url, json={"text": text}, timeout=5.0)
-        return True
-    except Exception as exc:  # noqa: BLE001
-        log.warning("Slack send failed: %s", exc)
-        return False
+        fut = _SLACK_POOL.submit(_notify_slack_with_retry, text, client_id, webhook)
+    except RuntimeError:  # pool arrêté (shutdown du process)
+        _SLACK_PENDING.release()
+        return None
+    fut.add_done_callback(lambda _f: _SLACK_PENDING.release())
+    return fut
 
 
 def notify_email(subject: str, body: str, *, to: str | None) -> bool:
@@ -57,23 +205,119 @@ def notify_email(subject: str, body: str, *, to: str | None) -> bool:
     return True
 
 
+def _load_client_targets(client_id: uuid.UUID) -> tuple[str | None, str | None]:
+    """(email, webhook Slack) effectifs du client, lus dans une seule session."""
+    with open_session() as s:
+        return ClientSettingsRepository(s).get_notification_targets(client_id)
+
+
+async def _notify_slack_async(http: httpx.AsyncClient, url: str | None, text: str) -> bool:
+    if not url:
+        log.info("Slack webhook non configuré : %s", text)
+        return False
+    try:
+        (await http.post(url, json={"text": text})).raise_for_status()
+        return True
+    except Exception as exc:  # noqa: BLE001
+        log.warning("Slack send failed: %s", exc)
+        return False
+
+
+async def _notify_email_async(subject: str, body: str, *, to: str | None) -> bool:
+    if not to:
+        return False
+    # ✅ Envoi SMTP bloquant → thread, pour ne pas geler la boucle (ni le Slack en parallèle)
+    return await asyncio.to_thread(notify_email, subject, body, to=to)
+
+
+async def notify_client_async(
+    client_id: uuid.UUID,
+    subject: str,
+    text: str,
+    *,
+    http: httpx.AsyncClient | None = None,
+) -> dict:
+    """
+    Variante asynchrone de notify_client : email et Slack partent en parallèle
+    (latence = max(t_slack, t_email) au lieu de la somme).
+
+    `http` permet de partager un AsyncClient entre plusieurs clients (fan-out).
+    """
+    email, webhook = await asyncio.to_thread(_load_client_targets, client_id)
+
+    async def _send(client: httpx.AsyncClient) -> dict:
+        email_ok, slack_ok = await asyncio.gather(
+            _notify_email_async(subject, text, to=email),
+            _notify_slack_async(client, webhook, text),
+        )
+        return {"email": email_ok, "slack": slack_ok}
+
+    if http is not None:
+        return await _send(http)
+    async with _new_async_http() as client:
+        return await _send(client)
+
+
+async def notify_clients_async(client_ids: Iterable[uuid.UUID], subject: str, text: str) -> list[dict]:
+    """Fan-out admin : notifie N clients en parallèle avec un seul AsyncClient."""
+    async with _new_async_http() as http:
+        return list(
+            await asyncio.gather(
+                *(notify_client_async(cid, subject, text, http=http) for cid in client_ids)
+            )
+        )
+
+
 def notify_client(client_id: uuid.UUID, subject: str, text: str) -> dict:
     """
     Notifie synchronement selon la configuration du client.
     Helper ad-hoc, à ne pas utiliser dans les pipelines de prod.
+
+    ⚠️ Entièrement synchrone (pas d'asyncio.run) : utilisable y compris depuis un
+    thread qui exécute déjà une boucle. Depuis du code asynchrone, préférer
+    notify_client_async (email et Slack en parallèle).
     """
-    with open_session() as s:
-        repo = ClientSettingsRepository(s)
-        results = {"email": False, "slack": False}
+    email, webhook = _load_client_targets(client_id)
+    return {
+        "email": notify_email(subject, text, to=email) if email else False,
+        "slack": notify_slack(text, webhook=webhook),
+    }
+
+
+# Requête construite une seule fois : seul client_id varie (bindparam), la
+# forme compilée est réutilisée via le cache de statements de l'Engine.
+_LAST_NOTIF_STMT = (
+    select(NotificationLog.sent_at)
+    .where(
+        NotificationLog.client_id == bindparam("cid"),
+        # status / providers rendus en littéraux (literal_execute) : Postgres doit
+        # prouver le prédicat de l'index partiel ix_notif_log_real_per_client,
+        # ce qui est impossible avec des paramètres dans un plan générique.
+        NotificationLog.status == bindparam("status", "success", literal_execute=True),
+        NotificationLog.sent_at.is_not(None),
+        # exclusion technique
+        NotificationLog.provider.notin_(
+            bindparam(
+                "techs",
+                sorted(TECH_NOTIFICATION_PROVIDERS),
+                expanding=True,
+                literal_execute=True,
+            )
+        ),
+    )
+    .order_by(NotificationLog.sent_at.desc())
+    .limit(1)
+)
+
 
-        email = repo.get_effective_notification_email(client_id)
-        if email:
-            results["email"] = notify_email(subject, text, to=email)
+# Cache court (par process) de get_last_notification_sent_at : quelques secondes
+# de retard sont acceptables pour la fenêtre de regroupement.
+_LAST_NOTIF_CACHE = TTLCache(maxsize=10_000, ttl=5.0)
 
-        slack_ok = notify_slack(text, client_id=client_id)
-        results["slack"] = slack_ok
 
-        return results
+def invalidate_last_notification(client_id: uuid.UUID) -> None:
+    """À appeler après l'écriture d'une notification 'success' pour ce client."""
+    _LAST_NOTIF_CACHE.pop(client_id)
 
 
 def get_last_notification_sent_at(client_id: uuid.UUID) -> datetime | None:
@@ -83,15 +327,14 @@ def get_last_notification_sent_at(client_id: uuid.UUID) -> datetime | None:
 
     Utilisé notamment par le monitoring HTTP pour décider si on est dans la
     fenêtre de regroupement d'incidents.
+
+    Résultat mis en cache quelques secondes (invalidé par invalidate_last_notification).
     """
-    with open_session() as s:
-        return s.scalar(
-            select(NotificationLog.sent_at)
-            .where(
-                NotificationLog.client_id == client_id,
-                NotificationLog.status == "success",
-                ~NotificationLog.provider.in_(["grace", "group_open"]),  # exclusion technique
-            )
-            .order_by(NotificationLog.sent_at.desc())
-            .limit(1)
-        )
+    cached = _LAST_NOTIF_CACHE.get(client_id, _CACHE_MISS)
+    if cached is not _CACHE_MISS:
+        return cached
+
+    with read_session() as s:
+        sent_at = s.scalar(_LAST_NOTIF_STMT, {"cid": client_id})
+    _LAST_NOTIF_CACHE.set(client_id, sent_at)
+    return sent_at
@@ -18,6 +18,8 @@ Contrat :
 from typing import Any
 from uuid import UUID
 
+from sqlalchemy.orm import load_only
+
 from app.infrastructure.persistence.database.models.machine import Machine
 from app.infrastructure.persistence.database.models.api_key import ApiKey
 from app.infrastructure.persistence.database.session import open_session
@@ -44,6 +46,18 @@ class MachineFingerprintMismatch(MachineRegistrationError):
 # Helpers de normalisation
 # ─────────────────────────────────────────────────────────────────────────────
 
+# Seuls champs lus par _normalize_machine_info : évite de sérialiser le reste
+# du modèle (ex: `tags`, dict arbitraire) à chaque ingestion.
+_MACHINE_INFO_FIELDS = frozenset(("hostname", "name", "os", "os_type", "os_version", "fingerprint"))
+
+
+def _clean(value: Any) -> str | None:
+    """Chaîne strippée, ou None si absente / vide / non-str."""
+    if isinstance(value, str):
+        return value.strip() or None
+    return None
+
+
 def _normalize_machine_info(machine_info: Any) -> dict:
     """
     Normalise les infos machine dans un dict simple.
@@ -65,8 +79,8 @@ def _normalize_machine_info(machine_info: Any) -> dict:
     # 1) Convertir l'objet en dict "m"
     if machine_info is None:
         m = {}
-    elif hasattr(machine_info, "model_dump"):      # Pydantic v2
-        m = machine_info.model_dump()
+    elif hasattr(machine_info, "model_dump"):      # Pydantic v2 (chemin dominant)
+        m = machine_info.model_dump(include=_MACHINE_INFO_FIELDS)
     elif hasattr(machine_info, "dict"):            # Pydantic v1
         m = machine_info.dict()
     elif isinstance(machine_info, dict):
@@ -82,17 +96,14 @@ def _normalize_machine_info(machine_info: Any) -> dict:
             "fingerprint": getattr(machine_info, "fingerprint", None),
         }
 
-    # 2) Normalisation des champs de base
-    hostname_raw = m.get("hostname") or m.get("name") or "unknown"
-    hostname = (hostname_raw or "unknown").strip() or "unknown"
+    # 2) Normalisation des champs de base (un seul strip() par champ)
+    get = m.get
+    hostname = _clean(get("hostname") or get("name")) or "unknown"
 
     # Accepter soit "os_type", soit "os" venant du schéma MachineInfo
-    os_type_raw = m.get("os_type") or m.get("os")
-    os_type = (os_type_raw or "").strip() or None
-
-    os_version = (m.get("os_version") or "").strip() or None
-
-    fingerprint = (m.get("fingerprint") or "").strip() or None
+    os_type = _clean(get("os_type") or get("os"))
+    os_version = _clean(get("os_version"))
+    fingerprint = _clean(get("fingerprint"))
 
     return {
         "hostname": hostname,
@@ -139,7 +150,12 @@ def ensure_machine(machine_info: Any, api_key_id: UUID) -> Machine:
 
     with open_session() as s:
         mrepo = MachineRepository(s)
-        api_key = s.get(ApiKey, api_key_id)
+        # Seules machine_id / client_id servent ici : pas besoin d'hydrater la clé entière.
+        api_key = s.get(
+            ApiKey,
+            api_key_id,
+            options=[load_only(ApiKey.machine_id, ApiKey.client_id)],
+        )
 
         if api_key is None:
             raise ApiKeyMachineBindingError("API key not found")
@@ -170,13 +186,20 @@ def ensure_machine(machine_info: Any, api_key_id: UUID) -> Machine:
                     "Machine fingerprint mismatch for this API key"
                 )
 
-            # Mise à jour éventuelle des infos OS
+            # Mise à jour éventuelle des infos OS.
+            # Chemin dominant : rien n'a changé → aucune écriture d'attribut
+            # (donc pas de flush) et aucun commit.
+            os_type = info["os_type"]
+            os_version = info["os_version"]
+            if not (os_type or os_version):
+                return machine
+
             updated = False
-            if info["os_type"] and machine.os_type != info["os_type"]:
-                machine.os_type = info["os_type"]
+            if os_type and os_type != machine.os_type:
+                machine.os_type = os_type
                 updated = True
-            if info["os_version"] and machine.os_version != info["os_version"]:
-                machine.os_version = info["os_version"]
+            if os_version and os_version != machine.os_version:
+                machine.os_version = os_version
                 updated = True
 
             if updated:
@@ -197,10 +220,10 @@ def ensure_machine(machine_info: Any, api_key_id: UUID) -> Machine:
         s.add(machine)
         s.flush()  # machine.id dispo
 
-        api_key.machine_id = machine.id
-        s.add(api_key)
+        api_key.machine_id = machine.id  # api_key déjà attachée à la session
 
+        # Pas de refresh : tous les défauts de Machine sont côté Python et la
+        # session est en expire_on_commit=False → attributs toujours chargés.
         s.commit()
-        s.refresh(machine)
 
         return machine
@@ -5,14 +5,30 @@ Paramètres (pydantic-settings).
 """
 
 import os
-from typing import Optional
-from pydantic import Field
+from functools import lru_cache
+from typing import Any, Optional
+from pydantic import Field, TypeAdapter, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Construit une seule fois (la construction d'un TypeAdapter compile un validateur).
+_BACKOFFS_ADAPTER = TypeAdapter(tuple[int, ...])
+
+
 class Settings(BaseSettings):
     DATABASE_URL: str = "postgresql+psycopg://postgres:postgres@db:5432/monitoring"
     DB_CONNECT_TIMEOUT: int = Field(5, env="DB_CONNECT_TIMEOUT")
+    # Pool Postgres (QueuePool) : 20 + 20 par process API/worker, attente max
+    # d'une connexion libre, recyclage avant les timeouts serveur/proxy.
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    # ⚠️ Laisser à False derrière PgBouncer (mode transaction) : le SELECT 1 de
+    # checkout y coûte un aller-retour ; les liens morts sont détectés par les
+    # keepalives TCP (cf. session.py).
+    DB_POOL_PRE_PING: bool = False
     REDIS_URL: str = "redis://redis:6379/0"
+    NOTIF_COOLDOWN_REDIS: bool = False  # cooldown global servi par Redis (cache/cooldown_store)
     
     JWT_SECRET: str = "change-me"
     JWT_ALG: str = "HS256"
@@ -39,7 +55,7 @@ class Settings(BaseSettings):
     INGEST_LATE_MAX_SECONDS: int = 300  # 5 minutes de tolérance
     
     OUTBOX_BATCH_SIZE: int = 100
-    OUTBOX_BACKOFFS: list[int] = [30, 60, 120, 300, 600]  # in seconds
+    OUTBOX_BACKOFFS: tuple[int, ...] = (30, 60, 120, 300, 600)  # in seconds (immuable)
     OUTBOX_JITTER_PCT: float = 0.2  # 20%
     DEFAULT_PERCENT_THRESHOLD: float = 90.0
 
@@ -50,10 +66,27 @@ class Settings(BaseSettings):
     SMTP_USE_TLS: bool = Field(True, env="SMTP_USE_TLS")
     SMTP_FROM: Optional[str] = None
 
-    
+    @field_validator("OUTBOX_BACKOFFS", mode="before")
+    @classmethod
+    def _parse_outbox_backoffs(cls, v: Any) -> tuple[int, ...]:
+        """Accepte une séquence, du JSON ("[30, 60]") ou du CSV ("30,60")."""
+        if isinstance(v, str):
+            raw = v.strip()
+            if raw.startswith("["):
+                return _BACKOFFS_ADAPTER.validate_json(raw)
+            return tuple(int(x) for x in raw.split(",") if x.strip())
+        return _BACKOFFS_ADAPTER.validate_python(v)
+
     model_config = SettingsConfigDict(
         env_file_encoding="utf-8",
         case_sensitive=True,
     )
 
-settings = Settings()
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Instance unique de Settings (validation pydantic faite une seule fois)."""
+    return Settings()
+
+
+settings = get_settings()
@@ -1,8 +1,24 @@
 # server/app/core/logging.py
 from __future__ import annotations
+import atexit
+import copy
 import logging, os
 import json
+import queue
 import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+try:  # optionnel : orjson (~3x plus rapide que json) s'il est installé
+    import orjson
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    orjson = None
+
+
+def _dumps_json(data: dict) -> str:
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data)
 
 
 def _level_from_env(default: int = logging.INFO) -> int:
@@ -12,6 +28,58 @@ def _level_from_env(default: int = logging.INFO) -> int:
     return getattr(logging, name, default)
 
 
+class _InProcessQueueHandler(QueueHandler):
+    """
+    QueueHandler pour une file mémoire du même process : on fige seulement le
+    message (msg % args) et on garde exc_info intact, pour que JsonFormatter
+    produise toujours le champ "exception".
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+_LISTENER: QueueListener | None = None
+_QUEUE_HANDLER: _InProcessQueueHandler | None = None
+
+
+def _start_listener(handler: logging.Handler) -> QueueHandler:
+    global _LISTENER, _QUEUE_HANDLER
+    q: queue.SimpleQueue = queue.SimpleQueue()
+    _LISTENER = QueueListener(q, handler, respect_handler_level=True)
+    _LISTENER.start()
+    _QUEUE_HANDLER = _InProcessQueueHandler(q)
+    return _QUEUE_HANDLER
+
+
+def _stop_listener() -> None:
+    """Vide la file puis arrête le thread d'écriture (idempotent)."""
+    global _LISTENER
+    if _LISTENER is not None:
+        _LISTENER.stop()
+        _LISTENER = None
+
+
+def _restart_listener_in_child() -> None:
+    # ⚠️ Après fork (workers Celery prefork), le thread du listener n'existe pas
+    # dans l'enfant : on repart sur une file + un listener neufs.
+    global _LISTENER
+    if _LISTENER is None or _QUEUE_HANDLER is None:
+        return
+    q: queue.SimpleQueue = queue.SimpleQueue()
+    _LISTENER = QueueListener(q, *_LISTENER.handlers, respect_handler_level=True)
+    _LISTENER.start()
+    _QUEUE_HANDLER.queue = q
+
+
+atexit.register(_stop_listener)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_listener_in_child)
+
+
 def setup_logging(level: int | str | None = None) -> None:
     if isinstance(level, str):
         level = getattr(logging, level.upper(), logging.INFO)
@@ -21,13 +89,17 @@ def setup_logging(level: int | str | None = None) -> None:
     # Format JSON en prod, texte en dev
     env = os.getenv("ENVIRONMENT", "development")
     
+    _stop_listener()
+
     if env == "production":
-        # Format JSON pour parsing facile
+        # Format JSON pour parsing facile.
+        # Les threads applicatifs ne font qu'enfiler le record ; sérialisation
+        # JSON + écriture stdout sont faites par le thread du QueueListener.
         handler = logging.StreamHandler(sys.stdout)
         handler.setFormatter(JsonFormatter())
         logging.basicConfig(
             level=level,
-            handlers=[handler],
+            handlers=[_start_listener(handler)],
             force=True,
         )
     else:
@@ -44,13 +116,27 @@ def setup_logging(level: int | str | None = None) -> None:
         logging.getLogger("celery.app.trace").setLevel(logging.INFO)
 
 class JsonFormatter(logging.Formatter):
+    # (seconde entière, préfixe ISO-8601 UTC) : un seul formatage par seconde
+    # au lieu de time.localtime + strftime par record. Tuple remplacé d'un bloc
+    # → lecture cohérente même si plusieurs threads formatent.
+    _ts_cache: tuple[int, str] = (-1, "")
+
+    def _timestamp(self, record: logging.LogRecord) -> str:
+        sec = int(record.created)
+        cached_sec, prefix = self._ts_cache
+        if sec != cached_sec:
+            prefix = datetime.fromtimestamp(sec, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+            self._ts_cache = (sec, prefix)
+        return f"{prefix}.{int(record.msecs):03d}Z"
+
     def format(self, record):
         log_data = {
-            "timestamp": self.formatTime(record),
+            "timestamp": self._timestamp(record),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
         }
-        if record.exc_info:
-            log_data["exception"] = self.formatException(record.exc_info)
-        return json.dumps(log_data)
\ No newline at end of file
+        exc_info = record.exc_info
+        if exc_info:
+            log_data["exception"] = self.formatException(exc_info)
+        return _dumps_json(log_data)
\ No newline at end of file
@@ -4,21 +4,26 @@ from __future__ import annotations
 """
 Sécurité (API keys, mots de passe, JWT) + utilitaires cookies.
 
-- Contexte passlib : pbkdf2_sha256 (stable et portable)
+- Mots de passe : bcrypt direct (coût via env BCRYPT_ROUNDS), passlib gardé en compat
 - create_access_token / decode_* : JWT HS256 (secret via env JWT_SECRET)
 - cookie_kwargs : options cohérentes et convertit bien Max-Age (int)
 """
 
+import hashlib
 import os
-from datetime import datetime, timedelta, timezone
-from typing import Optional, List
+import time
+import uuid
+from functools import lru_cache
+from typing import NamedTuple, Optional, List
 
+import bcrypt
 from fastapi import Depends, Header, HTTPException, status
 from jose import jwt, JWTError
 from passlib.context import CryptContext
-from sqlalchemy import select
+from sqlalchemy import bindparam, event, inspect, select
 from sqlalchemy.orm import Session
 
+from app.core.utils.ttl_cache import TTLCache
 from app.infrastructure.persistence.database.models.api_key import ApiKey
 from app.infrastructure.persistence.database.session import get_db
 
@@ -29,12 +34,17 @@ REFRESH_COOKIE = "refresh_token"
 __all__ = [
     "ACCESS_COOKIE", "REFRESH_COOKIE",
     "api_key_auth", "api_key_auth_optional", "resolve_api_key_from_value",
-    "hash_password", "verify_password", "get_password_hash", "password_context",
-    "create_access_token", "decode_token", "decode_verify_token",
-    "cookie_kwargs", "pwd_ctx",
+    "ApiKeyIdentity", "invalidate_api_key",
+    "hash_password", "verify_password", "needs_rehash", "get_password_hash", "password_context",
+    "create_access_token", "decode_token", "decode_verify_token", "reload_jwt_secret",
+    "cookie_kwargs", "reload_cookie_config", "pwd_ctx",
 ]
 
-# Contexte de hachage unique pour toute l'app (utilisé aussi par seeds)
+# Coût bcrypt (2^rounds itérations) : réglable selon le matériel via BCRYPT_ROUNDS.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# Contexte passlib conservé pour compat (anciens imports / seeds) ; le chemin
+# chaud (hash_password / verify_password) appelle bcrypt directement.
 pwd_ctx = CryptContext(
     schemes=["bcrypt"],
     deprecated="auto",
@@ -42,51 +52,127 @@ pwd_ctx = CryptContext(
 # Aliases compatibles éventuels (anciens imports)
 password_context = pwd_ctx
 def get_password_hash(p: str) -> str:  # compat
-    return pwd_ctx.hash(p)
+    return hash_password(p)
 
 # ── API keys ─────────────────────────────────────────────────────────────────
+class ApiKeyIdentity(NamedTuple):
+    """
+    Vue détachée (immuable) d'une ApiKey active, telle que mise en cache.
+    Pas d'instance ORM : aucun lien avec la Session qui l'a chargée.
+    """
+    id: uuid.UUID
+    client_id: uuid.UUID
+    machine_id: uuid.UUID | None
+    key: str
+    name: str | None
+
+
+# Cache court des clés valides (clé = SHA-256 de la valeur, jamais la valeur
+# brute). Les clés inconnues/inactives ne sont pas mises en cache.
+_API_KEY_CACHE = TTLCache(
+    maxsize=int(os.getenv("APIKEY_CACHE_MAX", "5000")),
+    ttl=float(os.getenv("APIKEY_CACHE_TTL", "30")),
+)
+
+
+def _api_key_digest(value: str) -> bytes:
+    return hashlib.sha256(value.encode()).digest()
+
+
+def invalidate_api_key(value: str) -> None:
+    """Retire une clé du cache (rotation / désactivation)."""
+    _API_KEY_CACHE.pop(_api_key_digest(value))
+
+
+@event.listens_for(ApiKey, "after_update")
+@event.listens_for(ApiKey, "after_delete")
+def _invalidate_api_key_on_change(mapper, connection, target: ApiKey) -> None:
+    invalidate_api_key(target.key)
+    # Rotation : l'ancienne valeur ne doit plus s'authentifier via le cache
+    for old in inspect(target).attrs.key.history.deleted:
+        if old:
+            invalidate_api_key(old)
+
+
+# Colonnes seulement (pas d'objet ORM / identity map), construit une fois.
+_API_KEY_LOOKUP_STMT = (
+    select(*(getattr(ApiKey, f) for f in ApiKeyIdentity._fields))
+    .where(ApiKey.key == bindparam("k"), ApiKey.is_active.is_(True))
+    .limit(1)
+)
+
+
+def _lookup_api_key(session: Session, value: str) -> ApiKeyIdentity | None:
+    digest = _api_key_digest(value)
+    ident = _API_KEY_CACHE.get(digest)
+    if ident is not None:
+        return ident
+    row = session.execute(_API_KEY_LOOKUP_STMT, {"k": value}).first()
+    if row is None:
+        return None
+    ident = ApiKeyIdentity(*row)
+    _API_KEY_CACHE.set(digest, ident)
+    return ident
+
 async def api_key_auth(
     x_api_key: Optional[str] = Header(default=None, alias="X-API-Key"),
     session: Session = Depends(get_db),
-):
+) -> ApiKeyIdentity:
     if not x_api_key:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing API key")
-    row = session.scalar(select(ApiKey).where(ApiKey.key == x_api_key, ApiKey.is_active.is_(True)))
-    if not row:
+    ident = _lookup_api_key(session, x_api_key)
+    if not ident:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid API key")
-    return row
+    return ident
 
 async def api_key_auth_optional(
     x_api_key: Optional[str] = Header(default=None, alias="X-API-Key"),
     session: Session = Depends(get_db),
-):
+) -> ApiKeyIdentity | None:
     if not x_api_key:
         return None
-    row = session.scalar(select(ApiKey).where(ApiKey.key == x_api_key, ApiKey.is_active.is_(True)))
-    if not row:
+    ident = _lookup_api_key(session, x_api_key)
+    if not ident:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid API key")
-    return row
+    return ident
 
-def resolve_api_key_from_value(key: str, session: Session) -> ApiKey:
+def resolve_api_key_from_value(key: str, session: Session) -> ApiKeyIdentity:
     k = (key or "").strip()
     if not k:
         raise HTTPException(status_code=401, detail="Invalid API key")
-    row = session.scalar(select(ApiKey).where(ApiKey.key == k, ApiKey.is_active.is_(True)))
-    if not row:
+    ident = _lookup_api_key(session, k)
+    if not ident:
         raise HTTPException(status_code=401, detail="Invalid API key")
-    return row
+    return ident
 
 # ── Passwords ────────────────────────────────────────────────────────────────
 def hash_password(p: str) -> str:
-    return pwd_ctx.hash(p)
+    return bcrypt.hashpw(p.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
 
 def verify_password(p: str, h: str) -> bool:
-    return pwd_ctx.verify(p, h)
+    try:
+        return bcrypt.checkpw(p.encode(), h.encode())
+    except ValueError:  # hash illisible / pas un hash bcrypt
+        return False
+
+def needs_rehash(h: str) -> bool:
+    """True si le hash bcrypt utilise un coût inférieur à BCRYPT_ROUNDS ("$2b$<cost>$...")."""
+    try:
+        return int(h.split("$")[2]) < BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
 
 # ── JWT ──────────────────────────────────────────────────────────────────────
+@lru_cache(maxsize=1)
 def _jwt_secret() -> str:
+    """Secret JWT lu une seule fois (voir reload_jwt_secret après rotation)."""
     return os.getenv("JWT_SECRET", "change-me-in-env")
 
+def reload_jwt_secret() -> None:
+    """Force la relecture de JWT_SECRET (rotation de secret, tests)."""
+    _jwt_secret.cache_clear()
+    _JWT_CACHE.clear()
+
 def create_access_token(
     payload: dict,
     *,
@@ -97,17 +183,42 @@ def create_access_token(
     if not isinstance(payload, dict):
         raise TypeError("payload must be a dict")
     data = dict(payload)
-    now = datetime.now(timezone.utc)
-    data.setdefault("iat", int(now.timestamp()))
-    data["exp"] = now + timedelta(seconds=int(expires_seconds))
+    # Timestamps POSIX entiers (format JWT) : pas de datetime/timedelta intermédiaires
+    now_ts = int(time.time())
+    data.setdefault("iat", now_ts)
+    data["exp"] = now_ts + int(expires_seconds)
     return jwt.encode(data, secret or _jwt_secret(), algorithm=algorithm)
 
+# Cache des vérifications JWT réussies (clé = SHA-256 du token, jamais le token
+# brut). Un échec n'est jamais mis en cache ; une entrée ne survit pas à `exp`.
+_JWT_CACHE = TTLCache(
+    maxsize=int(os.getenv("JWT_CACHE_MAX", "10000")),
+    ttl=float(os.getenv("JWT_CACHE_TTL", "5")),
+)
+
 def decode_token(token: str, *, secret: str | None = None, algorithms: Optional[List[str]] = None) -> Optional[dict]:
+    secret = secret or _jwt_secret()
+    algorithms = algorithms or ["HS256"]
+    key = (hashlib.sha256(token.encode()).digest(), secret, tuple(algorithms))
+    now = time.time()
+
+    claims = _JWT_CACHE.get(key)
+    if claims is not None:
+        exp = claims.get("exp")
+        if exp is None or exp > now:
+            return dict(claims)
+
     try:
-        return jwt.decode(token, secret or _jwt_secret(), algorithms=algorithms or ["HS256"])
+        claims = jwt.decode(token, secret, algorithms=algorithms)
     except JWTError:
         return None
 
+    exp = claims.get("exp")
+    ttl = _JWT_CACHE.ttl if exp is None else min(_JWT_CACHE.ttl, float(exp) - now)
+    if ttl > 0:
+        _JWT_CACHE.set(key, dict(claims), ttl=ttl)
+    return claims
+
 def decode_verify_token(token: str, *, expect_typ: str | None = None) -> dict:
     claims = decode_token(token)
     if not claims:
@@ -117,6 +228,17 @@ def decode_verify_token(token: str, *, expect_typ: str | None = None) -> dict:
     return claims
 
 # ── Cookies ──────────────────────────────────────────────────────────────────
+def _read_cookie_secure() -> bool:
+    return os.getenv("COOKIE_SECURE", "false").lower() in {"1", "true", "yes"}
+
+# Lu une fois à l'import (voir reload_cookie_config pour les tests)
+_COOKIE_SECURE = _read_cookie_secure()
+
+def reload_cookie_config() -> None:
+    """Relit COOKIE_SECURE depuis l'environnement (tests)."""
+    global _COOKIE_SECURE
+    _COOKIE_SECURE = _read_cookie_secure()
+
 def cookie_kwargs(max_age: int | None = None) -> dict:
     """
     Options communes pour set_cookie() / delete_cookie().
@@ -127,7 +249,7 @@ def cookie_kwargs(max_age: int | None = None) -> dict:
     kw = {
         "httponly": True,
         "samesite": "Strict",
-        "secure": os.getenv("COOKIE_SECURE", "false").lower() in {"1", "true", "yes"},
+        "secure": _COOKIE_SECURE,
         "path": "/",
     }
     if max_age is not None:
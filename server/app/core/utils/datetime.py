@@ -9,10 +9,15 @@ Utilitaires pour la gestion des dates et heures.
 from datetime import datetime, timezone
 from typing import Optional
 
-def age_in_seconds(dt: Optional[datetime]) -> Optional[int]:
-    """Retourne l’âge (en secondes) d’un datetime UTC, ou None si absent."""
+def age_in_seconds(dt: Optional[datetime], *, now: Optional[datetime] = None) -> Optional[int]:
+    """
+    Retourne l’âge (en secondes) d’un datetime UTC, ou None si absent.
+
+    `now` : horloge de référence partagée — les appelants qui traitent un lot
+    (ex: liste de cibles) la calculent une fois et la passent à chaque appel.
+    """
     if not dt:
         return None
-    now = datetime.now(timezone.utc)
-    delta = now - dt
-    return int(delta.total_seconds())
+    if now is None:
+        now = datetime.now(timezone.utc)
+    return int((now - dt).total_seconds())
@@ -0,0 +1,61 @@
+# server/app/core/utils/ttl_cache.py
+"""server/app/core/utils/ttl_cache.py
+~~~~~~~~~~~~~~~~~~~~~~~~
+Petit cache mémoire à durée de vie (TTL), thread-safe, sans dépendance externe.
+
+- Entrées expirées : ignorées (et purgées) à la lecture.
+- Taille bornée : au-delà de `maxsize`, l'entrée la plus ancienne est évincée.
+- Cache *par process* : chaque worker uvicorn/celery a le sien.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class TTLCache:
+    """Cache clé -> valeur avec expiration (time.monotonic)."""
+
+    def __init__(self, *, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Valeur associée à `key`, ou `default` si absente / expirée."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any, *, ttl: float | None = None) -> None:
+        """Stocke `value` ; `ttl` (secondes) surcharge la durée par défaut."""
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """Invalide `key` (no-op si absente)."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -7,32 +7,39 @@ Règles métier utilisées pour évaluer les seuils.
 Fonction principale :
     match_condition(metric_type, condition, sample_value, threshold_or_value)
 Compare une valeur mesurée à un seuil en fonction du type.
+compile_rule(...) en fournit la version pré-compilée (prédicat réutilisable).
 """
 
 import operator as op
 import re
 from datetime import datetime
-from typing import Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Mapping
 
-OPS = {
+# Table figée (lecture seule) : résolue une fois par règle dans compile_rule,
+# le prédicat compilé appelle directement la fonction C de `operator`.
+OPS: Mapping[str, Callable[[Any, Any], Any]] = MappingProxyType({
     "gt": op.gt,  ">":  op.gt,
     "ge": op.ge,  ">=": op.ge,
     "lt": op.lt,  "<":  op.lt,
     "le": op.le,  "<=": op.le,
     "eq": op.eq,  "==": op.eq,
     "ne": op.ne,  "!=": op.ne,
+})
+
+# Alias de type (déjà strip/lower) → type canonique ; tout le reste = "string".
+_METRIC_TYPE_MAP: dict[str, str] = {
+    "numeric": "number", "number": "number", "percent": "number",
+    "integer": "number", "float": "number",
+    "bool": "boolean", "boolean": "boolean",
 }
 
 def _norm_metric_type(t: str | None) -> str:
     """Normalise le type de métrique en 'number', 'boolean' ou 'string'."""
     if not t:
         return "string"
-    t = t.strip().lower()
-    if t in {"numeric", "number", "percent", "integer", "float"}:
-        return "number"
-    if t in {"bool", "boolean"}:
-        return "boolean"
-    return "string"
+    return _METRIC_TYPE_MAP.get(t.strip().lower(), "string")
 
 def _rhs_from_threshold_or_value(norm_type: str, rhs: Any) -> Any:
     """Extrait la valeur seuil depuis un objet, dict ou valeur brute."""
@@ -50,53 +57,93 @@ def _rhs_from_threshold_or_value(norm_type: str, rhs: Any) -> Any:
         return rhs.get("value_str")
     return rhs
 
-def match_condition(metric_type: str, condition: str, sample_value: Any, threshold_or_value: Any) -> bool:
+@lru_cache(maxsize=1024)
+def _compile_regex(pattern: str) -> re.Pattern[str] | None:
+    """Regex compilée une fois par motif ; None si motif invalide (mis en cache aussi)."""
+    try:
+        return re.compile(pattern)
+    except re.error:
+        return None
+
+def _never(_value: Any) -> bool:
+    return False
+
+@lru_cache(maxsize=256)
+def _canonical_rule(metric_type: str | None, condition: str | None) -> tuple[str, str]:
+    """(type normalisé, condition normalisée) — calculé une fois par couple."""
+    return _norm_metric_type(metric_type), normalize_comparison(condition) or ""
+
+def compile_rule(metric_type: str, condition: str, threshold_or_value: Any) -> Callable[[Any], bool]:
     """
-    Compare sample_value au seuil selon metric_type et condition.
-    - number : {gt,ge,lt,le,eq,ne}
-    - bool   : {eq,ne}
-    - string : {eq,ne,contains,not_contains,regex}
+    Pré-compile une règle en prédicat `check(sample_value) -> bool`.
+
+    Normalisation du type / de la condition, extraction et conversion du seuil
+    sont faites ici, une seule fois : à réutiliser quand une même règle est
+    évaluée sur plusieurs samples.
     """
-    mtype = _norm_metric_type(metric_type)
-    cond = normalize_comparison(condition) or ""
+    mtype, cond = _canonical_rule(metric_type, condition)
+    rhs = _rhs_from_threshold_or_value(mtype, threshold_or_value)
 
     if mtype == "number":
+        fn = OPS.get(cond)
         try:
-            left = float(sample_value)
-            right = float(_rhs_from_threshold_or_value(mtype, threshold_or_value))
+            right = float(rhs)
         except (TypeError, ValueError):
-            return False
-        fn = OPS.get(cond)
-        return bool(fn(left, right)) if fn else False
+            return _never
+        if fn is None:
+            return _never
+
+        def check_number(sample_value: Any) -> bool:
+            try:
+                return bool(fn(float(sample_value), right))
+            except (TypeError, ValueError):
+                return False
+        return check_number
 
     if mtype == "boolean":
+        fn = OPS.get(cond)
         try:
-            left = bool(sample_value)
-            right = bool(_rhs_from_threshold_or_value(mtype, threshold_or_value))
+            right_b = bool(rhs)
         except Exception:
-            return False
-        fn = OPS.get(cond)
-        return bool(fn(left, right)) if fn else False
+            return _never
+        if fn is None:
+            return _never
+
+        def check_bool(sample_value: Any) -> bool:
+            try:
+                return bool(fn(bool(sample_value), right_b))
+            except Exception:
+                return False
+        return check_bool
 
     # string
-    left = "" if sample_value is None else str(sample_value)
-    right_raw = _rhs_from_threshold_or_value("string", threshold_or_value)
-    right = None if right_raw is None else str(right_raw)
+    if rhs is None:
+        return _never
+    right_s = str(rhs)
     if cond == "contains":
-        return (right is not None) and (right in left)
+        return lambda v: right_s in ("" if v is None else str(v))
     if cond == "not_contains":
-        return (right is not None) and (right not in left)
+        return lambda v: right_s not in ("" if v is None else str(v))
     if cond == "regex":
-        if right is None:
-            return False
-        try:
-            return re.search(right, left) is not None
-        except re.error:
-            return False
+        rx = _compile_regex(right_s)
+        if rx is None:
+            return _never
+        return lambda v: rx.search("" if v is None else str(v)) is not None
     fn = OPS.get(cond)
-    if fn is None or right is None:
-        return False
-    return bool(fn(left, right))
+    if fn is None:
+        return _never
+    return lambda v: bool(fn("" if v is None else str(v), right_s))
+
+def match_condition(metric_type: str, condition: str, sample_value: Any, threshold_or_value: Any) -> bool:
+    """
+    Compare sample_value au seuil selon metric_type et condition.
+    - number : {gt,ge,lt,le,eq,ne}
+    - bool   : {eq,ne}
+    - string : {eq,ne,contains,not_contains,regex}
+
+    Évaluation ponctuelle ; pour N samples d'une même règle, voir compile_rule().
+    """
+    return compile_rule(metric_type, condition, threshold_or_value)(sample_value)
 
 def apply_min_duration(previous_severity: str, since: datetime, now: datetime,
                        desired: str, min_duration_s: int) -> str:
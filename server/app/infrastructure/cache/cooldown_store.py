@@ -0,0 +1,125 @@
+from __future__ import annotations
+"""
+server/app/infrastructure/cache/cooldown_store.py
+
+Dernier envoi réel de notification par client, servi depuis Redis pour le
+cooldown global (au lieu d'un SELECT notification_log à chaque notification).
+
+Structure : un ZSET par client
+  notif:{client_id}  →  member = incident_id (ou "-" sans incident)
+                        score  = sent_at (epoch)
+
+- Le ZSET est chargé une fois depuis la base (membre sentinelle "_loaded",
+  score 0), puis tenu à jour à chaque envoi "success" (ZADD GT).
+- Les entrées plus vieilles que RETENTION_SECONDS sont purgées à l'écriture :
+  un envoi plus ancien ne peut plus déclencher de cooldown (rappel < rétention).
+- notification_log reste la source de vérité (audit, UI) : toute erreur Redis
+  est remontée à l'appelant, qui retombe sur la requête SQL.
+
+Activé par NOTIF_COOLDOWN_REDIS=true (désactivé par défaut : dev/tests sans Redis).
+"""
+
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Optional
+
+import redis
+
+from app.core.config import settings
+
+RETENTION_SECONDS = int(os.getenv("NOTIF_COOLDOWN_RETENTION_SECONDS", str(7 * 24 * 3600)))
+
+_LOADED = "_loaded"
+_NO_INCIDENT = "-"
+
+# (incident_id | None, sent_at) pour chaque incident déjà notifié
+Loader = Callable[[datetime], Iterable[tuple[Optional[uuid.UUID], datetime]]]
+
+
+def _key(client_id: uuid.UUID) -> str:
+    return f"notif:{client_id}"
+
+
+def _member(incident_id: Optional[uuid.UUID]) -> str:
+    return str(incident_id) if incident_id else _NO_INCIDENT
+
+
+class CooldownStore:
+    def __init__(self, client: "redis.Redis"):
+        self.r = client
+
+    def record(
+        self,
+        client_id: uuid.UUID,
+        incident_id: Optional[uuid.UUID],
+        sent_at: datetime,
+    ) -> None:
+        """Enregistre un envoi réel (ne recule jamais un timestamp existant)."""
+        key = _key(client_id)
+        p = self.r.pipeline(transaction=False)
+        p.zadd(key, {_member(incident_id): sent_at.timestamp()}, gt=True)
+        p.zremrangebyscore(key, "(0", time.time() - RETENTION_SECONDS)
+        p.expire(key, RETENTION_SECONDS)
+        p.execute()
+
+    def last_sent_at(
+        self,
+        client_id: uuid.UUID,
+        incident_id: Optional[uuid.UUID],
+        load: Loader,
+    ) -> Optional[datetime]:
+        """
+        Dernier envoi pour ce client (tous incidents) ou pour `incident_id`.
+        `load(since)` n'est appelé que si le ZSET n'a pas encore été chargé.
+        """
+        key = _key(client_id)
+        if self.r.zscore(key, _LOADED) is None:
+            self._load(key, load)
+
+        if incident_id is not None:
+            score = self.r.zscore(key, str(incident_id))
+        else:
+            top = self.r.zrevrangebyscore(key, "+inf", "(0", start=0, num=1, withscores=True)
+            score = top[0][1] if top else None
+
+        if score is None or score < time.time() - RETENTION_SECONDS:
+            return None
+        return datetime.fromtimestamp(score, tz=timezone.utc)
+
+    def forget(self, client_id: uuid.UUID) -> None:
+        """Invalide le client (rechargé depuis la base au prochain accès)."""
+        self.r.delete(_key(client_id))
+
+    def _load(self, key: str, load: Loader) -> None:
+        since = datetime.fromtimestamp(time.time() - RETENTION_SECONDS, tz=timezone.utc)
+        mapping = {_member(inc): sent.timestamp() for inc, sent in load(since) if sent is not None}
+        mapping[_LOADED] = 0
+        p = self.r.pipeline(transaction=False)
+        p.zadd(key, mapping, gt=True)
+        p.expire(key, RETENTION_SECONDS)
+        p.execute()
+
+
+_STORE: CooldownStore | None = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_cooldown_store() -> CooldownStore | None:
+    """Store du process (None si désactivé)."""
+    global _STORE
+    if not getattr(settings, "NOTIF_COOLDOWN_REDIS", False):
+        return None
+    if _STORE is None:
+        with _STORE_LOCK:
+            if _STORE is None:
+                _STORE = CooldownStore(
+                    redis.Redis.from_url(
+                        settings.REDIS_URL,
+                        socket_connect_timeout=0.5,
+                        socket_timeout=0.5,
+                    )
+                )
+    return _STORE
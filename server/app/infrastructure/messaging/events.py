@@ -9,7 +9,7 @@ from datetime import datetime
 from typing import Any, Mapping, Optional
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class IncidentRaised:
     incident_id: str
     client_id: str
@@ -19,7 +19,7 @@ class IncidentRaised:
     context: Mapping[str, Any]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class IncidentResolved:
     incident_id: str
     client_id: str
@@ -27,7 +27,7 @@ class IncidentResolved:
     context: Mapping[str, Any] | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ReminderDue:
     incident_id: str
     client_id: str
@@ -4,6 +4,8 @@ from __future__ import annotations
 Service Outbox : API haut-niveau au-dessus du repository
 - save_event() : création d'un évènement d’outbox
 - due_events() : sélection des évènements "dûs" à livrer
+- due_events_stream() : idem, par lots successifs (drain d'un backlog)
+- claim_due_events() : claim atomique d'un lot (dispatcher)
 - mark_delivering() / mark_delivered() / schedule_retry() / mark_failed()
 
 ⚠️ IMPORTANT :
@@ -11,11 +13,13 @@ Service Outbox : API haut-niveau au-dessus du repository
 - Les backoffs sont lus depuis les settings mais tolèrent aussi une simple liste/CSV en ENV.
 """
 
-from datetime import datetime, timedelta, timezone
-from typing import Any, Iterable, Mapping, Sequence
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, Mapping, Sequence
 import math
 import os
 import random
+import time
 
 from app.core.config import settings
 from app.infrastructure.persistence.repositories.outbox_repository import OutboxRepository
@@ -28,7 +32,7 @@ from app.infrastructure.persistence.repositories.outbox_repository import Outbox
 def _parse_backoffs() -> list[int]:
     """
     Accepte :
-      - settings.OUTBOX_BACKOFFS (list[int] OU "30,120,600")
+      - settings.OUTBOX_BACKOFFS (tuple[int, ...] OU "30,120,600")
       - variable d'env OUTBOX_BACKOFFS idem
     Fallback par défaut : [30, 120, 600]
     """
@@ -46,12 +50,25 @@ def _parse_backoffs() -> list[int]:
         return [30, 120, 600]
 
 
-def _jitter(seconds: int, pct: float) -> int:
-    """Applique un jitter symétrique ±pct, borne à [0..0.9]."""
-    pct = max(0.0, min(float(pct), 0.9))
-    low = seconds * (1.0 - pct)
-    high = seconds * (1.0 + pct)
-    return int(math.ceil(random.uniform(low, high)))
+@lru_cache(maxsize=1)
+def _outbox_config() -> tuple[tuple[int, ...], float, tuple[tuple[float, float], ...]]:
+    """
+    (backoffs, jitter_pct, bornes de jitter) lus une fois par process
+    (Outbox est instancié par requête).
+
+    Bornes : pour chaque backoff b, (low, span) = (b*(1-pct), 2*b*pct), pct
+    borné à [0..0.9] → delay = ceil(low + span*random()).
+    """
+    backoffs = tuple(_parse_backoffs())
+    jitter_pct = float(getattr(settings, "OUTBOX_JITTER_PCT", 0.2) or 0.2)
+    pct = max(0.0, min(jitter_pct, 0.9))
+    bounds = tuple((b * (1.0 - pct), 2.0 * b * pct) for b in (backoffs or (30,)))
+    return backoffs, jitter_pct, bounds
+
+
+def reset_outbox_config_cache() -> None:
+    """Tests : force la relecture settings/ENV au prochain Outbox()."""
+    _outbox_config.cache_clear()
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -61,8 +78,7 @@ def _jitter(seconds: int, pct: float) -> int:
 class Outbox:
     def __init__(self, repo: OutboxRepository):
         self.repo = repo
-        self._backoffs: list[int] = _parse_backoffs()
-        self._jitter_pct: float = float(getattr(settings, "OUTBOX_JITTER_PCT", 0.2) or 0.2)
+        self._backoffs, self._jitter_pct, self._jitter_bounds = _outbox_config()
 
     # --- Écriture -------------------------------------------------------------
 
@@ -94,8 +110,45 @@ class Outbox:
         as_of = as_of or datetime.now(timezone.utc)
         return self.repo.fetch_due(limit=limit, as_of=as_of)
 
+    def due_events_stream(
+        self,
+        *,
+        batch_size: int = 100,
+        max_batches: int = 10,
+        as_of: datetime | None = None,
+    ) -> Iterator[Any]:
+        """
+        Itère sur les évènements dûs par lots de `batch_size` (au plus `max_batches`
+        SELECT), le lot suivant n'étant lu qu'une fois le précédent consommé.
+
+        Pensé pour un consommateur qui fait passer chaque event hors de l'état
+        "dû" (mark_delivering / mark_delivered / schedule_retry) : un event déjà
+        produit n'est jamais renvoyé, et l'itération s'arrête dès qu'un lot
+        n'apporte plus rien de nouveau.
+        """
+        as_of = as_of or datetime.now(timezone.utc)
+        seen: set[Any] = set()
+        for _ in range(max_batches):
+            batch = self.repo.fetch_due(limit=batch_size, as_of=as_of)
+            fresh = [ev for ev in batch if ev.id not in seen]
+            if not fresh:
+                return
+            for ev in fresh:
+                seen.add(ev.id)
+                yield ev
+            if len(batch) < batch_size:
+                return
+
     # --- Transitions d’état ---------------------------------------------------
 
+    def claim_due_events(self, *, limit: int = 100, as_of: datetime | None = None):
+        """
+        Claim atomique des évènements dûs (DELIVERING + attempts++) en une requête.
+        Retourne des tuples (id, payload, attempts).
+        """
+        as_of = as_of or datetime.now(timezone.utc)
+        return self.repo.claim_due(limit=limit, as_of=as_of)
+
     def mark_delivering(self, event_id: str) -> int:
         """
         Passe l’event en DELIVERING et incrémente attempts.
@@ -109,10 +162,10 @@ class Outbox:
         attempts_done = valeur retournée par mark_delivering()
         """
         # index dans la grille (0 pour 1ère tentative, clamp à la fin)
-        idx = min(max(attempts_done - 1, 0), len(self._backoffs) - 1)
-        base = self._backoffs[idx] if self._backoffs else 30
-        delay = _jitter(base, self._jitter_pct)
-        when = datetime.now(timezone.utc) + timedelta(seconds=delay)
+        bounds = self._jitter_bounds
+        low, span = bounds[min(max(attempts_done - 1, 0), len(bounds) - 1)]
+        delay = int(math.ceil(low + span * random.random()))
+        when = datetime.fromtimestamp(time.time() + delay, timezone.utc)
         self.repo.mark_retry(event_id, when)
 
     def mark_delivered(self, event_id: str, receipt: Mapping[str, Any] | None = None):
@@ -1,10 +1,62 @@
 # server/app/infrastructure/notifications/providers/email_provider.py
 
+import atexit
+import os
 import smtplib
+import threading
+import time
 from email.mime.text import MIMEText
 from typing import Optional
 from app.core.config import settings
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Connexion SMTP partagée (par process)
+#
+# EmailProvider est instancié à chaque notification : on garde donc la connexion
+# au niveau module pour éviter TCP + STARTTLS + LOGIN à chaque e-mail.
+# - une seule connexion par process, sérialisée par un verrou ;
+# - NOOP avant réutilisation, reconnexion si morte ou inactive trop longtemps ;
+# - la clé inclut le PID : un worker forké ne réutilise jamais celle du parent,
+#   et ne la ferme pas non plus (QUIT sur le socket hérité couperait la session
+#   SMTP du parent) : la référence est simplement abandonnée dans l'enfant.
+# ─────────────────────────────────────────────────────────────────────────────
+SMTP_IDLE_TIMEOUT_SECONDS = 60.0
+
+_conn: Optional[smtplib.SMTP] = None
+_conn_key: Optional[tuple] = None
+_conn_last_used = 0.0
+_conn_lock = threading.Lock()
+
+
+def _drop_conn() -> None:
+    """Oublie la connexion sans rien envoyer sur le socket."""
+    global _conn, _conn_key
+    _conn = None
+    _conn_key = None
+
+
+def _close_conn() -> None:
+    """Ferme (QUIT) la connexion si elle appartient à ce process, sinon l'oublie."""
+    if _conn is not None and _conn_key is not None and _conn_key[0] == os.getpid():
+        try:
+            _conn.quit()
+        except Exception:
+            pass
+    _drop_conn()
+
+
+def _reset_after_fork() -> None:
+    """Enfant forké : connexion du parent abandonnée, verrou neuf (il a pu être pris au fork)."""
+    global _conn_lock
+    _drop_conn()
+    _conn_lock = threading.Lock()
+
+
+atexit.register(_close_conn)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
 class EmailProvider:
     """
     Envoi d'e-mails via SMTP simple (texte).
@@ -24,22 +76,56 @@ class EmailProvider:
         self.use_tls = settings.SMTP_USE_TLS
         self.sender = settings.SMTP_FROM
 
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=10)
+        try:
+            if self.use_tls:
+                server.starttls()
+            if self.username and self.password:
+                server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    def _get_conn(self) -> smtplib.SMTP:
+        """Connexion partagée réutilisable (appelé sous _conn_lock)."""
+        global _conn, _conn_key
+        key = (os.getpid(), self.host, self.port, self.username, self.use_tls)
+        if _conn is not None and _conn_key == key:
+            if time.monotonic() - _conn_last_used < SMTP_IDLE_TIMEOUT_SECONDS:
+                try:
+                    if _conn.noop()[0] == 250:
+                        return _conn
+                except smtplib.SMTPException:
+                    pass
+        _close_conn()
+        _conn = self._connect()
+        _conn_key = key
+        return _conn
+
     def send(self, *, to: str, subject: str, body: str) -> bool:
+        global _conn_last_used
         msg = MIMEText(body, _charset="utf-8")
         msg["Subject"] = subject
         msg["From"] = self.sender
         msg["To"] = to
+        raw = msg.as_string()
 
-        if self.use_tls:
-            server = smtplib.SMTP(self.host, self.port, timeout=10)
-            server.starttls()
-        else:
-            server = smtplib.SMTP(self.host, self.port, timeout=10)
-
-        try:
-            if self.username and self.password:
-                server.login(self.username, self.password)
-            server.sendmail(self.sender, [to], msg.as_string())
-            return True
-        finally:
-            server.quit()
+        with _conn_lock:
+            try:
+                self._get_conn().sendmail(self.sender, [to], raw)
+            except smtplib.SMTPServerDisconnected:
+                # Coupée entre le NOOP et l'envoi : une seule nouvelle tentative
+                _close_conn()
+                try:
+                    self._get_conn().sendmail(self.sender, [to], raw)
+                except Exception:
+                    # pas de réutilisation d'une connexion morte au prochain envoi
+                    _close_conn()
+                    raise
+            except Exception:
+                _close_conn()
+                raise
+            _conn_last_used = time.monotonic()
+        return True
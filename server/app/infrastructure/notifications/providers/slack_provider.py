@@ -2,11 +2,262 @@
 from __future__ import annotations
 """SlackProvider — envoi de notifications via webhook Slack (Incoming Webhooks)."""
 
-from typing import Optional, Dict, Any
-import requests
+import asyncio
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Optional, Dict, Any, Mapping
+import httpx
+
+if TYPE_CHECKING:  # requests est importé à la 1re session (voir _get_session)
+    import requests
+
+try:  # optionnel : orjson (C, sérialise directement en bytes) s'il est installé
+    import orjson
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    orjson = None
+
+
+def _dumps(payload: Dict[str, Any]) -> bytes:
+    """Corps JSON du POST (envoyé tel quel avec data=, Content-Type explicite)."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+# Session HTTP partagée (par process) : réutilise la connexion TLS vers
+# hooks.slack.com au lieu d'un handshake par notification.
+# Retry limité aux erreurs de connexion (un POST déjà parti n'est pas rejoué).
+_POOL_CONNECTIONS = 32
+_POOL_MAXSIZE = 100
+# (connect, read) : un hôte injoignable échoue vite sans rogner le délai de réponse
+_TIMEOUT = (2, 5)
+
+_SESSION: requests.Session | None = None
+_SESSION_PID: int | None = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    """Session du process courant (recréée après fork : workers Celery prefork)."""
+    global _SESSION, _SESSION_PID
+    pid = os.getpid()
+    if _SESSION is None or _SESSION_PID != pid:
+        with _SESSION_LOCK:
+            if _SESSION is None or _SESSION_PID != pid:
+                # Import différé : un process qui n'envoie jamais sur Slack ne
+                # charge pas requests/urllib3/idna/certifi.
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+
+                sess = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=_POOL_CONNECTIONS,
+                    pool_maxsize=_POOL_MAXSIZE,
+                    max_retries=Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.2),
+                )
+                sess.mount("https://", adapter)
+                sess.mount("http://", adapter)
+                _SESSION, _SESSION_PID = sess, pid
+    return _SESSION
+
+
+# Disjoncteur par webhook : après _BREAKER_THRESHOLD échecs consécutifs, les
+# envois vers ce webhook échouent immédiatement (False) pendant
+# min(_BREAKER_MAX_OPEN_SECONDS, 2**échecs) s au lieu de payer le timeout à
+# chaque alerte. Par webhook : un client mal configuré ne coupe pas les autres.
+_BREAKER_THRESHOLD = 5
+_BREAKER_MAX_OPEN_SECONDS = 60.0
+# webhook → (échecs consécutifs, ouvert jusqu'à (monotonic))
+_BREAKERS: Dict[str, tuple[int, float]] = {}
+_BREAKER_LOCK = threading.Lock()
+
+
+def _breaker_open(webhook: str) -> bool:
+    state = _BREAKERS.get(webhook)
+    return state is not None and time.monotonic() < state[1]
+
+
+def _breaker_record(webhook: str, ok: bool) -> None:
+    if ok:
+        if webhook in _BREAKERS:
+            with _BREAKER_LOCK:
+                _BREAKERS.pop(webhook, None)
+        return
+    with _BREAKER_LOCK:
+        fails = _BREAKERS.get(webhook, (0, 0.0))[0] + 1
+        open_until = 0.0
+        if fails >= _BREAKER_THRESHOLD:
+            open_until = time.monotonic() + min(_BREAKER_MAX_OPEN_SECONDS, 2.0 ** fails)
+        _BREAKERS[webhook] = (fails, open_until)
+
+
+# Client async partagé pour send_async(). Un AsyncClient (et son sémaphore) est
+# lié à la boucle asyncio qui l'utilise : on le reconstruit si la boucle change
+# (asyncio.run() côté worker), sinon singleton pour la boucle de l'API.
+_ASYNC_MAX_CONCURRENCY = 20  # POST simultanés max vers Slack (rate limit)
+_ASYNC_CLIENT: httpx.AsyncClient | None = None
+_ASYNC_SEM: asyncio.Semaphore | None = None
+_ASYNC_LOOP: asyncio.AbstractEventLoop | None = None
+
+
+def _get_async_client() -> tuple[httpx.AsyncClient, asyncio.Semaphore]:
+    global _ASYNC_CLIENT, _ASYNC_SEM, _ASYNC_LOOP
+    loop = asyncio.get_running_loop()
+    if _ASYNC_CLIENT is None or _ASYNC_LOOP is not loop or _ASYNC_CLIENT.is_closed:
+        _ASYNC_CLIENT = httpx.AsyncClient(
+            timeout=httpx.Timeout(5.0, connect=2.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        )
+        _ASYNC_SEM = asyncio.Semaphore(_ASYNC_MAX_CONCURRENCY)
+        _ASYNC_LOOP = loop
+    return _ASYNC_CLIENT, _ASYNC_SEM
+
+
+# Envoi en arrière-plan (send_nowait) : pool borné + plafond d'envois en
+# attente. Au-delà, le message est journalisé et abandonné plutôt que de
+# laisser grossir la file sans limite pendant une panne Slack.
+log = logging.getLogger(__name__)
+
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("SLACK_WORKERS", "8")),
+    thread_name_prefix="slack",
+)
+_MAX_PENDING = int(os.getenv("SLACK_MAX_PENDING", "1000"))
+_PENDING = threading.BoundedSemaphore(_MAX_PENDING)
+atexit.register(_EXECUTOR.shutdown, wait=True)
+
+
+# Envois synchrones en vol, par message : les doublons concurrents (même
+# webhook + même contenu) partagent le résultat d'un seul POST.
+_INFLIGHT: Dict[tuple, Future] = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+
+def _dedup_key(webhook: str, payload: Dict[str, Any]) -> tuple:
+    att = payload["attachments"][0]
+    return (
+        webhook,
+        payload["text"],
+        att["text"],
+        att["color"],
+        tuple((f["title"], f["value"]) for f in att["fields"]),
+        payload.get("channel"),
+        payload.get("username"),
+        payload.get("icon_emoji"),
+    )
+
+
+# Couleurs d'attachment par sévérité (construites une fois, pas à chaque envoi)
+_DEFAULT_COLOR = "#36a64f"
+_COLORS: Mapping[str, str] = MappingProxyType({
+    "info": _DEFAULT_COLOR,
+    "warning": "#ffcc00",
+    "error": "#ff0000",
+    "critical": "#ff0000",
+})
+
+
+@lru_cache(maxsize=16)
+def _color_for(severity: str) -> str:
+    # Peu de sévérités distinctes : mémoïse aussi le .lower()
+    return _COLORS.get(severity.lower(), _DEFAULT_COLOR)
+
+_FOOTER = "Envoyé depuis Monitoring System"
+
+# Parties statiques du payload par sévérité : (préfixe du texte, base d'attachment)
+_SKELETONS: Mapping[str, tuple[str, Mapping[str, str]]] = MappingProxyType({
+    sev: (f"[{sev.upper()}] ", MappingProxyType({"color": color, "footer": _FOOTER}))
+    for sev, color in _COLORS.items()
+})
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Regroupement (send_batched)
+#
+# Les alertes d'une même cible (webhook + overrides) sont accumulées pendant
+# `window_seconds` puis envoyées en un seul POST multi-attachments (au plus
+# _MAX_ATTACHMENTS par message, limite Slack) : N alertes → ⌈N/20⌉ requêtes.
+# Un thread démon (un par process) vide les lots échus chaque seconde ; les
+# lots restants sont envoyés à la sortie du process.
+# ─────────────────────────────────────────────────────────────────────────────
+_MAX_ATTACHMENTS = 20
+_FLUSH_INTERVAL_SECONDS = 1.0
+
+# clé (webhook, channel, username, icon_emoji) → [échéance monotonic, attachments]
+_BATCHES: Dict[tuple, list] = {}
+_BATCH_LOCK = threading.Lock()
+_FLUSHER_PID: int | None = None
+
+
+def _post_batch(key: tuple, attachments: list) -> None:
+    webhook, channel, username, icon_emoji = key
+    for i in range(0, len(attachments), _MAX_ATTACHMENTS):
+        chunk = attachments[i:i + _MAX_ATTACHMENTS]
+        payload: Dict[str, Any] = {
+            "text": chunk[0]["title"] if len(chunk) == 1 else f"{len(chunk)} alertes groupées",
+            "attachments": chunk,
+        }
+        if channel:
+            payload["channel"] = channel
+        if username:
+            payload["username"] = username
+        if icon_emoji:
+            payload["icon_emoji"] = icon_emoji
+        if _breaker_open(webhook):
+            log.warning("Slack circuit open, dropping batch of %d", len(chunk))
+            continue
+        ok = False
+        try:
+            r = _get_session().post(webhook, data=_dumps(payload), headers=_JSON_HEADERS, timeout=_TIMEOUT)
+            ok = r.status_code == 200
+            if not ok:
+                log.warning("Slack batch rejected: HTTP %s", r.status_code)
+        except Exception as exc:  # noqa: BLE001
+            log.warning("Slack batch send failed: %s", exc)
+        _breaker_record(webhook, ok)
+
+
+def _flush_batches(*, force: bool = False) -> None:
+    now = time.monotonic()
+    with _BATCH_LOCK:
+        due = [k for k, (deadline, _) in _BATCHES.items() if force or deadline <= now]
+        ready = [(k, _BATCHES.pop(k)[1]) for k in due]
+    for key, attachments in ready:
+        _post_batch(key, attachments)
+
+
+def _flusher_loop() -> None:
+    while True:
+        time.sleep(_FLUSH_INTERVAL_SECONDS)
+        _flush_batches()
+
+
+def _ensure_flusher() -> None:
+    """Démarre le thread de flush du process courant (à refaire après fork)."""
+    global _FLUSHER_PID
+    pid = os.getpid()
+    if _FLUSHER_PID != pid:
+        with _BATCH_LOCK:
+            if _FLUSHER_PID != pid:
+                threading.Thread(target=_flusher_loop, name="slack-batch", daemon=True).start()
+                _FLUSHER_PID = pid
+
+
+atexit.register(_flush_batches, force=True)
 
 
 class SlackProvider:
+    # Une instance par notification : état partagé (session, pools) au niveau module
+    __slots__ = ("webhook",)
+
     def __init__(self, webhook: Optional[str] = None):
         """
         En prod, le webhook est injecté par la task Celery `notify` à partir
@@ -27,16 +278,155 @@ class SlackProvider:
         username: Optional[str] = None,
         icon_emoji: Optional[str] = None,
     ) -> bool:
+        payload = self._build_payload(
+            title=title, text=text, severity=severity, context=context,
+            channel=channel, username=username, icon_emoji=icon_emoji,
+        )
+        key = _dedup_key(self.webhook, payload)
+
+        # Un envoi identique est déjà en vol : on attend son résultat au lieu
+        # de reposter le même message (tempête d'alertes).
+        with _INFLIGHT_LOCK:
+            pending = _INFLIGHT.get(key)
+            if pending is None:
+                fut: Future[bool] = Future()
+                _INFLIGHT[key] = fut
+        if pending is not None:
+            return pending.result()
+
+        ok = False
+        try:
+            ok = self._post(payload)
+        finally:
+            with _INFLIGHT_LOCK:
+                _INFLIGHT.pop(key, None)
+            fut.set_result(ok)
+        return ok
+
+    def _post(self, payload: Dict[str, Any]) -> bool:
+        if _breaker_open(self.webhook):
+            return False
+        try:
+            r = _get_session().post(
+                self.webhook,
+                data=_dumps(payload),
+                headers=_JSON_HEADERS,
+                timeout=_TIMEOUT,
+            )
+            ok = r.status_code == 200
+        except Exception:  # noqa: BLE001
+            ok = False
+        _breaker_record(self.webhook, ok)
+        return ok
+
+    def send_nowait(self, **kwargs: Any) -> Future[bool] | None:
+        """
+        Soumet send(**kwargs) au pool d'arrière-plan et rend la main aussitôt.
+        Retourne le Future, ou None si la file est pleine (message abandonné).
+        """
+        if not _PENDING.acquire(blocking=False):
+            log.warning("Slack queue full (%d pending), dropping message", _MAX_PENDING)
+            return None
+        try:
+            fut = _EXECUTOR.submit(self.send, **kwargs)
+        except RuntimeError:  # pool arrêté (shutdown du process)
+            _PENDING.release()
+            return None
+        fut.add_done_callback(lambda _f: _PENDING.release())
+        return fut
+
+    def send_batched(
+        self,
+        *,
+        title: str,
+        text: str,
+        severity: str = "info",
+        context: Optional[Dict[str, Any]] = None,
+        channel: Optional[str] = None,
+        username: Optional[str] = None,
+        icon_emoji: Optional[str] = None,
+        window_seconds: float = 5.0,
+    ) -> None:
+        """
+        Met l'alerte en attente ; elle part avec les autres alertes de la même
+        cible à l'échéance du lot (ouvert par la première alerte, fenêtre
+        `window_seconds`, typiquement ClientSettings.alert_grouping_window_seconds).
+        Fire-and-forget : les échecs sont journalisés.
+        """
+        payload = self._build_payload(
+            title=title, text=text, severity=severity, context=context,
+            channel=channel, username=username, icon_emoji=icon_emoji,
+        )
+        attachment = dict(payload["attachments"][0], title=payload["text"])
+        key = (self.webhook, payload.get("channel"), payload.get("username"), payload.get("icon_emoji"))
+
+        _ensure_flusher()
+        with _BATCH_LOCK:
+            batch = _BATCHES.get(key)
+            if batch is None:
+                _BATCHES[key] = [time.monotonic() + max(0.0, float(window_seconds)), [attachment]]
+            else:
+                batch[1].append(attachment)
+
+    async def send_async(
+        self,
+        *,
+        title: str,
+        text: str,
+        severity: str = "info",
+        context: Optional[Dict[str, Any]] = None,
+        channel: Optional[str] = None,
+        username: Optional[str] = None,
+        icon_emoji: Optional[str] = None,
+    ) -> bool:
+        """
+        Variante asynchrone de send() : plusieurs alertes peuvent partir en
+        parallèle (asyncio.gather) sur des connexions keep-alive partagées,
+        avec au plus _ASYNC_MAX_CONCURRENCY POST en vol.
+        """
+        payload = self._build_payload(
+            title=title, text=text, severity=severity, context=context,
+            channel=channel, username=username, icon_emoji=icon_emoji,
+        )
+        if _breaker_open(self.webhook):
+            return False
+        try:
+            client, sem = _get_async_client()
+            async with sem:
+                r = await client.post(self.webhook, content=_dumps(payload), headers=_JSON_HEADERS)
+            ok = r.status_code == 200
+        except Exception:  # noqa: BLE001
+            ok = False
+        _breaker_record(self.webhook, ok)
+        return ok
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """Ferme le client async partagé (shutdown FastAPI)."""
+        global _ASYNC_CLIENT, _ASYNC_SEM, _ASYNC_LOOP
+        client, _ASYNC_CLIENT, _ASYNC_SEM, _ASYNC_LOOP = _ASYNC_CLIENT, None, None, None
+        if client is not None and not client.is_closed:
+            await client.aclose()
+
+    def _build_payload(
+        self,
+        *,
+        title: str,
+        text: str,
+        severity: str,
+        context: Optional[Dict[str, Any]],
+        channel: Optional[str],
+        username: Optional[str],
+        icon_emoji: Optional[str],
+    ) -> Dict[str, Any]:
+        skel = _SKELETONS.get(severity)
+        if skel is None:  # sévérité hors table / casse inattendue
+            skel = (f"[{severity.upper()}] ", {"color": self._get_color(severity), "footer": _FOOTER})
+        prefix, base = skel
         payload = {
-            "text": f"[{severity.upper()}] {title}",
-            "attachments": [
-                {
-                    "color": self._get_color(severity),
-                    "text": text,
-                    "fields": self._format_context(context or {}),
-                    "footer": "Envoyé depuis Monitoring System",
-                }
-            ],
+            "text": prefix + title,
+            # nouveau dict à chaque envoi : le squelette partagé n'est jamais muté
+            "attachments": [{**base, "text": text, "fields": self._format_context(context)}],
         }
         if channel:
             ch = channel.strip()
@@ -49,26 +439,16 @@ class SlackProvider:
             payload["username"] = username
         if icon_emoji:
             payload["icon_emoji"] = icon_emoji
-
-        try:
-            r = requests.post(
-                self.webhook,
-                json=payload,
-                headers={"Content-Type": "application/json"},
-                timeout=5,
-            )
-            return r.status_code == 200
-        except Exception:  # noqa: BLE001
-            return False
+        return payload
 
     def _get_color(self, severity: str) -> str:
-        colors = {
-            "info": "#36a64f",
-            "warning": "#ffcc00",
-            "error": "#ff0000",
-            "critical": "#ff0000",
-        }
-        return colors.get(severity.lower(), "#36a64f")
+        return _color_for(severity)
 
-    def _format_context(self, context: Dict[str, Any]) -> list:
-        return [{"title": k, "value": str(v), "short": True} for k, v in context.items()]
+    def _format_context(self, context: Optional[Dict[str, Any]]) -> list:
+        if not context:
+            return []
+        # Valeurs déjà str (cas courant) gardées telles quelles : pas d'appel str()
+        return [
+            {"title": k, "value": v if type(v) is str else str(v), "short": True}
+            for k, v in context.items()
+        ]
@@ -3,12 +3,17 @@ from __future__ import annotations
 """
 Chargement de templates depuis le paquet (utilisé en PR5 pour email/slack).
 """
+from functools import lru_cache
 from importlib.resources import files
 
 
+@lru_cache(maxsize=64)
 def load_template(name: str) -> str:
     """
     Lit un fichier template situé dans le même package.
     Ex: load_template("email_incident.html")
+
+    Mémoïsé : les templates ne changent pas pendant la vie du process
+    (load_template.cache_clear() pour forcer une relecture).
     """
-    return files(__package__).joinpath(name).read_text(encoding="utf-8")
+    return files(__package__).joinpath(name).read_bytes().decode("utf-8")
@@ -4,10 +4,10 @@ server/app/infrastructure/persistence/database/base.py
 
 Base ORM SQLAlchemy 2.x.
 
-Le `from app.infrastructure.persistence.database.models import *` ci-dessous
-est volontaire : il “remplit” Base.metadata avec TOUTES les tables.
-Ainsi n’importe quel `Base.metadata.create_all(bind=engine)` (p.ex. en SQLite
-pendant les tests) créera le schéma complet.
+Importer Base n'enregistre aucun modèle : appeler
+`models.register_all()` avant tout `Base.metadata.create_all(bind=engine)`
+(p.ex. en SQLite pendant les tests) pour avoir le schéma complet.
+init_engine() le fait déjà.
 """
 
 from sqlalchemy.orm import DeclarativeBase
@@ -18,8 +18,4 @@ class Base(DeclarativeBase):
     pass
 
 
-# Effet de bord voulu : en important ce package on enregistre toutes les tables.
-# Les noqa évitent les warnings “unused import”.
-from app.infrastructure.persistence.database.models import *  # noqa: F403,F401
-
 __all__ = ["Base"]
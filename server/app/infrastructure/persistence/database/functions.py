@@ -0,0 +1,30 @@
+from __future__ import annotations
+"""
+server/app/infrastructure/persistence/database/functions.py
+
+Fonctions SQL portables utilisées dans les défauts côté serveur.
+"""
+
+from sqlalchemy import types
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class gen_random_uuid(FunctionElement):
+    """
+    UUID généré par la base (défaut de PK) : l'INSERT n'a plus à transporter
+    l'id, calculé nativement par Postgres (gen_random_uuid(), intégré depuis PG 13).
+    """
+    type = types.Uuid()
+    inherit_cache = True
+
+
+@compiles(gen_random_uuid)
+def _gen_random_uuid_default(element, compiler, **kw):
+    return "gen_random_uuid()"
+
+
+@compiles(gen_random_uuid, "sqlite")
+def _gen_random_uuid_sqlite(element, compiler, **kw):
+    # Tests SQLite (create_all) : 32 hex, format de stockage du type UUID hors PG
+    return "(lower(hex(randomblob(16))))"
@@ -4,43 +4,72 @@ server/app/infrastructure/persistence/database/models/__init__.py
 
 Registre des modèles ORM.
 
-⚠️ Importé pour ses EFFETS DE BORD : enregistre toutes les classes ORM dans
-`Base.metadata` (Alebmic autogénération & create_all() en tests SQLite).
+Les sous-modules ne sont plus importés à l'import du package :
+- `from ...models import Client` charge seulement le module concerné (PEP 562) ;
+- `register_all()` importe TOUS les modèles pour remplir `Base.metadata`
+  (Alembic, create_all() en tests SQLite, configuration des relationships).
+  Appelé par init_engine(), migrations/env.py et le startup FastAPI.
 """
 
-from .client import Client
-from .api_key import ApiKey
-from .client_settings import ClientSettings
-from .user import User
-from .machine import Machine
-from .sample import Sample
-from .alert import Alert
-from .incident import Incident
-from .http_target import HttpTarget   # ✅ corrigé (pas "from HttpTarget")
-from .notification_log import NotificationLog
-from .ingest_event import IngestEvent
-from .outbox_event import OutboxEvent, OutboxStatus
-from .metric_definitions import MetricDefinitions
-from .metric_instance import MetricInstance
-from .threshold_template import ThresholdTemplate
-from .threshold_new import ThresholdNew
-
-__all__ = [
-    "Client",
-    "ApiKey",
-    "ClientSettings",
-    "User",
-    "Machine",
-    "Sample",
-    "Alert",
-    "Incident",
-    "HttpTarget",
-    "NotificationLog",
-    "IngestEvent",
-    "OutboxEvent",
-    "OutboxStatus",
-    "MetricDefinitions",
-    "MetricInstance",
-    "ThresholdTemplate",
-    "ThresholdNew"
-]
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # imports réels pour les type checkers uniquement
+    from .client import Client
+    from .api_key import ApiKey
+    from .client_settings import ClientSettings
+    from .user import User
+    from .machine import Machine
+    from .sample import Sample
+    from .alert import Alert
+    from .incident import Incident
+    from .http_target import HttpTarget
+    from .notification_log import NotificationLog
+    from .ingest_event import IngestEvent
+    from .outbox_event import OutboxEvent, OutboxStatus
+    from .metric_definitions import MetricDefinitions
+    from .metric_instance import MetricInstance
+    from .threshold_template import ThresholdTemplate
+    from .threshold_new import ThresholdNew
+
+# nom exporté → sous-module (ordre = ordre d'enregistrement)
+_MODULES = {
+    "Client": "client",
+    "ApiKey": "api_key",
+    "ClientSettings": "client_settings",
+    "User": "user",
+    "Machine": "machine",
+    "Sample": "sample",
+    "Alert": "alert",
+    "Incident": "incident",
+    "HttpTarget": "http_target",
+    "NotificationLog": "notification_log",
+    "IngestEvent": "ingest_event",
+    "OutboxEvent": "outbox_event",
+    "OutboxStatus": "outbox_event",
+    "MetricDefinitions": "metric_definitions",
+    "MetricInstance": "metric_instance",
+    "ThresholdTemplate": "threshold_template",
+    "ThresholdNew": "threshold_new",
+}
+
+__all__ = [*_MODULES, "register_all"]
+
+_registered = False
+
+
+def register_all() -> None:
+    """Importe tous les modèles (idempotent) : Base.metadata devient complet."""
+    global _registered
+    if _registered:
+        return
+    for mod in dict.fromkeys(_MODULES.values()):
+        importlib.import_module(f".{mod}", __name__)
+    _registered = True
+
+
+def __getattr__(name: str):
+    mod = _MODULES.get(name)
+    if mod is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f".{mod}", __name__), name)
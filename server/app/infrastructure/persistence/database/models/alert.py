@@ -3,7 +3,7 @@ from __future__ import annotations
 ~~~~~~~~~~~~~~~~~~~~~~~~
 Table alerts.
 """
-from sqlalchemy import DateTime, String, Text
+from sqlalchemy import DateTime, Index, String, Text, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from app.infrastructure.persistence.database.base import Base
@@ -12,9 +12,28 @@ import datetime as dt
 
 
 
+# Prédicat de l'index unique partiel ux_alerts_firing : doit rester identique
+# à l'index_where de l'ON CONFLICT de AlertRepository.create_firing.
+FIRING_PREDICATE = "status = 'FIRING'"
+
 
 class Alert(Base):
     __tablename__ = "alerts"
+    # Miroir des index créés par les migrations 0001 / 0005 / 0012
+    __table_args__ = (
+        Index("ix_alerts_machine_status_triggered", "machine_id", "status", "triggered_at"),
+        Index("ix_alerts_status_triggered", "status", "triggered_at"),
+        # Au plus une alerte FIRING par (seuil, machine, métrique)
+        Index(
+            "ux_alerts_firing",
+            "threshold_id",
+            "machine_id",
+            "metric_instance_id",
+            unique=True,
+            postgresql_where=text(FIRING_PREDICATE),
+            sqlite_where=text(FIRING_PREDICATE),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     threshold_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True))
@@ -26,4 +45,4 @@ class Alert(Base):
     severity: Mapped[str] = mapped_column(String(16), default="warning")
     triggered_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), default=lambda: dt.datetime.now(dt.timezone.utc))
     resolved_at: Mapped[dt.datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
-    created_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), default=lambda: dt.datetime.now(dt.timezone.utc))
+    created_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
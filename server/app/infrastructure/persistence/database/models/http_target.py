@@ -13,6 +13,15 @@ import uuid
 import datetime as dt
 
 
+# Mode simple (accepted_status_codes NULL) : codes où le serveur répond "normalement"
+_SIMPLE_MODE_ACCEPTED: frozenset[int] = frozenset(
+    (*range(200, 300), 301, 302, 307, 308, 401, 403, 404)
+)
+
+# Codes HTTP valides (bornes des plages du mode expert)
+_MIN_STATUS, _MAX_STATUS = 100, 599
+
+
 class HttpTarget(Base):
     __tablename__ = "http_targets"
 
@@ -45,26 +54,33 @@ class HttpTarget(Base):
         """Vérifie si un status code est acceptable."""
         if status is None or status == 0:
             return False
-        
-        # Mode expert : validation stricte
-        if self.accepted_status_codes:
-            for start, end in self.accepted_status_codes:
-                if start <= status <= end:
-                    return True
-            return False
-        
-        # Mode simple : logique explicite ⬇️
-        if 200 <= status < 300:  # 2xx - Succès
-            return True
-        if status in [301, 302, 307, 308]:  # Redirections
-            return True
-        if status in [401, 403]:  # Accès protégé (serveur répond)
-            return True
-        if status == 404:  # Page non trouvée (serveur UP)
-            return True
-        
+
+        # Mode expert : validation stricte (ensemble précalculé depuis les plages)
+        codes = self.accepted_status_codes
+        if codes:
+            return status in self._accepted_set(codes)
+
+        # Mode simple : 2xx, redirections, accès protégé (401/403), 404 (serveur UP).
         # Tout le reste = échec (5xx, codes rares, etc.)
-        return False
+        return status in _SIMPLE_MODE_ACCEPTED
+
+    def _accepted_set(self, codes: list) -> frozenset[int]:
+        # Reconstruit seulement si la liste a été remplacée (affectation) ;
+        # une mutation en place ne serait de toute façon pas persistée (JSON non mutable).
+        cached = self.__dict__.get("_accepted_cache")
+        if cached is None or cached[0] is not codes:
+            # Plages bornées à 100..599 : une plage arbitraire ([[0, 2_000_000_000]])
+            # ne doit pas matérialiser des milliards d'entiers.
+            cached = (
+                codes,
+                frozenset(
+                    c
+                    for start, end in codes
+                    for c in range(max(int(start), _MIN_STATUS), min(int(end), _MAX_STATUS) + 1)
+                ),
+            )
+            self.__dict__["_accepted_cache"] = cached
+        return cached[1]
 
     @property
     def is_up(self) -> bool:
@@ -3,7 +3,7 @@ from __future__ import annotations
 ~~~~~~~~~~~~~~~~~~~~~~~~
 Table incidents.
 """
-from sqlalchemy import DateTime, Integer, String, Text, ForeignKey, Enum as SAEnum
+from sqlalchemy import DateTime, Index, Integer, String, Text, ForeignKey, Enum as SAEnum, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.infrastructure.persistence.database.base import Base
@@ -25,6 +25,12 @@ class IncidentType(str, enum.Enum):
 
 class Incident(Base):
     __tablename__ = "incidents"
+    # Miroir des index de la migration 0005 (les index uniques partiels
+    # ux_incidents_*_open_unique restent gérés par 0001)
+    __table_args__ = (
+        Index("ix_incidents_client_status", "client_id", "status"),
+        Index("ix_incidents_client_created", "client_id", text("created_at DESC")),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     client_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("clients.id"), nullable=False)
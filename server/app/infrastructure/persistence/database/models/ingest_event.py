@@ -3,10 +3,11 @@ from __future__ import annotations
 ~~~~~~~~~~~~~~~~~~~~~~~~
 Table ingest_events (idempotence).
 """
-from sqlalchemy import DateTime, String
+from sqlalchemy import DateTime, String, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from app.infrastructure.persistence.database.base import Base
+from app.infrastructure.persistence.database.functions import gen_random_uuid
 import uuid
 import datetime as dt
 
@@ -15,10 +16,15 @@ import datetime as dt
 
 class IngestEvent(Base):
     __tablename__ = "ingest_events"
+    # Clé d'idempotence (migration 0001) : sert aussi le lookup de create_if_absent
+    __table_args__ = (
+        UniqueConstraint("client_id", "ingest_id", name="uq_ingest_events_client_ingest"),
+    )
 
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # Généré par la base (insert-only, l'id n'est jamais relu côté Python)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, server_default=gen_random_uuid())
     client_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True))
     machine_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True))
     ingest_id: Mapped[str] = mapped_column(String(64))
     sent_at: Mapped[dt.datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
-    created_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), default=lambda: dt.datetime.now(dt.timezone.utc))
+    created_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
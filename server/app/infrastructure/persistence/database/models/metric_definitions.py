@@ -18,15 +18,17 @@ from sqlalchemy import (
     Text,
     DateTime,
     Enum as SAEnum,
+    func,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.infrastructure.persistence.database.base import Base
+from app.infrastructure.persistence.database.functions import gen_random_uuid
 
 
 def _utcnow() -> dt.datetime:
-    """Helper UTC (default + onupdate)."""
+    """Helper UTC (onupdate ; les INSERT passent par server_default=now())."""
     return dt.datetime.now(dt.timezone.utc)
 
 
@@ -39,7 +41,7 @@ class MetricDefinitions(Base):
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
+        server_default=gen_random_uuid(),
     )
 
     # Nom logique de la métrique (ex: "cpu.usage_percent", "disk[/].usage_percent", ...)
@@ -121,12 +123,12 @@ class MetricDefinitions(Base):
     created_at: Mapped[dt.datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
-        default=_utcnow,
+        server_default=func.now(),
     )
 
     updated_at: Mapped[dt.datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
-        default=_utcnow,
+        server_default=func.now(),
         onupdate=_utcnow,
     )
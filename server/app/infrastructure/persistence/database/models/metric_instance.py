@@ -13,12 +13,14 @@ from sqlalchemy import (
     ForeignKey,
     Index,
     UniqueConstraint,
+    func,
     text,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.infrastructure.persistence.database.base import Base  # même import que metric_definitions
+from app.infrastructure.persistence.database.functions import gen_random_uuid
 
 
 def _utcnow() -> dt.datetime:
@@ -36,12 +38,21 @@ class MetricInstance(Base):
             "dimension_value",
             name="uq_metric_instance",
         ),
-        # Ne pas avoir deux fois le même name_effective sur une machine
+        # Ne pas avoir deux fois le même name_effective sur une machine.
+        # Couvrant en PG (migration 0010) : id + flags lus sans visite du heap.
         Index(
             "ix_metric_instances_machine_name_effective",
             "machine_id",
             "name_effective",
             unique=True,
+            postgresql_include=["id", "definition_id", "is_alerting_enabled", "is_paused", "needs_threshold"],
+        ),
+        # Métriques surveillées (fraîcheur / évaluation) — migration 0007
+        Index(
+            "ix_metric_instances_alerting",
+            "machine_id",
+            postgresql_where=text("is_alerting_enabled IS TRUE AND is_paused IS FALSE"),
+            sqlite_where=text("is_alerting_enabled IS TRUE AND is_paused IS FALSE"),
         ),
     )
 
@@ -51,7 +62,7 @@ class MetricInstance(Base):
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
+        server_default=gen_random_uuid(),
     )
 
     machine_id: Mapped[uuid.UUID] = mapped_column(
@@ -128,11 +139,11 @@ class MetricInstance(Base):
     created_at: Mapped[dt.datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
-        default=_utcnow,
+        server_default=func.now(),
     )
     updated_at: Mapped[dt.datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
-        default=_utcnow,
+        server_default=func.now(),
         onupdate=_utcnow,
     )
@@ -9,24 +9,45 @@ Utilisé pour :
   - affichage statut : OK / ERROR / OUVERT / RÉSOLU
 """
 
-from sqlalchemy import DateTime, String, Text
+from sqlalchemy import DateTime, Index, String, Text, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.infrastructure.persistence.database.base import Base
+from app.infrastructure.persistence.database.functions import gen_random_uuid
 
 import uuid
 import datetime as dt
 
 
+# Prédicat de l'index partiel "vraies notifications envoyées" : doit rester
+# identique au filtre de get_last_notification_sent_at (notification_service)
+# pour que le planner puisse l'utiliser.
+REAL_NOTIFICATION_PREDICATE = (
+    "status = 'success' AND sent_at IS NOT NULL "
+    "AND provider NOT IN ('cooldown', 'grace', 'group_open')"
+)
+
+
 class NotificationLog(Base):
     __tablename__ = "notification_log"
 
+    __table_args__ = (
+        # Dernière notification réelle d'un client : lecture d'un seul tuple
+        Index(
+            "ix_notif_log_real_per_client",
+            "client_id",
+            text("sent_at DESC"),
+            postgresql_where=text(REAL_NOTIFICATION_PREDICATE),
+            sqlite_where=text(REAL_NOTIFICATION_PREDICATE),
+        ),
+    )
+
     # Identifiant unique du log
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
+        server_default=gen_random_uuid(),
     )
 
     # Client associé à la notification
@@ -55,10 +76,15 @@ class NotificationLog(Base):
     status: Mapped[str] = mapped_column(String(32), default="pending")
 
     # Message métier (court + utile pour audit)
-    message: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # message / error_message : groupe "blob" différé → options(undefer_group("blob"))
+    message: Mapped[str | None] = mapped_column(
+        Text, nullable=True, deferred=True, deferred_group="blob"
+    )
 
     # Erreur technique éventuelle
-    error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
+    error_message: Mapped[str | None] = mapped_column(
+        Text, nullable=True, deferred=True, deferred_group="blob"
+    )
 
     # Timestamp d’envoi réel — sert au cooldown
     sent_at: Mapped[dt.datetime | None] = mapped_column(
@@ -18,16 +18,14 @@ class OutboxStatus(str, enum.Enum):
 
 
 class JSONPortable(sa.types.TypeDecorator):
-    """JSONB sur Postgres, JSON ailleurs."""
+    """
+    JSON texte partout, y compris sur Postgres (json, pas jsonb) : payload et
+    reçu sont écrits une fois puis relus tels quels par le dispatcher, jamais
+    filtrés/indexés côté SQL → inutile de payer l'encodage binaire JSONB.
+    """
     impl = sa.JSON
     cache_ok = True
 
-    def load_dialect_impl(self, dialect):
-        if dialect.name == "postgresql":
-            from sqlalchemy.dialects.postgresql import JSONB
-            return dialect.type_descriptor(JSONB(astext_type=sa.Text()))
-        return dialect.type_descriptor(sa.JSON())
-
 
 class UUIDPortable(sa.types.TypeDecorator):
     """UUID natif sur Postgres, VARCHAR(36) ailleurs."""
@@ -40,6 +38,19 @@ class UUIDPortable(sa.types.TypeDecorator):
             return dialect.type_descriptor(PGUUID(as_uuid=True))
         return dialect.type_descriptor(sa.String(36))
 
+    def process_bind_param(self, value, dialect):
+        # Hors Postgres : le driver (sqlite3) ne sait pas lier un uuid.UUID.
+        # ⚠️ Même encodage (hex 32 car.) que UUID(as_uuid=True) des autres tables,
+        # sinon les FK vers clients.id / incidents.id ne correspondent pas.
+        if value is None or dialect.name == "postgresql":
+            return value
+        return (value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))).hex
+
+    def process_result_value(self, value, dialect):
+        if value is None or dialect.name == "postgresql" or isinstance(value, uuid.UUID):
+            return value
+        return uuid.UUID(value)
+
 
 class TstzPortable(sa.types.TypeDecorator):
     """TIMESTAMPTZ sur Postgres, DateTime() ailleurs."""
@@ -62,8 +73,23 @@ def StatusEnum():
     return sa.Enum(OutboxStatus, name="outbox_status", native_enum=True, create_type=False)
 
 
+# Prédicat de l'index partiel ix_outbox_pending_due : statuts lus par
+# OutboxRepository.fetch_due (valeurs par défaut de include_status).
+OUTBOX_DUE_PREDICATE = "status IN ('PENDING', 'DELIVERING')"
+
+
 class OutboxEvent(Base):
     __tablename__ = "outbox_events"
+    __table_args__ = (
+        sa.Index("ix_outbox_status_due", "status", "next_attempt_at"),
+        # Poll du dispatcher : seuls les events encore à livrer (migration 0007)
+        sa.Index(
+            "ix_outbox_pending_due",
+            "next_attempt_at",
+            postgresql_where=sa.text(OUTBOX_DUE_PREDICATE),
+            sqlite_where=sa.text(OUTBOX_DUE_PREDICATE),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUIDPortable(), primary_key=True, default=uuid.uuid4)
 
@@ -75,7 +101,11 @@ class OutboxEvent(Base):
     )
 
     type: Mapped[str] = mapped_column(sa.String(64), nullable=False)
-    payload: Mapped[dict] = mapped_column(JSONPortable(), nullable=False)
+    # Groupe "blob" différé : seuls le dispatcher et le suivi de livraison les lisent
+    # (options(undefer_group("blob"))) ; les get/update d'état ne les chargent pas.
+    payload: Mapped[dict] = mapped_column(
+        JSONPortable(), nullable=False, deferred=True, deferred_group="blob"
+    )
 
     status: Mapped[OutboxStatus] = mapped_column(
         StatusEnum(), nullable=False, default=OutboxStatus.PENDING
@@ -83,19 +113,25 @@ class OutboxEvent(Base):
     attempts: Mapped[int] = mapped_column(sa.Integer, nullable=False, default=0)
     next_attempt_at: Mapped[datetime] = mapped_column(TstzPortable(), nullable=False, default=lambda: datetime.now(timezone.utc))
 
-    delivery_receipt: Mapped[dict | None] = mapped_column(JSONPortable(), nullable=True)
-    last_error: Mapped[str | None] = mapped_column(sa.Text, nullable=True)
+    delivery_receipt: Mapped[dict | None] = mapped_column(
+        JSONPortable(), nullable=True, deferred=True, deferred_group="blob"
+    )
+    last_error: Mapped[str | None] = mapped_column(
+        sa.Text, nullable=True, deferred=True, deferred_group="blob"
+    )
 
     created_at: Mapped[datetime] = mapped_column(
-        TstzPortable(), nullable=False, default=lambda: datetime.now(timezone.utc)
+        TstzPortable(), nullable=False, server_default=sa.func.now()
     )
     updated_at: Mapped[datetime] = mapped_column(
-        TstzPortable(), nullable=False, default=lambda: datetime.now(timezone.utc),
+        TstzPortable(), nullable=False, server_default=sa.func.now(),
         onupdate=lambda: datetime.now(timezone.utc),
     )
 
-    client = relationship("Client", lazy="selectin")
-    incident = relationship("Incident", lazy="selectin")
+    # ⚠️ Jamais chargées implicitement : le dispatcher ne lit que id/payload.
+    # Accès sans chargement préalable → erreur (voir OutboxRepository.attach_parents).
+    client = relationship("Client", lazy="raise_on_sql")
+    incident = relationship("Incident", lazy="raise_on_sql")
 
     def __repr__(self) -> str:  # pragma: no cover
         return f"<OutboxEvent id={self.id} type={self.type} status={self.status} attempts={self.attempts}>"
@@ -3,23 +3,41 @@ from __future__ import annotations
 ~~~~~~~~~~~~~~~~~~~~~~~~
 Table samples (valeurs typées).
 """
-from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from app.infrastructure.persistence.database.base import Base
 import datetime as dt
+import uuid
 
 
 
 
 class Sample(Base):
     __tablename__ = "samples"
+    __table_args__ = (
+        # Élagage des scans par intervalle de temps (migration 0011) ; les
+        # lectures par métrique passent par la PK (metric_instance_id, ts, seq).
+        Index(
+            "ix_samples_ts_brin",
+            "ts",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ),
+    )
 
-    metric_instance_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("metrics.id", ondelete="CASCADE"), primary_key=True)
+    # as_uuid=True volontaire : avec psycopg3 l'UUID natif est décodé par le driver
+    # (aucun traitement SQLAlchemy par ligne) ; as_uuid=False ajouterait un str().
+    metric_instance_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("metric_instances.id", ondelete="CASCADE"), primary_key=True)
     ts: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), primary_key=True, default=lambda: dt.datetime.now(dt.timezone.utc))
     seq: Mapped[int] = mapped_column(Integer, primary_key=True, default=0)
     value_type: Mapped[str] = mapped_column(String(16))  # bool|numeric|string
+    # ⚠️ Colonnes typées volontairement séparées (pas de BYTEA "packé") :
+    # - en PG un NULL ne coûte qu'un bit du null-bitmap (ni stockage ni padding) ;
+    #   un bytea de 8 octets coûterait 9 octets (en-tête varlena) contre 8 pour float8.
+    # - les requêtes filtrent directement sur "<col> IS NOT NULL" selon le type.
+    # - (value::bit(64))::bigint::float8 convertit l'entier, il ne réinterprète pas l'IEEE-754.
     num_value: Mapped[float | None] = mapped_column(Float, nullable=True)
     bool_value: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
     str_value: Mapped[str | None] = mapped_column(Text, nullable=True)
-    created_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), default=lambda: dt.datetime.now(dt.timezone.utc))
+    created_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -13,13 +13,16 @@ from sqlalchemy import (
     DateTime,
     ForeignKey,
     CheckConstraint,
+    Index,
     UniqueConstraint,
+    func,
     text,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.infrastructure.persistence.database.base import Base
+from app.infrastructure.persistence.database.functions import gen_random_uuid
 
 
 def _utcnow() -> dt.datetime:
@@ -36,7 +39,9 @@ class ThresholdNew(Base):
             "name",
             name="uq_thresholds_metric_instance_id_name",
         ),
-        # Une seule des trois valeurs doit être renseignée
+        # Une seule des trois valeurs doit être renseignée.
+        # ⚠️ Pas de discriminant généré (CASE ... → 'num'|'bool'|'str') à la place :
+        # il accepterait deux valeurs renseignées et coûterait une colonne stockée.
         CheckConstraint(
             """
             (value_num IS NOT NULL AND value_bool IS NULL AND value_str IS NULL)
@@ -45,12 +50,19 @@ class ThresholdNew(Base):
         """,
             name="ck_thresholds_single_value",
         ),
+        # Seuils évalués (for_machine filtre sur is_active IS true) — migration 0007
+        Index(
+            "ix_thresholds_active",
+            "metric_instance_id",
+            postgresql_where=text("is_active IS TRUE"),
+            sqlite_where=text("is_active IS TRUE"),
+        ),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
+        server_default=gen_random_uuid(),
     )
 
     metric_instance_id: Mapped[uuid.UUID] = mapped_column(
@@ -116,11 +128,11 @@ class ThresholdNew(Base):
     created_at: Mapped[dt.datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
-        default=_utcnow,
+        server_default=func.now(),
     )
     updated_at: Mapped[dt.datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
-        default=_utcnow,
+        server_default=func.now(),
         onupdate=_utcnow,
     )
@@ -14,12 +14,14 @@ from sqlalchemy import (
     ForeignKey,
     CheckConstraint,
     UniqueConstraint,
+    func,
     text,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.infrastructure.persistence.database.base import Base
+from app.infrastructure.persistence.database.functions import gen_random_uuid
 
 
 def _utcnow() -> dt.datetime:
@@ -36,7 +38,9 @@ class ThresholdTemplate(Base):
             "name",
             name="uq_threshold_templates_definition_id_name",
         ),
-        # Une seule des trois valeurs doit être renseignée
+        # Une seule des trois valeurs doit être renseignée.
+        # ⚠️ Pas de discriminant généré (CASE ... → 'num'|'bool'|'str') à la place :
+        # il accepterait deux valeurs renseignées et coûterait une colonne stockée.
         CheckConstraint(
             """
             (value_num IS NOT NULL AND value_bool IS NULL AND value_str IS NULL)
@@ -50,7 +54,7 @@ class ThresholdTemplate(Base):
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
+        server_default=gen_random_uuid(),
     )
 
     definition_id: Mapped[uuid.UUID] = mapped_column(
@@ -103,11 +107,11 @@ class ThresholdTemplate(Base):
     created_at: Mapped[dt.datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
-        default=_utcnow,
+        server_default=func.now(),
     )
     updated_at: Mapped[dt.datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
-        default=_utcnow,
+        server_default=func.now(),
         onupdate=_utcnow,
     )
@@ -6,9 +6,12 @@ Init Engine/Session + helpers (compat FastAPI + services).
 
 - get_db()       : dépendance FastAPI (yield Session) avec commit/rollback.
 - open_session() : context manager pour services/tests (with ... as s:) idem.
+- read_session() : lectures one-shot sans transaction (AUTOCOMMIT).
 
 SQLite :
 - StaticPool pour in-memory, check_same_thread=False.
+- PRAGMA à la connexion : journal en mémoire + synchronous=OFF en in-memory (tests),
+  WAL + synchronous=NORMAL sur fichier (dev).
 - Création du schéma si http_targets manquante (tests unitaires sans Alembic).
 """
 
@@ -16,15 +19,30 @@ import os
 from contextlib import contextmanager
 from typing import Iterator
 
-from sqlalchemy import create_engine, inspect
+from sqlalchemy import create_engine, event, inspect
 from sqlalchemy.engine import Engine
 from sqlalchemy.engine.url import make_url
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from app.core.config import settings
 from app.infrastructure.persistence.database.base import Base  # metadata
+from app.infrastructure.persistence.database.models import register_all
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./app.db")
+# Lignes par INSERT multi-VALUES quand SQLAlchemy regroupe un executemany
+# (add_all + flush, insert(...) avec une liste de paramètres).
+INSERT_PAGE_SIZE = int(os.getenv("SAMPLES_INSERT_PAGE_SIZE", "1000"))
+
+# Pool Postgres : dimensionné par settings.DB_POOL_* (défaut SQLAlchemy 5+10 trop
+# court sous rafales). Liens morts détectés par les keepalives TCP plutôt que par
+# un SELECT 1 à chaque checkout (pre_ping désactivé par défaut).
+_PG_KEEPALIVES = {
+    "keepalives": 1,
+    "keepalives_idle": 30,
+    "keepalives_interval": 10,
+    "keepalives_count": 5,
+}
 
 _engine: Engine | None = None
 _SessionLocal: sessionmaker | None = None
@@ -42,14 +60,34 @@ def _ensure_sqlite_schema(engine: Engine) -> None:
         Base.metadata.create_all(bind=engine)
 
 
+def _sqlite_pragmas(in_memory: bool) -> tuple[str, ...]:
+    """PRAGMA appliqués à chaque connexion SQLite (jamais utilisé en prod Postgres)."""
+    common = ("PRAGMA temp_store=MEMORY", "PRAGMA cache_size=-65536")  # 64 Mo
+    if in_memory:
+        # Base jetable : aucune durabilité à garantir
+        return ("PRAGMA journal_mode=MEMORY", "PRAGMA synchronous=OFF", *common)
+    # Fichier dev : lectures et écritures concurrentes (API + worker)
+    return (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA mmap_size=268435456",
+        *common,
+    )
+
+
 def init_engine() -> Engine:
     """Construit l'Engine (singleton module)."""
     global _engine
     if _engine is not None:
         return _engine
 
+    # Tous les modèles enregistrés avant le 1er usage (create_all, relationships)
+    register_all()
+
     url = make_url(DATABASE_URL)
-    kwargs: dict = dict(pool_pre_ping=True, future=True)
+    # query_cache_size : cache des statements compilés (défaut SQLAlchemy 500),
+    # agrandi pour couvrir toutes les requêtes "chaudes" des services/workers.
+    kwargs: dict = dict(pool_pre_ping=True, future=True, query_cache_size=1200)
     connect_args: dict = {}
     if url.get_backend_name().startswith("sqlite"):
         connect_args["check_same_thread"] = False
@@ -57,8 +95,33 @@ def init_engine() -> Engine:
         # Partage de connexion pour :memory:
         if db_name in ("", ":memory:"):
             kwargs["poolclass"] = StaticPool
+    elif url.get_backend_name() == "postgresql":
+        kwargs["insertmanyvalues_page_size"] = INSERT_PAGE_SIZE
+        # (jamais StaticPool ici : ces options sont propres au QueuePool)
+        kwargs.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+        connect_args.update(_PG_KEEPALIVES)
+        if url.get_driver_name() == "psycopg2":
+            # psycopg2 : executemany via execute_values / execute_batch
+            kwargs["executemany_mode"] = "values_plus_batch"
+            kwargs["executemany_batch_page_size"] = 500
+
+    _engine = create_engine(url, connect_args=connect_args, **kwargs)  # URL déjà parsée
+    if url.get_backend_name().startswith("sqlite"):
+        pragmas = _sqlite_pragmas(kwargs.get("poolclass") is StaticPool)
+
+        @event.listens_for(_engine, "connect")
+        def _set_sqlite_pragmas(dbapi_conn, _record) -> None:
+            cur = dbapi_conn.cursor()
+            for pragma in pragmas:
+                cur.execute(pragma)
+            cur.close()
 
-    _engine = create_engine(DATABASE_URL, connect_args=connect_args, **kwargs)
     _ensure_sqlite_schema(_engine)
     return _engine
 
@@ -102,6 +165,28 @@ def open_session() -> Iterator[Session]:
         s.close()
 
 
+@contextmanager
+def read_session() -> Iterator[Session]:
+    """
+    Session pour lectures "one-shot" (ex: un scalar) :
+        with read_session() as s:
+            s.scalar(...)
+
+    Connexion en AUTOCOMMIT → ni BEGIN ni COMMIT envoyés au serveur.
+    ⚠️ Lecture seule : aucune écriture n'est commitée.
+    SQLite : repli sur open_session() (connexion partagée en StaticPool).
+    """
+    engine = init_engine()
+    if engine.url.get_backend_name() == "sqlite":
+        with open_session() as s:
+            yield s
+        return
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        with Session(bind=conn, autoflush=False, expire_on_commit=False) as s:
+            yield s
+
+
 # -------- Dépendance FastAPI --------------------------------------------------
 
 def get_db() -> Iterator[Session]:
@@ -3,12 +3,15 @@ from __future__ import annotations
 ~~~~~~~~~~~~~~~~~~~~~~~~
 Repo alerts.
 """
-from sqlalchemy import select, update
+from sqlalchemy import lambda_stmt, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
-from app.infrastructure.persistence.database.models.alert import Alert
+from app.infrastructure.persistence.database.models.alert import Alert, FIRING_PREDICATE
 import datetime as dt
 import uuid
+from typing import Sequence
 
 
 class AlertStatus:
@@ -51,14 +54,28 @@ class AlertRepository:
         # ⚠️ Le schéma DB définit alerts.current_value en TEXT NOT NULL → on force en str
         current_value_str = "" if current_value is None else str(current_value)
 
-        # Vérifie si une alerte FIRING existe déjà (même threshold + machine)
+        if metric_instance_id is not None:
+            return self._upsert_firing(
+                threshold_id=threshold_id,
+                machine_id=machine_id,
+                metric_instance_id=metric_instance_id,
+                severity=severity,
+                message=message,
+                current_value=current_value_str,
+            )
+
+        # metric_instance_id NULL : hors index unique (NULL ≠ NULL) → SELECT puis INSERT/UPDATE.
+        # lambda_stmt : construction + compilation mises en cache, seuls les
+        # paramètres (variables de closure) sont re-liés à chaque appel.
         existing = self.s.scalar(
-            select(Alert).where(
-                Alert.threshold_id == threshold_id,
-                Alert.machine_id == machine_id,
-                Alert.metric_instance_id == metric_instance_id,
-                Alert.status == AlertStatus.FIRING,
-            ).limit(1)
+            lambda_stmt(
+                lambda: select(Alert).where(
+                    Alert.threshold_id == threshold_id,
+                    Alert.machine_id == machine_id,
+                    Alert.metric_instance_id.is_(None),
+                    Alert.status == AlertStatus.FIRING,
+                ).limit(1)
+            )
         )
 
         if existing:
@@ -95,6 +112,54 @@ class AlertRepository:
         self.s.flush()
         return a, True  # <- nouvelle alerte créée
 
+    def _upsert_firing(
+        self,
+        *,
+        threshold_id,
+        machine_id,
+        metric_instance_id,
+        severity,
+        message,
+        current_value: str,
+    ) -> tuple["Alert", bool]:
+        """
+        INSERT ... ON CONFLICT (ux_alerts_firing) DO UPDATE ... RETURNING :
+        un seul aller-retour, sans fenêtre de course entre SELECT et INSERT.
+
+        triggered_at n'est pas mis à jour (on garde l'origine de l'alerte).
+        created : l'id renvoyé est celui généré ici (portable PG/SQLite, pas de xmax).
+        """
+        new_id = uuid.uuid4()
+        if self.s.get_bind().dialect.name == "sqlite":
+            stmt = sqlite_insert(Alert)
+        else:
+            stmt = pg_insert(Alert)
+        stmt = stmt.values(
+            id=new_id,
+            threshold_id=threshold_id,
+            machine_id=machine_id,
+            metric_instance_id=metric_instance_id,
+            status=AlertStatus.FIRING,
+            current_value=current_value,
+            message=message,
+            severity=severity,
+            triggered_at=dt.datetime.now(dt.timezone.utc),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Alert.threshold_id, Alert.machine_id, Alert.metric_instance_id],
+            # Prédicat littéral : un paramètre lié empêcherait PG d'inférer l'index partiel
+            index_where=text(FIRING_PREDICATE),
+            set_={
+                "message": stmt.excluded.message,
+                "current_value": stmt.excluded.current_value,
+                "severity": stmt.excluded.severity,
+            },
+        ).returning(Alert)
+
+        # populate_existing : rafraîchit l'alerte déjà présente dans la Session
+        alert = self.s.scalars(stmt, execution_options={"populate_existing": True}).one()
+        return alert, alert.id == new_id
+
     def resolve_open_for_threshold(self, threshold_id) -> int:
         """
         Résoudre toutes les alertes ouvertes pour un seuil donné.
@@ -125,6 +190,44 @@ class AlertRepository:
             self.s.rollback()
             raise
 
+    def resolve_open_for_thresholds(
+        self,
+        threshold_ids: Sequence,
+        *,
+        now: dt.datetime | None = None,
+    ) -> int:
+        """
+        Résout en UN seul UPDATE les alertes ouvertes de plusieurs seuils
+        (passes de réconciliation), au lieu d'un UPDATE par seuil.
+
+        ⚠️ synchronize_session=False : les objets Alert déjà chargés dans la
+        Session ne sont pas mis à jour (recharger si besoin après l'appel).
+
+        Returns:
+            Nombre d'alertes résolues
+        """
+        if not threshold_ids:
+            return 0
+        if now is None:
+            now = dt.datetime.now(dt.timezone.utc)
+
+        stmt = (
+            update(Alert)
+            .where(
+                Alert.threshold_id.in_(threshold_ids),
+                Alert.status != AlertStatus.RESOLVED,
+            )
+            .values(status=AlertStatus.RESOLVED, resolved_at=now)
+            .execution_options(synchronize_session=False)
+        )
+
+        try:
+            result = self.s.execute(stmt)
+            return result.rowcount or 0
+        except SQLAlchemyError:
+            self.s.rollback()
+            raise
+
     def resolve_open_for_threshold_instance(
         self,
         threshold_id,
@@ -16,7 +16,9 @@ from typing import Optional, Iterable, Any
 from uuid import UUID
 
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from app.infrastructure.persistence.database.models.client_settings import ClientSettings
 from app.core.config import settings
@@ -24,21 +26,36 @@ from app.core.config import settings
 from urllib.parse import urlparse
 
 
+# Nom de canal Slack : '#' + 1 à 15 caractères [a-zA-Z0-9_-] (cf. set_slack_channel_name)
+_SLACK_CHANNEL_REGEX = re.compile(r"^#[a-zA-Z0-9_-]{1,15}$")
+
+# Colonnes modifiables via upsert / update_partial (les clés inconnues sont ignorées)
+_COLUMNS = frozenset(c.key for c in ClientSettings.__table__.columns) - {"id", "client_id"}
+
+
 class ClientSettingsRepository:
     """Accès et manipulation des préférences client."""
 
     def __init__(self, db: Session):
         self.db = db
+        # Cache par instance (durée de vie = la Session appelante) : les getters
+        # "effectifs" enchaînés sur un même client ne relisent pas la ligne.
+        # None est mis en cache aussi (client sans paramétrage).
+        self._cache: dict[UUID, Optional[ClientSettings]] = {}
 
     # ---------------------------
     # Lectures de base
     # ---------------------------
 
     def get_by_client_id(self, client_id: UUID) -> Optional[ClientSettings]:
-        """Retourne l'entrée ClientSettings pour ce client, ou None."""
-        return self.db.scalar(
+        """Retourne l'entrée ClientSettings pour ce client, ou None (mis en cache)."""
+        if client_id in self._cache:
+            return self._cache[client_id]
+        cs = self.db.scalar(
             select(ClientSettings).where(ClientSettings.client_id == client_id)
         )
+        self._cache[client_id] = cs
+        return cs
 
     def exists_for_client(self, client_id: UUID) -> bool:
         """True si un ClientSettings existe déjà pour ce client."""
@@ -68,36 +85,26 @@ class ClientSettingsRepository:
 
         extra_fields permet d'injecter d'autres colonnes éventuelles sans changer la signature.
         """
-        cs = self.get_by_client_id(client_id)
-        if cs is None:
-            cs = ClientSettings(client_id=client_id)
-            self.db.add(cs)
-
+        fields: dict[str, Any] = dict(extra_fields or {})
         if reminder_notification_seconds is not None:
-            cs.reminder_notification_seconds = int(reminder_notification_seconds)
+            fields["reminder_notification_seconds"] = int(reminder_notification_seconds)
         if slack_webhook_url is not None:
-            cs.slack_webhook_url = slack_webhook_url
+            fields["slack_webhook_url"] = slack_webhook_url
         if slack_channel_name is not None:
-            cs.slack_channel_name = (slack_channel_name or "").strip() or None
+            fields["slack_channel_name"] = (slack_channel_name or "").strip() or None
         if notification_email is not None:
-            cs.notification_email = notification_email
+            fields["notification_email"] = notification_email
         if alert_grouping_enabled is not None:
-            cs.alert_grouping_enabled = bool(alert_grouping_enabled)
+            fields["alert_grouping_enabled"] = bool(alert_grouping_enabled)
         if alert_grouping_window_seconds is not None:
-            cs.alert_grouping_window_seconds = int(alert_grouping_window_seconds)
+            fields["alert_grouping_window_seconds"] = int(alert_grouping_window_seconds)
         if notify_on_resolve is not None:
-            cs.notify_on_resolve = bool(notify_on_resolve)
+            fields["notify_on_resolve"] = bool(notify_on_resolve)
         if grace_period_seconds is not None:
-            cs.grace_period_seconds = int(grace_period_seconds)
-
-        if extra_fields:
-            for k, v in extra_fields.items():
-                # Définition prudente uniquement si l'attribut existe
-                if hasattr(cs, k):
-                    setattr(cs, k, v)
+            fields["grace_period_seconds"] = int(grace_period_seconds)
 
         # Pas de commit ici — l'appelant gère s.commit()
-        return cs
+        return self._upsert_fields(client_id, fields)
 
     def update_partial(
         self,
@@ -110,19 +117,51 @@ class ClientSettingsRepository:
         Met à jour un sous-ensemble de champs. Si create_if_missing=True et
         l'entrée n'existe pas, elle sera créée.
         """
-        cs = self.get_by_client_id(client_id)
+        if create_if_missing:
+            return self._upsert_fields(client_id, fields)
+
+        values = {k: v for k, v in fields.items() if k in _COLUMNS}
+        if values:
+            cs = self.db.scalar(
+                update(ClientSettings)
+                .where(ClientSettings.client_id == client_id)
+                .values(**values)
+                .returning(ClientSettings),
+                execution_options={"populate_existing": True},
+            )
+        else:
+            cs = self.get_by_client_id(client_id)
         if cs is None:
-            if not create_if_missing:
-                raise ValueError(f"No ClientSettings for client_id={client_id}")
-            cs = ClientSettings(client_id=client_id)
-            self.db.add(cs)
-
-        for k, v in fields.items():
-            if hasattr(cs, k):
-                setattr(cs, k, v)
+            raise ValueError(f"No ClientSettings for client_id={client_id}")
+        self._cache[client_id] = cs
+        return cs
 
+    def _upsert_fields(self, client_id: UUID, fields: dict[str, Any]) -> ClientSettings:
+        """
+        INSERT ... ON CONFLICT (client_id) DO UPDATE ... RETURNING : un seul
+        aller-retour, sans fenêtre de course entre SELECT et INSERT.
+        Les colonnes absentes de `fields` gardent leur valeur (ou leur défaut à la création).
+        """
+        values = {k: v for k, v in fields.items() if k in _COLUMNS}
+        stmt = self._insert().values(client_id=client_id, **values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ClientSettings.client_id],
+            # Rien à modifier : mise à jour neutre pour que RETURNING renvoie la ligne
+            set_=values or {"client_id": stmt.excluded.client_id},
+        ).returning(ClientSettings)
+        # populate_existing : rafraîchit l'instance déjà présente dans la Session
+        cs = self.db.scalars(
+            stmt, execution_options={"populate_existing": True}
+        ).one()
+        self._cache[client_id] = cs
         return cs
 
+    def _insert(self):
+        """INSERT du dialecte courant (ON CONFLICT disponible en Postgres et SQLite)."""
+        if self.db.get_bind().dialect.name == "sqlite":
+            return sqlite_insert(ClientSettings)
+        return pg_insert(ClientSettings)
+
     # Raccourcis ciblés
 
     def set_reminder_seconds(self, client_id: UUID, seconds: int, *, create_if_missing: bool = True) -> ClientSettings:
@@ -207,9 +246,7 @@ class ClientSettingsRepository:
         # ─────────────────────────────────────────────
         # Slack autorise : lowercase recommandé, chiffres, -, _
         # On accepte les majuscules mais on peut les normaliser si tu veux
-        CHANNEL_REGEX = re.compile(r"^#[a-zA-Z0-9_-]{1,15}$")
-
-        if not CHANNEL_REGEX.match(name):
+        if not _SLACK_CHANNEL_REGEX.match(name):
             raise ValueError(f"Invalid Slack channel name: {slack_channel_name}")
 
         # ─────────────────────────────────────────────
@@ -294,6 +331,25 @@ class ClientSettingsRepository:
             return cs.notification_email.strip()
         return None
 
+    def get_notification_targets(self, client_id: UUID) -> tuple[Optional[str], Optional[str]]:
+        """
+        (email, webhook Slack) effectifs du client en UNE requête.
+
+        Ne sélectionne que les deux colonnes utiles (pas d'hydratation ORM) ;
+        mêmes règles que get_effective_notification_email / get_effective_slack_webhook.
+        """
+        row = self.db.execute(
+            select(ClientSettings.notification_email, ClientSettings.slack_webhook_url)
+            .where(ClientSettings.client_id == client_id)
+        ).first()
+        if row is None:
+            return None, None
+        email, webhook = row
+        return (
+            email.strip() if email else None,
+            (webhook or "").strip() or None,
+        )
+
     def get_effective_notify_on_resolve(self, client_id: UUID) -> bool:
         cs = self.get_by_client_id(client_id)
         # Fallback True si non trouvé ou champ NULL (sécurité)
@@ -384,13 +440,38 @@ class ClientSettingsRepository:
     def ensure_many(self, client_ids: Iterable[UUID]) -> list[ClientSettings]:
         """
         Garantit l'existence d'une entrée ClientSettings pour chaque client_id fourni.
-        Ne commit pas ; retourne la liste (créée ou existante).
+        Ne commit pas ; retourne la liste (créée ou existante), dans l'ordre d'entrée.
+
+        2 allers-retours quel que soit N : un SELECT ... IN puis un INSERT multi-lignes
+        ON CONFLICT DO NOTHING ... RETURNING pour les manquants.
         """
-        created_or_found: list[ClientSettings] = []
-        for cid in client_ids:
-            cs = self.get_by_client_id(cid)
-            if cs is None:
-                cs = ClientSettings(client_id=cid)
-                self.db.add(cs)
-            created_or_found.append(cs)
-        return created_or_found
+        ids = list(client_ids)
+        if not ids:
+            return []
+
+        found = {
+            cs.client_id: cs
+            for cs in self.db.scalars(
+                select(ClientSettings).where(ClientSettings.client_id.in_(set(ids)))
+            )
+        }
+        missing = list(dict.fromkeys(cid for cid in ids if cid not in found))
+        if missing:
+            stmt = (
+                self._insert()
+                .values([{"client_id": cid} for cid in missing])
+                .on_conflict_do_nothing(index_elements=[ClientSettings.client_id])
+                .returning(ClientSettings)
+            )
+            found.update((cs.client_id, cs) for cs in self.db.scalars(stmt))
+            # Lignes créées en parallèle par une autre transaction (DO NOTHING → pas de RETURNING)
+            racing = [cid for cid in missing if cid not in found]
+            if racing:
+                found.update(
+                    (cs.client_id, cs)
+                    for cs in self.db.scalars(
+                        select(ClientSettings).where(ClientSettings.client_id.in_(racing))
+                    )
+                )
+        self._cache.update(found)
+        return [found[cid] for cid in ids]
@@ -15,7 +15,7 @@ from typing import Optional
 from uuid import UUID
 from typing import cast
 
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
@@ -348,8 +348,8 @@ class IncidentRepository:
         Résout un incident (quel que soit son type) à partir de l'objet Incident ORM.
 
         Utilisation :
-          - metric_freshness_service.check_metrics_no_data() phase 3
-            pour résoudre des incidents NO_DATA_MACHINE devenus obsolètes.
+          - résolution unitaire d'un incident déjà chargé
+            (pour un lot, préférer resolve_bulk()).
 
         Note :
           - Ne commit pas (responsabilité de l'appelant).
@@ -361,6 +361,32 @@ class IncidentRepository:
         self.db.flush()
         return inc
 
+    def resolve_bulk(self, incident_ids: list[UUID]) -> int:
+        """
+        Résout en UNE requête UPDATE les incidents OPEN dont l'id est fourni.
+
+        Utilisation :
+          - metric_freshness_service.check_metrics_no_data() phase 3
+            (nettoyage massif d'incidents NO_DATA_MACHINE obsolètes).
+
+        Retourne : nombre d'incidents résolus.
+        Note :
+          - Ne commit pas (responsabilité de l'appelant).
+        """
+        if not incident_ids:
+            return 0
+
+        now = datetime.now(timezone.utc)
+        result = self.db.execute(
+            update(Incident)
+            .where(
+                Incident.id.in_(incident_ids),
+                Incident.status == "OPEN",
+            )
+            .values(status="RESOLVED", resolved_at=now, updated_at=now)
+        )
+        return result.rowcount or 0
+
     # =========================================================================
     # HTTP CHECKS (incidents liés à un http_target_id)
     # =========================================================================
@@ -532,6 +558,20 @@ class IncidentRepository:
         )
         return list(self.db.scalars(q))
 
+    def list_open_nodata_metric_instance_ids(self) -> set[UUID]:
+        """
+        Retourne les metric_instance_id ayant un incident NO_DATA_METRIC ouvert.
+
+        Utilisé par metric_freshness_service.check_metrics_no_data() pour ne
+        tenter une résolution que sur les métriques réellement concernées.
+        """
+        q = select(Incident.metric_instance_id).where(
+            Incident.incident_type == IncidentType.NO_DATA_METRIC,
+            Incident.status == "OPEN",
+            Incident.metric_instance_id.is_not(None),
+        )
+        return set(self.db.scalars(q))
+
     def auto_resolve_stale_threshold_incidents(
             self,
             *,
@@ -5,7 +5,6 @@ Insert idempotent d’un ingest_event (compat SQLite/Postgres).
 - Coerce client_id / machine_id vers uuid.UUID si fournis en str
 - Upsert "pauvre" : on vérifie l’existence avant insert
 """
-import uuid as _uuid
 from datetime import datetime
 from uuid import UUID
 
@@ -51,7 +50,6 @@ class IngestRepository:
         # Insert
         self.s.execute(
             insert(IngestEvent).values(
-                id=_uuid.uuid4(),
                 client_id=_as_uuid(client_id),
                 machine_id=_as_uuid(machine_id),
                 ingest_id=ingest_id,
@@ -15,7 +15,7 @@ Objectif :
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import select, and_ 
+from sqlalchemy import lambda_stmt, select, and_
 from sqlalchemy.orm import Session
 
 from app.infrastructure.persistence.database.models.metric_instance import MetricInstance
@@ -63,22 +63,28 @@ class MetricInstancesRepository:
         mid = _as_uuid(machine_id)
         dim = (dimension_value or "").strip()
 
+        # lambda_stmt : forme de requête fixe → construction + clé de cache SQL
+        # calculées une seule fois ; mid/did/name_effective/dim deviennent des binds.
         if definition is not None:
             # ───────── Cas 1 : métrique du catalogue ─────────
             did = definition.id
-            stmt = select(MetricInstance).where(
-                MetricInstance.machine_id == mid,
-                MetricInstance.definition_id == did,
-                MetricInstance.dimension_value == dim,
+            stmt = lambda_stmt(
+                lambda: select(MetricInstance).where(
+                    MetricInstance.machine_id == mid,
+                    MetricInstance.definition_id == did,
+                    MetricInstance.dimension_value == dim,
+                )
             )
         else:
             # ───────── Cas 2 : métrique custom / vendor tiers ─────────
             did = None
-            stmt = select(MetricInstance).where(
-                MetricInstance.machine_id == mid,
-                MetricInstance.definition_id.is_(None),
-                MetricInstance.name_effective == name_effective,
-                MetricInstance.dimension_value == dim,
+            stmt = lambda_stmt(
+                lambda: select(MetricInstance).where(
+                    MetricInstance.machine_id == mid,
+                    MetricInstance.definition_id.is_(None),
+                    MetricInstance.name_effective == name_effective,
+                    MetricInstance.dimension_value == dim,
+                )
             )
 
         obj = self.s.scalars(stmt).first()
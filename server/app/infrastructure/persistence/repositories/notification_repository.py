@@ -5,15 +5,41 @@ from uuid import UUID
 from datetime import datetime, timezone
 
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func
+from sqlalchemy import event, select, func
 
 from celery.utils.log import get_task_logger
 
+from app.infrastructure.cache.cooldown_store import get_cooldown_store
 from app.infrastructure.persistence.database.models.notification_log import NotificationLog
 
 
 logger = get_task_logger(__name__)
 
+# Session.info : envois "success" à reporter dans le CooldownStore au commit
+_PENDING_COOLDOWNS = "cooldown_store_pending"
+
+
+@event.listens_for(Session, "after_commit")
+def _record_committed_cooldowns(session: Session) -> None:
+    pending = session.info.pop(_PENDING_COOLDOWNS, None)
+    if not pending:
+        return
+    store = get_cooldown_store()
+    if store is None:
+        return
+    for client_id, incident_id, sent_at in pending:
+        try:
+            store.record(client_id, incident_id, sent_at)
+        except Exception:
+            logger.warning("cooldown store: record failed", exc_info=True)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_cooldowns(session: Session, previous_transaction) -> None:
+    # Rollback d'un SAVEPOINT : la transaction englobante peut encore committer
+    if not previous_transaction.nested:
+        session.info.pop(_PENDING_COOLDOWNS, None)
+
 
 class NotificationRepository:
     """
@@ -22,7 +48,8 @@ class NotificationRepository:
     Principes :
     - Ne gère PAS les commit/rollback : c'est à la charge de l'appelant.
     - add_log(...) tronque les messages / erreurs pour éviter les blobs énormes.
-    - get_last_sent_at_any(...) sert de source pour les cooldowns (status='success').
+    - get_last_sent_at_any(...) sert de source pour les cooldowns (status='success'),
+      via le CooldownStore Redis s'il est activé (repli SQL en cas d'erreur Redis).
     """
 
     def __init__(self, db: Session):
@@ -70,6 +97,12 @@ class NotificationRepository:
             sent_at=(datetime.now(timezone.utc) if set_sent_at else None),
         )
         self.db.add(row)
+        if status == "success" and row.sent_at is not None and get_cooldown_store() is not None:
+            # Écrit dans Redis seulement après le COMMIT (cf. _record_committed_cooldowns) :
+            # un envoi dont le log est annulé ne doit pas déclencher de cooldown.
+            self.db.info.setdefault(_PENDING_COOLDOWNS, []).append(
+                (client_id, incident_id, row.sent_at)
+            )
         return row
 
     def get_last_sent_at_any(
@@ -91,6 +124,17 @@ class NotificationRepository:
         Returns:
             datetime UTC ou None.
         """
+        store = get_cooldown_store()
+        if store is not None:
+            try:
+                return store.last_sent_at(
+                    client_id,
+                    incident_id,
+                    load=lambda since: self._last_sent_per_incident(client_id, since),
+                )
+            except Exception:
+                logger.warning("cooldown store: lookup failed, fallback DB", exc_info=True)
+
         stmt = (
             select(func.max(NotificationLog.sent_at))
             .where(
@@ -103,3 +147,20 @@ class NotificationRepository:
 
         result = self.db.execute(stmt).scalar_one_or_none()
         return result
+
+    def _last_sent_per_incident(
+        self,
+        client_id: UUID,
+        since: datetime,
+    ) -> list[tuple[Optional[UUID], datetime]]:
+        """Dernier envoi 'success' par incident depuis `since` (chargement du CooldownStore)."""
+        stmt = (
+            select(NotificationLog.incident_id, func.max(NotificationLog.sent_at))
+            .where(
+                NotificationLog.client_id == client_id,
+                NotificationLog.status == "success",
+                NotificationLog.sent_at >= since,
+            )
+            .group_by(NotificationLog.incident_id)
+        )
+        return [(inc, sent) for inc, sent in self.db.execute(stmt)]
@@ -9,20 +9,30 @@ Points clés :
 - On considère les évènements à traiter avec status IN (PENDING, DELIVERING).
 - Conversions UUID robustes pour accepter str/uuid.UUID.
 - Mises à jour de `updated_at` lors des changements d’état.
+- `claim_due(...)` : claim atomique d'un lot (FOR UPDATE SKIP LOCKED + RETURNING).
 """
+import os
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Optional, Sequence
 
-from sqlalchemy import select, or_
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, insert, select, or_, update
+from sqlalchemy.orm import Session, undefer_group
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.infrastructure.persistence.database.models.client import Client
+from app.infrastructure.persistence.database.models.incident import Incident
 from app.infrastructure.persistence.database.models.outbox_event import (
     OutboxEvent,
     OutboxStatus,
 )
 
 
+# Bail d'un claim : un event DELIVERING n'est re-claimable qu'après ce délai
+# (worker mort en cours de livraison), jamais par un worker concurrent.
+CLAIM_LEASE_SECONDS = int(os.getenv("OUTBOX_CLAIM_LEASE_SECONDS", "300"))
+
+
 def _coerce_uuid(v: str | uuid.UUID | None) -> uuid.UUID | None:
     """Convertit str → UUID (ou passe-through) ; None si invalide."""
     if v is None:
@@ -74,24 +84,45 @@ class OutboxRepository:
         Insère un évènement pending planifié à `next_attempt_at` (now UTC par défaut).
         Commit immédiat (pattern simple).
         """
+        return self.insert_many(
+            [
+                {
+                    "type_": type_,
+                    "payload": payload,
+                    "client_id": client_id,
+                    "incident_id": incident_id,
+                    "next_attempt_at": next_attempt_at,
+                }
+            ]
+        )[0]
 
-        # client_id est NOT NULL côté DB -> on refuse les valeurs invalides
-        cid = _require_uuid(client_id, field="client_id")
-
-        evt = OutboxEvent(
-            id=uuid.uuid4(),
-            type=type_,
-            payload=payload,
-            status=OutboxStatus.PENDING,
-            attempts=0,
-            next_attempt_at=next_attempt_at or datetime.now(timezone.utc),
-            client_id=cid,
-            incident_id=_coerce_uuid(incident_id),
-        )
-        self.s.add(evt)
+    def insert_many(self, events: Sequence[dict]) -> list[OutboxEvent]:
+        """
+        Insère un lot d'évènements pending (mêmes clés que `insert`) en un seul
+        INSERT ... VALUES (...), (...) RETURNING : les objets reviennent complets
+        (created_at/updated_at compris), sans refresh() ligne à ligne. Commit immédiat.
+        """
+        if not events:
+            return []
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "type": e["type_"],
+                "payload": e["payload"],
+                "status": OutboxStatus.PENDING,
+                "attempts": 0,
+                # client_id est NOT NULL côté DB -> on refuse les valeurs invalides
+                "client_id": _require_uuid(e.get("client_id"), field="client_id"),
+                "incident_id": _coerce_uuid(e.get("incident_id")),
+                "next_attempt_at": e.get("next_attempt_at") or now,
+            }
+            for e in events
+        ]
+        stmt = insert(OutboxEvent).returning(OutboxEvent, sort_by_parameter_order=True)
+        created = list(self.s.scalars(stmt, rows))
         self.s.commit()
-        self.s.refresh(evt)
-        return evt
+        return created
 
     # --- Read ----------------------------------------------------------------
 
@@ -114,7 +145,11 @@ class OutboxRepository:
         stmt = (
             select(OutboxEvent)
             .where(
-                OutboxEvent.status.in_(include_status),
+                # Statuts en littéraux (literal_execute) : le planner peut prouver
+                # le prédicat de l'index partiel ix_outbox_pending_due.
+                OutboxEvent.status.in_(
+                    bindparam("statuses", list(include_status), expanding=True, literal_execute=True)
+                ),
                 # next_attempt_at peut être NULL (modèle le permet) :
                 # on les considère "dus" immédiatement.
                 or_(
@@ -123,14 +158,85 @@ class OutboxRepository:
                 ),
             )
             .order_by(OutboxEvent.next_attempt_at.asc())
+            # Events à livrer : payload nécessaire
+            .options(undefer_group("blob"))
         )
         if limit:
             stmt = stmt.limit(limit)
 
         return list(self.s.scalars(stmt))
 
+    def attach_parents(self, events: Sequence[OutboxEvent]) -> None:
+        """
+        Renseigne .client / .incident (relations en raise_on_sql) pour un lot
+        d'events : 1 SELECT par type de parent pour tout le lot.
+        """
+        if not events:
+            return
+        client_ids = {e.client_id for e in events}
+        incident_ids = {e.incident_id for e in events if e.incident_id is not None}
+        clients = {c.id: c for c in self.s.scalars(select(Client).where(Client.id.in_(client_ids)))}
+        incidents = (
+            {i.id: i for i in self.s.scalars(select(Incident).where(Incident.id.in_(incident_ids)))}
+            if incident_ids else {}
+        )
+        for e in events:
+            set_committed_value(e, "client", clients.get(e.client_id))
+            set_committed_value(e, "incident", incidents.get(e.incident_id))
+
     # --- Update ---------------------------------------------------------------
 
+    def claim_due(
+        self,
+        *,
+        limit: int,
+        as_of: Optional[datetime] = None,
+        include_status: Sequence[OutboxStatus] = (OutboxStatus.PENDING, OutboxStatus.DELIVERING),
+        lease_seconds: int = CLAIM_LEASE_SECONDS,
+    ) -> list[tuple[uuid.UUID, dict, int]]:
+        """
+        Claim atomique d'au plus `limit` évènements dus, en un seul aller-retour :
+          UPDATE ... SET status=DELIVERING, attempts=attempts+1, next_attempt_at=pivot+bail
+          WHERE id IN (SELECT id ... FOR UPDATE SKIP LOCKED LIMIT n) RETURNING id, payload, attempts
+
+        - Des workers concurrents ne se disputent jamais une ligne (SKIP LOCKED).
+        - next_attempt_at repoussé de `lease_seconds` : un event DELIVERING n'est
+          repris que si son worker n'a ni livré ni replanifié dans le délai.
+        Commit immédiat. Retourne des primitives (id, payload, attempts).
+        """
+        pivot = as_of or datetime.now(timezone.utc)
+
+        due_ids = (
+            select(OutboxEvent.id)
+            .where(
+                OutboxEvent.status.in_(
+                    bindparam("statuses", list(include_status), expanding=True, literal_execute=True)
+                ),
+                or_(
+                    OutboxEvent.next_attempt_at.is_(None),
+                    OutboxEvent.next_attempt_at <= pivot,
+                ),
+            )
+            .order_by(OutboxEvent.next_attempt_at.asc())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(OutboxEvent)
+            .where(OutboxEvent.id.in_(due_ids.scalar_subquery()))
+            .values(
+                status=OutboxStatus.DELIVERING,
+                attempts=OutboxEvent.attempts + 1,
+                next_attempt_at=pivot + timedelta(seconds=lease_seconds),
+                updated_at=datetime.now(timezone.utc),
+            )
+            .returning(OutboxEvent.id, OutboxEvent.payload, OutboxEvent.attempts)
+            .execution_options(synchronize_session=False)
+        )
+        claimed = [(eid, payload or {}, attempts) for eid, payload, attempts in self.s.execute(stmt)]
+        self.s.commit()
+        return claimed
+
     def mark_delivering(self, event_id: str | uuid.UUID) -> int:
         """
         Passe en DELIVERING et incrémente attempts. Retourne la valeur d’`attempts`.
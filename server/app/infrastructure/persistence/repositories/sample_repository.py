@@ -1,14 +1,50 @@
 from __future__ import annotations
 
-from typing import Iterable, Any, Optional
+from datetime import datetime
+from typing import TYPE_CHECKING, Iterable, Iterator, Any, Optional
+from uuid import UUID
 
-from sqlalchemy import text
+from sqlalchemy import Row, select, text
 from sqlalchemy.orm import Session
 
+from app.infrastructure.persistence.database.models.sample import Sample
+
+if TYPE_CHECKING:
+    import pyarrow
+
+
+# À partir de combien de lignes write_batch passe par COPY (Postgres)
+COPY_THRESHOLD = 100
+
+# Staging par connexion (TEMP) : colonnes nullables, vidé à chaque commit
+_STAGE_DDL = """
+    CREATE TEMP TABLE IF NOT EXISTS samples_stage (
+        metric_instance_id uuid,
+        ts timestamptz,
+        value_type varchar(16),
+        num_value double precision,
+        bool_value boolean,
+        str_value text
+    ) ON COMMIT DELETE ROWS
+"""
+_STAGE_COPY = (
+    "COPY samples_stage (metric_instance_id, ts, value_type, num_value, bool_value, str_value) "
+    "FROM STDIN"
+)
+_STAGE_FLUSH = """
+    INSERT INTO samples
+        (metric_instance_id, ts, seq, value_type, num_value, bool_value, str_value)
+    SELECT metric_instance_id, COALESCE(ts, NOW()), 0,
+           value_type, num_value, bool_value, str_value
+    FROM samples_stage
+    ON CONFLICT (metric_instance_id, ts, seq) DO NOTHING
+"""
+
 
 class SampleRepository:
     """
-    Repository responsable de l'écriture des samples uniquement.
+    Repository responsable de l'écriture des samples (+ lecture en flux pour
+    les scans analytiques : stream_samples / stream_samples_arrow).
     
     STRATÉGIE seq :
     - Version actuelle : ON CONFLICT DO NOTHING (accepte une seule valeur par (metric_instance, ts))
@@ -26,6 +62,60 @@ class SampleRepository:
     def __init__(self, session: Session) -> None:
         self.session = session
 
+    def stream_samples(
+        self,
+        metric_instance_id: UUID,
+        start: datetime,
+        end: datetime,
+        *,
+        batch_size: int = 1000,
+    ) -> Iterator[list[Row]]:
+        """
+        Samples d'une metric_instance sur [start, end[, par lots de `batch_size`
+        lignes (ts, value_type, num_value, bool_value, str_value), triés par ts.
+
+        Colonnes seules (pas d'objets ORM ni d'identity map) et yield_per →
+        curseur serveur en Postgres : mémoire O(batch) quel que soit l'intervalle.
+        """
+        stmt = (
+            select(
+                Sample.ts,
+                Sample.value_type,
+                Sample.num_value,
+                Sample.bool_value,
+                Sample.str_value,
+            )
+            .where(
+                Sample.metric_instance_id == metric_instance_id,
+                Sample.ts >= start,
+                Sample.ts < end,
+            )
+            .order_by(Sample.ts)
+            .execution_options(yield_per=batch_size)
+        )
+        yield from self.session.execute(stmt).partitions()
+
+    def stream_samples_arrow(
+        self,
+        metric_instance_id: UUID,
+        start: datetime,
+        end: datetime,
+        *,
+        batch_size: int = 1000,
+    ) -> Iterator["pyarrow.RecordBatch"]:
+        """
+        Variante colonnaire de stream_samples : un pyarrow.RecordBatch par lot.
+        ⚠️ pyarrow est optionnel (non requis par l'application) : import à l'usage.
+        """
+        import pyarrow as pa
+
+        names = ("ts", "value_type", "num_value", "bool_value", "str_value")
+        for rows in self.stream_samples(metric_instance_id, start, end, batch_size=batch_size):
+            columns = list(zip(*rows))
+            yield pa.RecordBatch.from_arrays(
+                [pa.array(col) for col in columns], names=list(names)
+            )
+
     def _coerce_value_fields(self, m: dict) -> dict:
         """
         Convertit un dict métrique normalisé en colonnes tri-typées.
@@ -138,18 +228,47 @@ class SampleRepository:
                      :value_type, :num_value, :bool_value, :str_value)
             """
 
-        for m in metrics_payload:
-            metric_instance_id = m["id"]
-            values = self._coerce_value_fields(m)
+        rows = [
+            {"metric_instance_id": m["id"], **self._coerce_value_fields(m), **ts_bind}
+            for m in metrics_payload
+        ]
 
-            self.session.execute(
-                text(insert_sql),
-                {
-                    "metric_instance_id": metric_instance_id,
-                    **values,
-                    **ts_bind,
-                },
-            )
+        # Gros lots sur Postgres : COPY (un seul flux) plutôt que N INSERT
+        if dialect == "postgresql" and len(rows) >= COPY_THRESHOLD and self._copy_rows(rows, sent_at):
+            return
+
+        # Un seul execute() : executemany côté driver
+        self.session.execute(text(insert_sql), rows)
+
+    def _copy_rows(self, rows: list[dict], sent_at: Optional[str]) -> bool:
+        """
+        COPY ... FROM STDIN (psycopg 3) vers une table temporaire de staging,
+        puis INSERT ... SELECT ... ON CONFLICT DO NOTHING (COPY seul ne sait pas
+        ignorer les doublons). Même transaction que la Session.
+
+        Retourne False si le driver n'expose pas l'API copy() de psycopg 3
+        (l'appelant repasse alors par l'INSERT classique).
+        """
+        raw = self.session.connection().connection.driver_connection
+        if not hasattr(raw, "cursor"):
+            return False
+        with raw.cursor() as cur:
+            if not hasattr(cur, "copy"):
+                return False
+            cur.execute(_STAGE_DDL)
+            with cur.copy(_STAGE_COPY) as copy:
+                for r in rows:
+                    copy.write_row((
+                        r["metric_instance_id"],
+                        sent_at,  # NULL → NOW() à l'INSERT ... SELECT
+                        r["value_type"],
+                        r["num_value"],
+                        r["bool_value"],
+                        r["str_value"],
+                    ))
+            cur.execute(_STAGE_FLUSH)
+            cur.execute("TRUNCATE samples_stage")
+        return True
 
     # ─────────────────────────────────────────────────────────────────────────────
     # Version ALTERNATIVE : seq auto-incrémenté (pour valeurs multiples)
@@ -14,7 +14,7 @@ Rôle :
 from uuid import UUID
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.orm import Session
 
 from app.infrastructure.persistence.database.models.threshold_new import ThresholdNew
@@ -55,9 +55,11 @@ class ThresholdNewRepository:
         """Récupère le seuil nommé 'default' pour une metric_instance donnée."""
         mid = _as_uuid(metric_instance_id)
         return self.s.scalars(
-            select(ThresholdNew).where(
-                ThresholdNew.metric_instance_id == mid,
-                ThresholdNew.name == "default",
+            lambda_stmt(
+                lambda: select(ThresholdNew).where(
+                    ThresholdNew.metric_instance_id == mid,
+                    ThresholdNew.name == "default",
+                )
             )
         ).first()
 
@@ -67,13 +69,20 @@ class ThresholdNewRepository:
 
         Règle :
         - uniquement les thresholds actifs : is_active = TRUE
+        - uniquement les metric_instances surveillées :
+          is_alerting_enabled = TRUE et is_paused = FALSE
+          (mêmes prédicats que les index partiels ix_thresholds_active et
+          ix_metric_instances_alerting → 2 index probes, aucune ligne inutile hydratée)
         """
         mid = _as_uuid(machine_id)
-        q = (
-            select(ThresholdNew, MetricInstance)
+        # Appelée à chaque évaluation : requête construite/compilée une seule fois
+        q = lambda_stmt(
+            lambda: select(ThresholdNew, MetricInstance)
             .join(MetricInstance, ThresholdNew.metric_instance_id == MetricInstance.id)
             .where(
                 MetricInstance.machine_id == mid,
+                MetricInstance.is_alerting_enabled.is_(True),
+                MetricInstance.is_paused.is_(False),
                 ThresholdNew.is_active.is_(True),
             )
         )
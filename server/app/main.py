@@ -10,6 +10,8 @@ from app.api.v1.router import api_router
 from app.core.config import settings
 from app.core.logging import setup_logging
 from app.core.middleware import install_global_middleware
+from app.infrastructure.notifications.providers.slack_provider import SlackProvider
+from app.infrastructure.persistence.database.models import register_all
 
 app = FastAPI(title="Monitoring Server", version="0.2.1")
 
@@ -28,6 +30,11 @@ app.add_middleware(
 @app.on_event("startup")
 async def startup() -> None:
     setup_logging()
+    register_all()
     install_global_middleware(app)
 
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    await SlackProvider.aclose()
+
 app.include_router(api_router, prefix="/api/v1")
\ No newline at end of file
@@ -16,7 +16,9 @@ sys.path.append(str(Path(__file__).resolve().parents[2]))  # -> /app/server
 
 # Import your SQLAlchemy models and Base
 from app.infrastructure.persistence.database.base import Base
-from app.infrastructure.persistence.database import models  # noqa: F401
+from app.infrastructure.persistence.database import models
+
+models.register_all()  # Base.metadata complet pour l'autogénération
 
 # Alembic Config object
 config = context.config
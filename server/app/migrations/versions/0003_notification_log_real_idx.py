@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+"""
+0003_notification_log_real_idx
+
+Index partiel sur notification_log pour get_last_notification_sent_at :
+(client_id, sent_at DESC) restreint aux "vraies" notifications envoyées
+(status='success', sent_at non NULL, hors providers techniques).
+Le ORDER BY sent_at DESC LIMIT 1 devient la lecture d'un seul tuple d'index.
+
+PostgreSQL : CREATE INDEX CONCURRENTLY (hors transaction, pas de verrou
+bloquant les écritures sur notification_log).
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003_notification_log_real_idx"
+down_revision = "0002_seed_dev_data"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "ix_notif_log_real_per_client"
+
+# ⚠️ Doit rester identique à NotificationLog.REAL_NOTIFICATION_PREDICATE
+PREDICATE = (
+    "status = 'success' AND sent_at IS NOT NULL "
+    "AND provider NOT IN ('cooldown', 'grace', 'group_open')"
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(
+                INDEX_NAME,
+                "notification_log",
+                ["client_id", sa.text("sent_at DESC")],
+                postgresql_where=sa.text(PREDICATE),
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+    else:
+        op.create_index(
+            INDEX_NAME,
+            "notification_log",
+            ["client_id", sa.text("sent_at DESC")],
+            sqlite_where=sa.text(PREDICATE),
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.drop_index(
+                INDEX_NAME,
+                table_name="notification_log",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+    else:
+        op.drop_index(INDEX_NAME, table_name="notification_log")
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+"""
+0004_ingest_events_id_default
+
+ingest_events.id généré par la base (DEFAULT gen_random_uuid()) : l'insert
+idempotent d'ingestion n'envoie plus d'id calculé en Python.
+
+gen_random_uuid() est intégré à PostgreSQL depuis la v13 (pas de pgcrypto).
+SQLite : pas d'ALTER COLUMN ... SET DEFAULT ; le schéma de test vient de
+create_all(), qui porte déjà le défaut du modèle.
+"""
+
+from alembic import op
+
+revision = "0004_ingest_events_id_default"
+down_revision = "0003_notification_log_real_idx"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("ALTER TABLE ingest_events ALTER COLUMN id SET DEFAULT gen_random_uuid()")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("ALTER TABLE ingest_events ALTER COLUMN id DROP DEFAULT")
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+"""
+0005_hot_path_indexes
+
+Index composites pour les requêtes chaudes :
+- incidents (client_id, status)          : incidents OPEN d'un client (évaluation, UI machines)
+- incidents (client_id, created_at DESC) : liste /incidents (ORDER BY created_at DESC LIMIT 100)
+- alerts (machine_id, status, triggered_at) : remplace ix_alerts_machine_status
+  (même préfixe) et sert aussi le tri par triggered_at des alertes d'une machine.
+
+Déjà couverts par 0001 : idempotence ingest (uq_ingest_events_client_ingest)
+et unicité des incidents OPEN par dedup_key (ux_incidents_*_open_unique).
+
+PostgreSQL : CREATE/DROP INDEX CONCURRENTLY (hors transaction).
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005_hot_path_indexes"
+down_revision = "0004_ingest_events_id_default"
+branch_labels = None
+depends_on = None
+
+# (nom, table, colonnes)
+INDEXES = (
+    ("ix_incidents_client_status", "incidents", ["client_id", "status"]),
+    ("ix_incidents_client_created", "incidents", ["client_id", sa.text("created_at DESC")]),
+    ("ix_alerts_machine_status_triggered", "alerts", ["machine_id", "status", "triggered_at"]),
+)
+REPLACED = ("ix_alerts_machine_status", "alerts", ["machine_id", "status"])
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for name, table, cols in INDEXES:
+                op.create_index(name, table, cols, postgresql_concurrently=True, if_not_exists=True)
+            name, table, _ = REPLACED
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    else:
+        for name, table, cols in INDEXES:
+            op.create_index(name, table, cols)
+        name, table, _ = REPLACED
+        op.drop_index(name, table_name=table)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            name, table, cols = REPLACED
+            op.create_index(name, table, cols, postgresql_concurrently=True, if_not_exists=True)
+            for name, table, _ in INDEXES:
+                op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    else:
+        name, table, cols = REPLACED
+        op.create_index(name, table, cols)
+        for name, table, _ in INDEXES:
+            op.drop_index(name, table_name=table)
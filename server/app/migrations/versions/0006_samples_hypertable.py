@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+"""
+0006_samples_hypertable
+
+samples → hypertable TimescaleDB : chunks de 7 jours sur `ts` + partitionnement
+spatial sur metric_instance_id (8 partitions). Les requêtes par plage de temps
+n'ouvrent plus que les chunks concernés (chunk exclusion).
+
+Conditionnel : ne fait rien si l'extension timescaledb n'est pas disponible
+sur le serveur (Postgres "vanilla", SQLite) ou pas préchargée
+(shared_preload_libraries). Sans index par défaut de Timescale. La PK (metric_instance_id, ts, seq)
+contient déjà les deux colonnes de partitionnement, comme l'exige Timescale.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006_samples_hypertable"
+down_revision = "0005_hot_path_indexes"
+branch_labels = None
+depends_on = None
+
+
+def _timescale_available(bind) -> bool:
+    """
+    Extension déjà créée, ou paquet installé ET chargé via shared_preload_libraries
+    (sinon CREATE EXTENSION échoue : on saute la migration au lieu d'avorter).
+    """
+    if bind.execute(
+        sa.text("SELECT 1 FROM pg_extension WHERE extname = 'timescaledb'")
+    ).scalar():
+        return True
+    if not bind.execute(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'timescaledb'")
+    ).scalar():
+        return False
+    preload = bind.execute(sa.text("SELECT current_setting('shared_preload_libraries', true)")).scalar()
+    return "timescaledb" in (preload or "")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql" or not _timescale_available(bind):
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS timescaledb")
+    op.execute(
+        """
+        SELECT create_hypertable(
+            'samples', 'ts',
+            partitioning_column => 'metric_instance_id',
+            number_partitions => 8,
+            chunk_time_interval => INTERVAL '7 days',
+            migrate_data => TRUE,
+            if_not_exists => TRUE,
+            -- pas de btrees (ts DESC) / (metric_instance_id, ts DESC) : doublons
+            -- du préfixe de la PK et du BRIN sur ts (0011)
+            create_default_indexes => FALSE
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    # Pas de retour automatique hypertable → table simple (copie complète des
+    # données nécessaire) : à faire manuellement si besoin.
+    pass
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+"""
+0007_partial_hot_indexes
+
+Index partiels sur les prédicats "chauds" (le b-tree ne contient que les
+lignes utiles, pas l'historique DELIVERED/FAILED ou les seuils inactifs) :
+- outbox_events (next_attempt_at) WHERE status IN ('PENDING','DELIVERING')
+- thresholds_new (metric_instance_id) WHERE is_active IS TRUE
+- metric_instances (machine_id) WHERE is_alerting_enabled IS TRUE AND is_paused IS FALSE
+
+⚠️ Prédicats identiques aux modèles (OutboxEvent, ThresholdNew, MetricInstance)
+et aux filtres des requêtes, pour que le planner puisse les utiliser.
+
+PostgreSQL : CREATE INDEX CONCURRENTLY (hors transaction).
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007_partial_hot_indexes"
+down_revision = "0006_samples_hypertable"
+branch_labels = None
+depends_on = None
+
+# (nom, table, colonnes, prédicat)
+INDEXES = (
+    ("ix_outbox_pending_due", "outbox_events", ["next_attempt_at"],
+     "status IN ('PENDING', 'DELIVERING')"),
+    ("ix_thresholds_active", "thresholds_new", ["metric_instance_id"],
+     "is_active IS TRUE"),
+    ("ix_metric_instances_alerting", "metric_instances", ["machine_id"],
+     "is_alerting_enabled IS TRUE AND is_paused IS FALSE"),
+)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for name, table, cols, where in INDEXES:
+                op.create_index(
+                    name, table, cols,
+                    postgresql_where=sa.text(where),
+                    postgresql_concurrently=True,
+                    if_not_exists=True,
+                )
+    else:
+        for name, table, cols, where in INDEXES:
+            op.create_index(name, table, cols, sqlite_where=sa.text(where))
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for name, table, _, _ in INDEXES:
+                op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    else:
+        for name, table, _, _ in INDEXES:
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+"""
+0008_server_generated_pks
+
+Clés primaires UUID générées par la base (DEFAULT gen_random_uuid()) pour les
+tables dont les modèles n'envoient plus d'id calculé en Python.
+
+outbox_events n'est pas concernée : son type UUIDPortable stocke un VARCHAR(36)
+hors Postgres, l'id reste donc fourni par l'application.
+SQLite : pas d'ALTER COLUMN ... SET DEFAULT ; le schéma de test vient de
+create_all(), qui porte déjà le défaut du modèle.
+"""
+
+from alembic import op
+
+revision = "0008_server_generated_pks"
+down_revision = "0007_partial_hot_indexes"
+branch_labels = None
+depends_on = None
+
+_TABLES = (
+    "users",
+    "metric_definitions",
+    "metric_instances",
+    "threshold_templates",
+    "thresholds_new",
+    "notification_log",
+)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        for table in _TABLES:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT gen_random_uuid()")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        for table in _TABLES:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN id DROP DEFAULT")
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+"""
+0009_outbox_json_text
+
+outbox_events.payload / delivery_receipt : JSONB → JSON.
+
+Ces colonnes sont écrites une fois et relues telles quelles par le dispatcher
+(aucun opérateur JSONB, aucun index GIN) : le JSON texte évite la
+re-normalisation binaire à chaque écriture.
+
+⚠️ ALTER ... TYPE réécrit la table (verrou exclusif) : acceptable, la table
+outbox ne contient que les évènements en transit.
+SQLite : colonnes déjà en JSON (create_all), rien à faire.
+"""
+
+from alembic import op
+
+revision = "0009_outbox_json_text"
+down_revision = "0008_server_generated_pks"
+branch_labels = None
+depends_on = None
+
+
+def _alter(type_: str) -> None:
+    op.execute(
+        f"ALTER TABLE outbox_events "
+        f"ALTER COLUMN payload TYPE {type_} USING payload::{type_}, "
+        f"ALTER COLUMN delivery_receipt TYPE {type_} USING delivery_receipt::{type_}"
+    )
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        _alter("json")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        _alter("jsonb")
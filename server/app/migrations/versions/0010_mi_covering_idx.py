@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+"""
+0010_mi_covering_idx
+
+ix_metric_instances_machine_name_effective devient couvrant (PostgreSQL) :
+  UNIQUE (machine_id, name_effective)
+  INCLUDE (id, definition_id, is_alerting_enabled, is_paused, needs_threshold)
+
+Une lecture (machine, nom) → identifiant + flags d'alerting peut ainsi se faire
+en index-only scan, sans visite du heap.
+
+Reconstruction sans verrou bloquant : nouvel index CONCURRENTLY sous un nom
+temporaire, suppression de l'ancien, puis renommage. ANALYZE en fin.
+SQLite : pas d'INCLUDE, l'index existant reste tel quel.
+"""
+
+from alembic import op
+
+revision = "0010_mi_covering_idx"
+down_revision = "0009_outbox_json_text"
+branch_labels = None
+depends_on = None
+
+TABLE = "metric_instances"
+NAME = "ix_metric_instances_machine_name_effective"
+TMP = NAME + "_new"
+INCLUDE = ["id", "definition_id", "is_alerting_enabled", "is_paused", "needs_threshold"]
+
+
+def _rebuild(include: list[str] | None) -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            TMP, TABLE, ["machine_id", "name_effective"],
+            unique=True,
+            postgresql_include=include or [],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(NAME, table_name=TABLE, postgresql_concurrently=True, if_exists=True)
+        op.execute(f"ALTER INDEX {TMP} RENAME TO {NAME}")
+        op.execute(f"ANALYZE {TABLE}")
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        _rebuild(INCLUDE)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        _rebuild(None)
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+"""
+0011_samples_brin_ts
+
+samples : index BRIN sur ts (pages_per_range=32) pour l'élagage des scans par
+intervalle de temps (analytique, purge), quelques pages au lieu d'un b-tree.
+
+Suppression des index partiels ix_samples_{num,bool,str}_recent
+(metric_instance_id, ts) : chaque ligne est dans exactement l'un des trois,
+soit une seconde copie complète du préfixe de la PK (metric_instance_id, ts, seq)
+qui sert déjà ces lectures. Un b-tree de moins à maintenir par sample inséré.
+
+BRIN sur ts seul : metric_instance_id (UUID aléatoire) n'est pas corrélé à
+l'ordre physique, une colonne BRIN dessus n'élaguerait rien.
+
+PostgreSQL : CONCURRENTLY (hors transaction). Hypertable TimescaleDB (0006) :
+CONCURRENTLY refusé → index créé chunk par chunk (timescaledb.transaction_per_chunk),
+drops sans CONCURRENTLY.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0011_samples_brin_ts"
+down_revision = "0010_mi_covering_idx"
+branch_labels = None
+depends_on = None
+
+BRIN = "ix_samples_ts_brin"
+# (nom, prédicat) des index partiels créés par 0001
+PARTIALS = (
+    ("ix_samples_num_recent", "num_value IS NOT NULL"),
+    ("ix_samples_bool_recent", "bool_value IS NOT NULL"),
+    ("ix_samples_str_recent", "str_value IS NOT NULL"),
+)
+
+
+def _is_hypertable(bind) -> bool:
+    """samples converti en hypertable par 0006 (extension timescaledb créée)."""
+    if not bind.execute(
+        sa.text("SELECT 1 FROM pg_extension WHERE extname = 'timescaledb'")
+    ).scalar():
+        return False
+    return bool(
+        bind.execute(
+            sa.text(
+                "SELECT 1 FROM timescaledb_information.hypertables "
+                "WHERE hypertable_name = 'samples'"
+            )
+        ).scalar()
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql" and _is_hypertable(bind):
+        # Hors transaction : transaction_per_chunk committe après chaque chunk
+        with op.get_context().autocommit_block():
+            op.execute(
+                f"CREATE INDEX IF NOT EXISTS {BRIN} ON samples USING brin (ts) "
+                "WITH (pages_per_range = 32, timescaledb.transaction_per_chunk)"
+            )
+            for name, _ in PARTIALS:
+                op.drop_index(name, table_name="samples", if_exists=True)
+    elif bind.dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(
+                BRIN, "samples", ["ts"],
+                postgresql_using="brin",
+                postgresql_with={"pages_per_range": 32},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+            for name, _ in PARTIALS:
+                op.drop_index(name, table_name="samples", postgresql_concurrently=True, if_exists=True)
+    else:
+        for name, _ in PARTIALS:
+            op.drop_index(name, table_name="samples")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql" and _is_hypertable(bind):
+        with op.get_context().autocommit_block():
+            for name, where in PARTIALS:
+                op.execute(
+                    f"CREATE INDEX IF NOT EXISTS {name} ON samples (metric_instance_id, ts) "
+                    f"WITH (timescaledb.transaction_per_chunk) WHERE {where}"
+                )
+            op.drop_index(BRIN, table_name="samples", if_exists=True)
+    elif bind.dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for name, where in PARTIALS:
+                op.create_index(
+                    name, "samples", ["metric_instance_id", "ts"],
+                    postgresql_where=sa.text(where),
+                    postgresql_concurrently=True,
+                    if_not_exists=True,
+                )
+            op.drop_index(BRIN, table_name="samples", postgresql_concurrently=True, if_exists=True)
+    else:
+        for name, where in PARTIALS:
+            op.create_index(name, "samples", ["metric_instance_id", "ts"], sqlite_where=sa.text(where))
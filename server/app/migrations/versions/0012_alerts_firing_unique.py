@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+"""
+0012_alerts_firing_unique
+
+alerts : index UNIQUE partiel (threshold_id, machine_id, metric_instance_id)
+WHERE status = 'FIRING' — au plus une alerte FIRING par triplet.
+
+Cible de l'ON CONFLICT de AlertRepository.create_firing (upsert en un seul
+aller-retour au lieu de SELECT puis INSERT/UPDATE).
+
+Doublons FIRING éventuels (course entre deux évaluations) résolus avant la
+création : on garde la plus récente.
+
+PostgreSQL : CONCURRENTLY (hors transaction).
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0012_alerts_firing_unique"
+down_revision = "0011_samples_brin_ts"
+branch_labels = None
+depends_on = None
+
+INDEX = "ux_alerts_firing"
+COLUMNS = ["threshold_id", "machine_id", "metric_instance_id"]
+WHERE = "status = 'FIRING'"
+
+DEDUP_SQL = """
+UPDATE alerts SET status = 'RESOLVED', resolved_at = CURRENT_TIMESTAMP
+WHERE status = 'FIRING'
+  AND EXISTS (
+    SELECT 1 FROM alerts newer
+    WHERE newer.status = 'FIRING'
+      AND newer.threshold_id = alerts.threshold_id
+      AND newer.machine_id = alerts.machine_id
+      AND newer.metric_instance_id = alerts.metric_instance_id
+      AND (newer.triggered_at, newer.id) > (alerts.triggered_at, alerts.id)
+  )
+"""
+
+
+def upgrade() -> None:
+    op.execute(DEDUP_SQL)
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(
+                INDEX, "alerts", COLUMNS,
+                unique=True,
+                postgresql_where=sa.text(WHERE),
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+    else:
+        op.create_index(INDEX, "alerts", COLUMNS, unique=True, sqlite_where=sa.text(WHERE))
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.drop_index(INDEX, table_name="alerts", postgresql_concurrently=True, if_exists=True)
+    else:
+        op.drop_index(INDEX, table_name="alerts")
@@ -28,10 +28,12 @@ from app.workers.celery_app import celery
 from app.infrastructure.notifications.providers.email_provider import EmailProvider
 from app.infrastructure.notifications.providers.slack_provider import SlackProvider
 from app.core.config import settings
+from app.infrastructure.cache.cooldown_store import get_cooldown_store
 from app.infrastructure.persistence.database.session import open_session
 from app.infrastructure.persistence.database.models.incident import Incident, IncidentType
 from app.infrastructure.persistence.repositories.client_settings_repository import ClientSettingsRepository
 from app.infrastructure.persistence.repositories.notification_repository import NotificationRepository
+from app.application.services.notification_service import invalidate_last_notification
 
 logger = get_task_logger(__name__)
 
@@ -79,9 +81,13 @@ def get_remind_seconds(client_id: str | uuid.UUID | None) -> int:
         return _env_seconds()
 
 
+# Lu une seule fois à l'import (Settings est figé pour la durée du process).
+_DEFAULT_SLACK_CHANNEL: str = settings.SLACK_DEFAULT_CHANNEL
+
+
 def _fallback_channel() -> str:
     """Canal Slack par défaut si rien n’est fourni."""
-    return settings.SLACK_DEFAULT_CHANNEL
+    return _DEFAULT_SLACK_CHANNEL
 
 
 class NotificationPayload(BaseModel):
@@ -211,6 +217,8 @@ def _log_notification(
         alert_id=validated.alert_id,
         set_sent_at=set_sent_at,
     )
+    if status == "success" and set_sent_at:
+        invalidate_last_notification(validated.client_id)
 
 
 def _validate_payload(payload: Dict[str, Any]) -> Optional[NotificationPayload]:
@@ -371,6 +379,14 @@ def reset_alert_cooldown_for_machine(
 
         s.commit()
 
+    # Le dernier envoi du client a pu reculer : le cache Redis sera rechargé
+    store = get_cooldown_store()
+    if store is not None:
+        try:
+            store.forget(client_id)
+        except Exception:
+            logger.warning("cooldown store: forget failed", exc_info=True)
+
     logger.info(
         "reset_alert_cooldown_for_machine: cleared %d notification_log rows "
         "for client_id=%s machine_id=%s",
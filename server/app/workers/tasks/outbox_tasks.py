@@ -22,10 +22,9 @@ def deliver_outbox_batch(limit: int = 100) -> int:
     Livre un batch d'évènements Outbox "dus" (next_attempt_at <= now) en 2 phases :
 
     Phase 1 (CLAIM) :
-      - On récupère les évènements dus.
-      - Pour chacun, on tente de le "claim" (mark_delivering) => status=DELIVERING + attempts++.
-      - IMPORTANT: dans l'implémentation actuelle, mark_delivering() COMMIT déjà côté repository,
-        donc le claim est effectué "event par event" (pas un commit batch).
+      - Un seul UPDATE ... WHERE id IN (SELECT ... FOR UPDATE SKIP LOCKED) RETURNING
+        (Outbox.claim_due_events) : status=DELIVERING + attempts++ pour tout le lot,
+        sans conflit entre workers concurrents.
       - On sort uniquement avec des PRIMITIVES (id, payload) pour ne pas dépendre d'objets ORM détachés.
 
     Phase 2 (DELIVERY) :
@@ -36,8 +35,8 @@ def deliver_outbox_batch(limit: int = 100) -> int:
         Chaque event est finalisé dans une session dédiée (robuste aux erreurs event par event).
 
     Politique "strict safe" :
-      - On ne claim que les events PENDING (pas ceux déjà DELIVERING),
-        tant qu'on n'a pas de mécanisme explicite de lease/timeout sur DELIVERING.
+      - Un event DELIVERING n'est repris qu'après expiration du bail posé au claim
+        (OUTBOX_CLAIM_LEASE_SECONDS), c.-à-d. si son worker est mort en cours de route.
 
     Retour :
       - nombre d'évènements effectivement marqués DELIVERED.
@@ -54,20 +53,11 @@ def deliver_outbox_batch(limit: int = 100) -> int:
     with open_session() as s:
         ob = Outbox(OutboxRepository(s))
 
-        events = ob.due_events(limit=limit, as_of=now)
-
-        for ev in events:
-            eid = str(ev.id)
-
-            # mark_delivering commit déjà (dans ton repo actuel)
-            attempts = ob.mark_delivering(eid)
-            if not attempts:
-                continue
-
+        for ev_id, payload, attempts in ob.claim_due_events(limit=limit, as_of=now):
+            eid = str(ev_id)
             attempts_by_id[eid] = attempts
-
             # primitives-only
-            claimed.append({"id": eid, "payload": (ev.payload or {})})
+            claimed.append({"id": eid, "payload": payload})
 
     # ---------------------------------------------------------------------
     # Phase 2 : delivery + finalisation (1 session par event)
@@ -25,6 +25,7 @@ os.environ.setdefault("CELERY_TASK_ALWAYS_EAGER", "1")
 
 from app.main import app  # noqa: E402
 from app.infrastructure.persistence.database.base import Base  # noqa: E402
+from app.infrastructure.persistence.database.models import register_all  # noqa: E402
 from app.infrastructure.persistence.database.session import get_db  # ✅ override FastAPI  # noqa: E402
 from app.infrastructure.persistence.database.models.client import Client  # noqa: E402
 from app.infrastructure.persistence.database.models.user import User  # noqa: E402
@@ -46,6 +47,7 @@ TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=Fals
 # 3) Schéma
 @pytest.fixture(scope="session", autouse=True)
 def _schema():
+    register_all()
     Base.metadata.create_all(bind=engine)
     yield
     Base.metadata.drop_all(bind=engine)
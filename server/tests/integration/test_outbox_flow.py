@@ -13,6 +13,7 @@ from datetime import datetime, timezone, timedelta
 import uuid
 
 from sqlalchemy import select
+from sqlalchemy.orm import undefer_group
 
 from app.workers.tasks.outbox_tasks import deliver_outbox_batch
 from app.infrastructure.persistence.database.session import open_session
@@ -69,7 +70,7 @@ def _insert_event(type_: str, payload: dict, *, client_id: str | None = None, in
 
 def _get(event_id: str) -> OutboxEvent:
     with open_session() as s:
-        return s.get(OutboxEvent, event_id)
+        return s.get(OutboxEvent, event_id, options=[undefer_group("blob")])
 
 
 # ──────────────────────────────────────────────────────────────────────────────
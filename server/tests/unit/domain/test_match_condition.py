@@ -2,7 +2,7 @@
 import pytest
 from types import SimpleNamespace
 
-from app.domain.policies import match_condition
+from app.domain.policies import compile_rule, match_condition
 
 pytestmark = pytest.mark.unit
 
@@ -87,3 +87,10 @@ def test_string_contains_with_right_none_returns_false():
 def test_condition_is_trimmed_and_case_insensitive():
     th = TH(value_str="OK")
     assert match_condition("string", "  EQ  ", "OK", th) is True
+
+
+def test_compile_rule_is_reusable_across_samples():
+    check = compile_rule("numeric", " GT ", TH(value_num=5))
+    assert [check(v) for v in (4, 6, "x", None)] == [False, True, False, False]
+    rx = compile_rule("string", "regex", "^ok")
+    assert rx("ok-1") and not rx("ko") and not rx(None)
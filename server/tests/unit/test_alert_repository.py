@@ -0,0 +1,36 @@
+# server/tests/unit/test_alert_repository.py
+import uuid
+import pytest
+
+pytestmark = pytest.mark.unit
+
+
+def test_create_firing_upserts_single_firing_alert(Session):
+    from app.infrastructure.persistence.repositories.alert_repository import AlertRepository, AlertStatus
+    from app.infrastructure.persistence.database.models.alert import Alert
+
+    threshold_id, machine_id, metric_instance_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    key = dict(threshold_id=threshold_id, machine_id=machine_id, metric_instance_id=metric_instance_id)
+
+    with Session() as s:
+        repo = AlertRepository(s)
+
+        # 1) Première alerte → créée
+        a1, created1 = repo.create_firing(**key, severity="warning", message="cpu 91", current_value=91)
+        assert created1 is True
+
+        # 2) Même triplet → mise à jour de la même ligne (triggered_at conservé)
+        a2, created2 = repo.create_firing(**key, severity="critical", message="cpu 99", current_value=99)
+        assert created2 is False
+        assert a2.id == a1.id
+        assert (a2.severity, a2.message, a2.current_value) == ("critical", "cpu 99", "99")
+        assert a2.triggered_at == a1.triggered_at
+
+        # 3) Après résolution → nouvelle alerte
+        assert repo.resolve_open_for_threshold_instance(threshold_id, machine_id, metric_instance_id) == 1
+        a3, created3 = repo.create_firing(**key, severity="warning", message="cpu 92", current_value=92)
+        assert created3 is True
+        assert a3.id != a1.id
+
+        firing = s.query(Alert).filter_by(threshold_id=threshold_id, status=AlertStatus.FIRING).all()
+        assert len(firing) == 1
@@ -0,0 +1,29 @@
+# server/tests/unit/test_api_key_cache.py
+import pytest
+
+pytestmark = pytest.mark.unit
+
+
+def test_rotation_evicts_old_key_from_cache(Session):
+    from app.core import security
+    from app.infrastructure.persistence.database.models.api_key import ApiKey
+    from app.infrastructure.persistence.database.models.client import Client
+
+    with Session() as s:
+        client = Client(name="acme")
+        s.add(client)
+        s.flush()
+        ak = ApiKey(client_id=client.id, key="old-key-value", name="agent")
+        s.add(ak)
+        s.flush()
+
+        # 1) Clé valide → mise en cache
+        assert security._lookup_api_key(s, "old-key-value") is not None
+        assert security._API_KEY_CACHE.get(security._api_key_digest("old-key-value")) is not None
+
+        # 2) Rotation → l'ancienne valeur ne sert plus depuis le cache
+        ak.key = "new-key-value"
+        s.flush()
+        assert security._API_KEY_CACHE.get(security._api_key_digest("old-key-value")) is None
+        assert security._lookup_api_key(s, "old-key-value") is None
+        assert security._lookup_api_key(s, "new-key-value") is not None
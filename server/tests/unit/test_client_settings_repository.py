@@ -0,0 +1,87 @@
+# server/tests/unit/test_client_settings_repository.py
+import uuid
+import pytest
+
+pytestmark = pytest.mark.unit
+
+
+def test_setters_upsert_single_row(Session):
+    from app.infrastructure.persistence.repositories.client_settings_repository import ClientSettingsRepository
+    from app.infrastructure.persistence.database.models.client import Client
+    from app.infrastructure.persistence.database.models.client_settings import ClientSettings
+
+    with Session() as s:
+        client = Client(name="acme")
+        s.add(client)
+        s.flush()
+        client_id = client.id
+        repo = ClientSettingsRepository(s)
+
+        # 1) Création à la volée : champ fourni + défauts du modèle
+        cs = repo.set_reminder_seconds(client_id, 42)
+        assert cs.reminder_notification_seconds == 42
+        assert cs.grace_period_seconds == 120
+
+        # 2) Mise à jour : même ligne, les autres champs sont conservés
+        cs2 = repo.set_grouping(client_id, enabled=False, window_seconds=10)
+        assert cs2.id == cs.id
+        assert cs2.alert_grouping_enabled is False
+        assert cs2.alert_grouping_window_seconds == 10
+        assert cs2.reminder_notification_seconds == 42
+
+        # 3) Upsert sans champ : renvoie la ligne existante
+        assert repo.upsert(client_id).id == cs.id
+
+        rows = s.query(ClientSettings).filter_by(client_id=client_id).all()
+        assert len(rows) == 1
+
+
+def test_update_partial_without_create_raises(Session):
+    from app.infrastructure.persistence.repositories.client_settings_repository import ClientSettingsRepository
+
+    with Session() as s:
+        repo = ClientSettingsRepository(s)
+        with pytest.raises(ValueError):
+            repo.update_partial(uuid.uuid4(), {"notification_email": "ops@example.com"})
+
+
+def test_ensure_many_creates_missing_in_input_order(Session):
+    from app.infrastructure.persistence.repositories.client_settings_repository import ClientSettingsRepository
+    from app.infrastructure.persistence.database.models.client import Client
+    from app.infrastructure.persistence.database.models.client_settings import ClientSettings
+
+    with Session() as s:
+        a, b = Client(name="a"), Client(name="b")
+        s.add_all([a, b])
+        s.flush()
+        repo = ClientSettingsRepository(s)
+        existing = repo.set_reminder_seconds(a.id, 42)
+
+        out = repo.ensure_many([b.id, a.id, b.id])
+
+        assert [cs.client_id for cs in out] == [b.id, a.id, b.id]
+        assert out[1].id == existing.id
+        assert s.query(ClientSettings).filter(ClientSettings.client_id.in_([a.id, b.id])).count() == 2
+
+
+def test_repository_writes_invalidate_webhook_cache(Session):
+    """Upsert / UPDATE RETURNING (hors flush) : le cache webhook du process est invalidé."""
+    from app.application.services import notification_service as ns
+    from app.infrastructure.persistence.repositories.client_settings_repository import ClientSettingsRepository
+    from app.infrastructure.persistence.database.models.client import Client
+
+    with Session() as s:
+        client = Client(name="acme")
+        s.add(client)
+        s.flush()
+        repo = ClientSettingsRepository(s)
+
+        writes = (
+            lambda: repo.upsert(client.id, notification_email="ops@example.com"),
+            lambda: repo.set_slack_webhook(client.id, "https://hooks.slack.com/services/new"),
+            lambda: repo.update_partial(client.id, {"slack_webhook_url": "https://hooks.slack.com/services/other"}),
+        )
+        for write in writes:
+            ns._WEBHOOK_CACHE.set(client.id, "https://hooks.slack.com/services/old")
+            write()
+            assert ns._WEBHOOK_CACHE.get(client.id, ns._CACHE_MISS) is ns._CACHE_MISS
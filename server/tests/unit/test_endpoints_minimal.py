@@ -1,6 +1,7 @@
 import uuid
 import types
 import asyncio
+import inspect
 import pytest
 
 # Ces tests sont purement unitaires (on appelle directement les fonctions des endpoints).
@@ -12,7 +13,10 @@ def _run(coro):
     Exécute une coroutine sans nécessiter pytest-anyio/trio.
     - Essaye d'abord asyncio.run()
     - Si un event loop est déjà actif (rare selon config), fallback sur run_until_complete
+    - Endpoints synchrones (def, exécutés en threadpool) : résultat renvoyé tel quel
     """
+    if not inspect.isawaitable(coro):
+        return coro
     try:
         return asyncio.run(coro)
     except RuntimeError:
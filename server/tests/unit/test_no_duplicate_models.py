@@ -0,0 +1,44 @@
+# server/tests/unit/test_no_duplicate_models.py
+import ast
+from collections import defaultdict
+from pathlib import Path
+
+import pytest
+
+import app.infrastructure.persistence.database.models as models_pkg
+
+pytestmark = pytest.mark.unit
+
+MODELS_DIR = Path(models_pkg.__file__).parent
+
+
+def _model_classes():
+    """(nom de classe, __tablename__) → fichiers qui les définissent."""
+    classes, tables = defaultdict(list), defaultdict(list)
+    for path in sorted(MODELS_DIR.glob("*.py")):
+        for node in ast.parse(path.read_text(encoding="utf-8")).body:
+            if not isinstance(node, ast.ClassDef):
+                continue
+            classes[node.name].append(path.name)
+            for stmt in node.body:
+                if (
+                    isinstance(stmt, ast.Assign)
+                    and any(isinstance(t, ast.Name) and t.id == "__tablename__" for t in stmt.targets)
+                    and isinstance(stmt.value, ast.Constant)
+                ):
+                    tables[stmt.value.value].append(path.name)
+    return classes, tables
+
+
+def test_each_model_class_and_table_defined_once():
+    classes, tables = _model_classes()
+    assert {k: v for k, v in classes.items() if len(v) > 1} == {}
+    assert {k: v for k, v in tables.items() if len(v) > 1} == {}
+
+
+def test_register_all_covers_every_model_module():
+    from app.infrastructure.persistence.database.base import Base
+
+    models_pkg.register_all()
+    _, tables = _model_classes()
+    assert set(tables) <= set(Base.metadata.tables)
@@ -0,0 +1,39 @@
+# server/tests/unit/test_notification_repository.py
+import uuid
+import pytest
+
+pytestmark = pytest.mark.unit
+
+
+class _FakeStore:
+    def __init__(self):
+        self.records = []
+
+    def record(self, client_id, incident_id, sent_at):
+        self.records.append((client_id, incident_id, sent_at))
+
+
+def test_cooldown_recorded_only_after_commit(Session, monkeypatch):
+    import app.infrastructure.persistence.repositories.notification_repository as mod
+
+    store = _FakeStore()
+    monkeypatch.setattr(mod, "get_cooldown_store", lambda: store)
+    client_id, incident_id = uuid.uuid4(), uuid.uuid4()
+
+    with Session() as s:
+        repo = mod.NotificationRepository(s)
+
+        # 1) Log annulé → aucun cooldown enregistré
+        repo.add_log(client_id=client_id, provider="slack", recipient="#ops",
+                     status="success", message="m", incident_id=incident_id, set_sent_at=True)
+        s.rollback()
+        assert store.records == []
+
+        # 2) Log commité → cooldown enregistré (une seule fois)
+        row = repo.add_log(client_id=client_id, provider="slack", recipient="#ops",
+                           status="success", message="m", incident_id=incident_id, set_sent_at=True)
+        assert store.records == []
+        s.commit()
+        assert store.records == [(client_id, incident_id, row.sent_at)]
+        s.commit()
+        assert len(store.records) == 1
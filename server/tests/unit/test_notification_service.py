@@ -104,3 +104,66 @@ def test_cooldown_limits_duplicate_sends(monkeypatch, mock_slack):
     # Attendu : pas de spam massif. Entre 0 et 1 envoi supplémentaire maximum sur le second call.
     assert (mid - base) >= 1, "First notification should have triggered at least one send"
     assert (end - mid) in (0, 1), "Cooldown should limit duplicate sends for the same key"
+
+
+@pytest.mark.parametrize(
+    "statuses, expected_ok, expected_posts",
+    [
+        ([200], True, 1),
+        ([404], False, 1),            # 4xx : pas de nouvelle tentative
+        ([503, 503, 200], True, 3),   # 5xx : retry puis succès
+        ([429, 429, 429], False, 3),  # rate limit : tentatives épuisées
+    ],
+)
+def test_slack_retry_only_on_429_or_5xx(monkeypatch, statuses, expected_ok, expected_posts):
+    import httpx
+
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(statuses[len(calls) - 1])
+
+    monkeypatch.setattr(mod, "_SLACK_RETRY_DELAYS", (0.0, 0.0))
+    monkeypatch.setattr(mod, "_HTTP", httpx.Client(transport=httpx.MockTransport(handler)))
+
+    assert mod._notify_slack_with_retry("t", None, "http://example.invalid/hook") is expected_ok
+    assert len(calls) == expected_posts
+
+
+def test_slack_no_retry_after_read_timeout(monkeypatch):
+    """Timeout de lecture : le POST a pu être accepté → pas de renvoi (doublon)."""
+    import httpx
+
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        raise httpx.ReadTimeout("slow", request=request)
+
+    monkeypatch.setattr(mod, "_SLACK_RETRY_DELAYS", (0.0, 0.0))
+    monkeypatch.setattr(mod, "_HTTP", httpx.Client(transport=httpx.MockTransport(handler)))
+
+    assert mod._notify_slack_with_retry("t", None, "http://example.invalid/hook") is False
+    assert len(calls) == 1
+
+
+def test_notify_client_sync_inside_running_loop(monkeypatch):
+    """notify_client reste synchrone : appelable depuis une boucle déjà active."""
+    import asyncio
+    import httpx
+
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200)
+
+    monkeypatch.setattr(mod, "_load_client_targets", lambda cid: ("ops@example.com", "http://example.invalid/hook"))
+    monkeypatch.setattr(mod, "_HTTP", httpx.Client(transport=httpx.MockTransport(handler)))
+
+    async def _caller():
+        return mod.notify_client(None, "subject", "text")
+
+    assert asyncio.run(_caller()) == {"email": True, "slack": True}
+    assert len(calls) == 1
@@ -0,0 +1,65 @@
+# server/tests/unit/test_outbox_claim.py
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytestmark = pytest.mark.unit
+
+
+def _naive(d: datetime) -> datetime:
+    """SQLite relit les TIMESTAMP sans fuseau : comparaison en UTC naïf."""
+    return d.astimezone(timezone.utc).replace(tzinfo=None) if d.tzinfo else d
+
+
+def test_claim_due_batches_oldest_and_leases(Session):
+    from app.infrastructure.persistence.database.models.client import Client
+    from app.infrastructure.persistence.database.models.outbox_event import OutboxEvent, OutboxStatus
+    from app.infrastructure.persistence.repositories.outbox_repository import OutboxRepository
+
+    now = datetime.now(timezone.utc)
+    lease = 60
+
+    with Session() as s:
+        client = Client(name="acme")
+        s.add(client)
+        s.flush()
+        repo = OutboxRepository(s)
+
+        # 5 events dus (du plus ancien au plus récent) + 1 event futur
+        due = repo.insert_many([
+            dict(type_="notify", payload={"i": i}, client_id=client.id, incident_id=None,
+                 next_attempt_at=now - timedelta(minutes=10 - i))
+            for i in range(5)
+        ])
+        future = repo.insert(type_="notify", payload={"i": 99}, client_id=client.id,
+                             incident_id=None, next_attempt_at=now + timedelta(minutes=30))
+        due_ids = [e.id for e in due]
+
+        # 1) Lot borné par limit, les plus anciens d'abord, attempts incrémenté
+        first = repo.claim_due(limit=3, as_of=now, lease_seconds=lease)
+        assert len(first) == 3
+        assert {eid for eid, _, _ in first} == set(due_ids[:3])
+        assert sorted(p["i"] for _, p, _ in first) == [0, 1, 2]
+        assert all(attempts == 1 for _, _, attempts in first)
+
+        # 2) Bail : DELIVERING, next_attempt_at repoussé à pivot + lease
+        rows = s.execute(
+            s.query(OutboxEvent.id, OutboxEvent.status, OutboxEvent.next_attempt_at)
+            .filter(OutboxEvent.id.in_(due_ids[:3]))
+            .statement
+        ).all()
+        for _, status, next_at in rows:
+            assert status == OutboxStatus.DELIVERING
+            assert _naive(next_at) == _naive(now + timedelta(seconds=lease))
+
+        # 3) Avant expiration du bail : seuls les 2 restants sont claimables (ni les
+        #    events en bail, ni l'event futur)
+        second = repo.claim_due(limit=10, as_of=now, lease_seconds=lease)
+        assert {eid for eid, _, _ in second} == set(due_ids[3:])
+        assert repo.claim_due(limit=10, as_of=now + timedelta(seconds=lease - 1), lease_seconds=lease) == []
+
+        # 4) Bail expiré (worker mort) : re-claim, attempts = 2
+        third = repo.claim_due(limit=3, as_of=now + timedelta(seconds=lease + 1), lease_seconds=lease)
+        assert {eid for eid, _, _ in third} == set(due_ids[:3])
+        assert all(attempts == 2 for _, _, attempts in third)
+        assert future.id not in {eid for eid, _, _ in first + second + third}
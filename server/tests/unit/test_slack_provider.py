@@ -1,3 +1,4 @@
+import json
 import pytest
 from types import SimpleNamespace
 
@@ -7,14 +8,16 @@ def test_slack_provider_success(monkeypatch):
     from app.infrastructure.notifications.providers.slack_provider import SlackProvider
 
     calls = {}
-    def fake_post(url, json, headers, timeout):
-        calls["url"] = url; calls["json"] = json
+    def fake_post(url, data, headers, timeout):
+        calls["url"] = url; calls["json"] = json.loads(data)
         return SimpleNamespace(status_code=200)
 
-    monkeypatch.setenv("SLACK_WEBHOOK", "http://example.invalid/hook")
-    monkeypatch.setattr("requests.post", fake_post, raising=True)
+    monkeypatch.setattr(
+        "app.infrastructure.notifications.providers.slack_provider._get_session",
+        lambda: SimpleNamespace(post=fake_post),
+    )
 
-    ok = SlackProvider().send(title="T", text="X", severity="warning", context={"a":1}, channel="#c", username="u", icon_emoji=":bell:")
+    ok = SlackProvider("http://example.invalid/hook").send(title="T", text="X", severity="warning", context={"a":1}, channel="#c", username="u", icon_emoji=":bell:")
     assert ok is True
     assert calls["json"]["text"].startswith("[WARNING]")
 
@@ -23,7 +26,149 @@ def test_slack_provider_failure(monkeypatch):
     class Boom(Exception): pass
     def fake_post(*a, **k): raise Boom("net down")
 
-    monkeypatch.setenv("SLACK_WEBHOOK", "http://example.invalid/hook")
-    monkeypatch.setattr("requests.post", fake_post, raising=True)
+    monkeypatch.setattr(
+        "app.infrastructure.notifications.providers.slack_provider._get_session",
+        lambda: SimpleNamespace(post=fake_post),
+    )
 
-    assert SlackProvider().send(title="T", text="X") is False
+    assert SlackProvider("http://example.invalid/hook").send(title="T", text="X") is False
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Disjoncteur par webhook
+# ─────────────────────────────────────────────────────────────────────────────
+
+@pytest.fixture
+def breaker_env(monkeypatch):
+    """Disjoncteurs vierges + horloge monotonic pilotée + POST factice (statut par webhook)."""
+    import time as real_time
+    import app.infrastructure.notifications.providers.slack_provider as sp
+
+    clock = {"now": 1000.0}
+    status: dict[str, int] = {}
+    posts: list[str] = []
+
+    def fake_post(url, data, headers, timeout):
+        posts.append(url)
+        return SimpleNamespace(status_code=status.get(url, 200))
+
+    monkeypatch.setattr(sp, "_BREAKERS", {})
+    monkeypatch.setattr(sp, "time", SimpleNamespace(monotonic=lambda: clock["now"], sleep=real_time.sleep))
+    monkeypatch.setattr(sp, "_get_session", lambda: SimpleNamespace(post=fake_post))
+    return SimpleNamespace(sp=sp, clock=clock, status=status, posts=posts)
+
+
+def test_breaker_opens_after_threshold_and_short_circuits(breaker_env):
+    sp, hook = breaker_env.sp, "http://example.invalid/down"
+    breaker_env.status[hook] = 500
+    provider = sp.SlackProvider(hook)
+
+    for i in range(sp._BREAKER_THRESHOLD):
+        assert provider.send(title="T", text=f"x{i}") is False
+    assert len(breaker_env.posts) == sp._BREAKER_THRESHOLD
+
+    # Ouvert : échec immédiat, aucun POST
+    breaker_env.status[hook] = 200
+    assert provider.send(title="T", text="while-open") is False
+    assert len(breaker_env.posts) == sp._BREAKER_THRESHOLD
+
+    # Échéance passée (≤ _BREAKER_MAX_OPEN_SECONDS) : le POST repart
+    breaker_env.clock["now"] += sp._BREAKER_MAX_OPEN_SECONDS + 1
+    assert provider.send(title="T", text="after-open") is True
+    assert len(breaker_env.posts) == sp._BREAKER_THRESHOLD + 1
+
+
+def test_breaker_reset_on_success(breaker_env):
+    sp, hook = breaker_env.sp, "http://example.invalid/flaky"
+    provider = sp.SlackProvider(hook)
+
+    breaker_env.status[hook] = 500
+    for i in range(sp._BREAKER_THRESHOLD - 1):
+        assert provider.send(title="T", text=f"x{i}") is False
+
+    breaker_env.status[hook] = 200
+    assert provider.send(title="T", text="ok") is True
+    assert hook not in sp._BREAKERS
+
+    # Compteur remis à zéro : un nouvel échec isolé n'ouvre pas le disjoncteur
+    breaker_env.status[hook] = 500
+    assert provider.send(title="T", text="fail-again") is False
+    assert not sp._breaker_open(hook)
+
+
+def test_breaker_isolated_per_webhook(breaker_env):
+    sp = breaker_env.sp
+    bad, good = "http://example.invalid/bad", "http://example.invalid/good"
+    breaker_env.status[bad] = 500
+
+    for i in range(sp._BREAKER_THRESHOLD):
+        sp.SlackProvider(bad).send(title="T", text=f"x{i}")
+    assert sp._breaker_open(bad)
+
+    assert not sp._breaker_open(good)
+    assert sp.SlackProvider(good).send(title="T", text="x") is True
+    assert breaker_env.posts[-1] == good
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Coalescence des envois identiques en vol
+# ─────────────────────────────────────────────────────────────────────────────
+
+def test_concurrent_identical_sends_share_one_post(monkeypatch):
+    import threading
+    import app.infrastructure.notifications.providers.slack_provider as sp
+
+    started, joined, release = threading.Event(), threading.Event(), threading.Event()
+    posts: list[str] = []
+
+    def slow_post(url, data, headers, timeout):
+        posts.append(url)
+        started.set()
+        assert release.wait(5)
+        return SimpleNamespace(status_code=200)
+
+    class _SpyInflight(dict):
+        """Signale quand un 2e envoi trouve le Future du 1er."""
+        def get(self, key, default=None):
+            fut = super().get(key, default)
+            if fut is not None:
+                joined.set()
+            return fut
+
+    monkeypatch.setattr(sp, "_BREAKERS", {})
+    monkeypatch.setattr(sp, "_INFLIGHT", _SpyInflight())
+    monkeypatch.setattr(sp, "_get_session", lambda: SimpleNamespace(post=slow_post))
+
+    hook = "http://example.invalid/storm"
+    results: list[bool] = []
+
+    def _send():
+        results.append(sp.SlackProvider(hook).send(title="T", text="same", severity="warning"))
+
+    first = threading.Thread(target=_send)
+    first.start()
+    assert started.wait(5)
+    second = threading.Thread(target=_send)
+    second.start()
+    assert joined.wait(5)
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    assert posts == [hook]
+    assert results == [True, True]
+    assert len(sp._INFLIGHT) == 0
+
+
+def test_inflight_entry_removed_when_post_raises(monkeypatch):
+    import app.infrastructure.notifications.providers.slack_provider as sp
+
+    def boom(self, payload):
+        raise RuntimeError("unexpected")
+
+    monkeypatch.setattr(sp, "_INFLIGHT", {})
+    monkeypatch.setattr(sp.SlackProvider, "_post", boom)
+
+    with pytest.raises(RuntimeError):
+        sp.SlackProvider("http://example.invalid/boom").send(title="T", text="X")
+    assert sp._INFLIGHT == {}
@@ -0,0 +1,41 @@
+# server/tests/unit/test_ttl_cache.py
+import pytest
+
+from app.core.utils import ttl_cache
+from app.core.utils.ttl_cache import TTLCache
+
+pytestmark = pytest.mark.unit
+
+
+def test_get_set_and_default():
+    c = TTLCache(maxsize=10, ttl=60)
+    miss = object()
+    assert c.get("k", miss) is miss
+    c.set("k", None)
+    assert c.get("k", miss) is None
+
+
+def test_entry_expires(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ttl_cache.time, "monotonic", lambda: now[0])
+    c = TTLCache(maxsize=10, ttl=5)
+    c.set("k", 1)
+    c.set("short", 2, ttl=1)
+    now[0] += 2
+    assert c.get("k") == 1
+    assert c.get("short") is None
+    now[0] += 4
+    assert c.get("k") is None
+
+
+def test_maxsize_evicts_oldest_and_pop():
+    c = TTLCache(maxsize=2, ttl=60)
+    c.set("a", 1)
+    c.set("b", 2)
+    c.set("c", 3)
+    assert c.get("a") is None
+    assert (c.get("b"), c.get("c")) == (2, 3)
+    c.pop("b")
+    c.pop("missing")
+    assert c.get("b") is None
+    assert len(c) == 1